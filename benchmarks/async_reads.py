@@ -0,0 +1,49 @@
+"""
+Benchmark reading a `DictDir` sequentially, and concurrently with `asyncio.gather`.
+
+Run with::
+
+    python -m benchmarks.async_reads
+"""
+
+import asyncio
+import tempfile
+from pathlib import Path
+
+import typedpath as tp
+from benchmarks.utils import bench
+
+
+async def read_sequential(d: tp.DictDir[int, tp.JSONFile]) -> None:
+    async for _, value in d.aitems():
+        await value.aread()
+
+
+async def read_gather(d: tp.DictDir[int, tp.JSONFile]) -> None:
+    await asyncio.gather(*[value.aread() async for _, value in d.aitems()])
+
+
+def main() -> None:
+    n = 10_000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        d = tp.DictDir(Path(tmp_dir), int, tp.JSONFile, cache_size=n)
+        for i in range(n):
+            d[i].write({"id": i, "name": f"name_{i}", "values": list(range(32))})
+
+        bench(f"{n} x read(), sync", lambda: [v.read() for v in d.values()], repeat=3, number=1)
+        bench(
+            f"{n} x aread(), sequential",
+            lambda: asyncio.run(read_sequential(d)),
+            repeat=3,
+            number=1,
+        )
+        bench(
+            f"{n} x aread(), asyncio.gather",
+            lambda: asyncio.run(read_gather(d)),
+            repeat=3,
+            number=1,
+        )
+
+
+if __name__ == "__main__":
+    main()
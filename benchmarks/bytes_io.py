@@ -0,0 +1,46 @@
+"""
+Compare reading part of a large `BytesFile`, and copying a large file into one, in different ways.
+
+Run with::
+
+    python -m benchmarks.bytes_io
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+import typedpath as tp
+from benchmarks.utils import bench
+
+SIZE = 256 * 2**20
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        source = root / "source.bin"
+        source.write_bytes(os.urandom(SIZE))
+        f = tp.BytesFile(source)
+        copy = tp.BytesFile(root / "copy.bin")
+        buffer = bytearray(SIZE)
+
+        bench("read()[:4096]", lambda: f.read()[:4096], repeat=3)
+        bench("read_range(0, 4096)", lambda: f.read_range(0, 4096))
+        bench("read()", f.read, repeat=3)
+        bench("readinto(buffer)", lambda: f.readinto(buffer), repeat=3)
+
+        def copy_read_write() -> None:
+            copy.write(f.read())
+
+        def copy_write_from() -> None:
+            with open(source, "rb") as fp:
+                copy.write_from(fp)
+
+        bench("write(read())", copy_read_write, repeat=3)
+        bench("write_from(file)", copy_write_from, repeat=3)
+        bench("write_chunks(...)", lambda: copy.write_chunks(iter([bytes(2**20)] * 256)), repeat=3)
+
+
+if __name__ == "__main__":
+    main()
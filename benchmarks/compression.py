@@ -0,0 +1,73 @@
+"""
+Compare the size, and the write and read times, of files with different compression.
+
+Run with::
+
+    python -m benchmarks.compression
+"""
+
+import tempfile
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+import typedpath as tp
+from benchmarks.utils import bench
+from typedpath.compression import ZSTD_AVAILABLE
+
+_N_ROWS = 200_000
+
+
+def _compressions() -> list[tp.Compression | None]:
+    compressions: list[tp.Compression | None] = [
+        None,
+        tp.Compression("gzip", level=1),
+        tp.Compression("gzip", level=6),
+        tp.Compression("xz", level=1),
+    ]
+    if ZSTD_AVAILABLE:
+        compressions += [
+            tp.Compression("zstd", level=3),
+            tp.Compression("zstd", level=3, threads=-1),
+        ]
+    return compressions
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame(
+            {
+                "id": np.arange(_N_ROWS),
+                "category": rng.choice(["red", "green", "blue"], _N_ROWS),
+                "value": rng.normal(size=_N_ROWS).round(3),
+            }
+        )
+        records = df.to_dict(orient="records")
+        text = df.to_string()
+
+        for compression in _compressions():
+            name = "none" if compression is None else f"{compression.format}/{compression.level}"
+            if compression is not None and compression.threads:
+                name += f"/threads={compression.threads}"
+            files: list[tuple[Any, Any]] = [
+                (tp.JSONFile(root / name / "data.json"), records),
+                (tp.TextFile(root / name / "data.txt"), text),
+                (tp.PickleFile(root / name / "data.pickle", list), records),
+                (tp.PandasCsvFile(root / name / "data.csv"), df),
+            ]
+            for file, data in files:
+                if compression is not None:
+                    tp.compressed(file, compression)
+                label = f"{type(file).__name__} ({name})"
+                bench(f"{label}.write()", partial(file.write, data), repeat=3, number=1)
+                bench(f"{label}.read()", file.read, repeat=3, number=1)
+                print(f"{label} size: {file.pretty_path().stat().st_size / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
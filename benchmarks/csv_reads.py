@@ -0,0 +1,42 @@
+"""
+Compare reading a CSV file with the different parsers, with and without a stored schema.
+
+Run with::
+
+    python -m benchmarks.csv_reads
+"""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import typedpath as tp
+from benchmarks.utils import bench
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        n_rows = 200_000
+        rng = np.random.default_rng(0)
+        data = pd.DataFrame(
+            {
+                "id": [f"{i:08d}" for i in range(n_rows)],
+                "when": pd.Timestamp("2020-01-01") + pd.to_timedelta(np.arange(n_rows), "s"),
+                **{f"c{i}": rng.random(n_rows) for i in range(10)},
+            }
+        )
+        tp.PandasCsvFile(root / "data.csv", schema=True).write(data)
+
+        for engine in ("c", "pyarrow"):
+            for schema in (False, True):
+                f = tp.PandasCsvFile(root / "data.csv", engine=engine, schema=schema)
+                bench(f"read(engine={engine!r}, schema={schema})", f.read, repeat=3)
+        f = tp.PandasCsvFile(root / "data.csv", schema=True)
+        bench("iter_chunks()", lambda: sum(len(chunk) for chunk in f.iter_chunks()), repeat=3)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""
+Benchmark `DictDir` key lookups.
+
+Run with::
+
+    python -m benchmarks.dict_dir
+"""
+
+import tempfile
+from pathlib import Path
+
+import typedpath as tp
+from benchmarks.utils import bench
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        str_dir = tp.DictDir(root / "str", str, tp.JSONFile)
+        float_dir = tp.DictDir(root / "float", float, tp.JSONFile)
+        uncached_dir = tp.DictDir(root / "uncached", str, tp.JSONFile, cache_size=0)
+
+        bench("DictDir[str, JSONFile]['alice']", lambda: str_dir["alice"])
+        bench("DictDir[float, JSONFile][0.5]", lambda: float_dir[0.5])
+        bench("DictDir[str, JSONFile](cache_size=0)['alice']", lambda: uncached_dir["alice"])
+
+
+if __name__ == "__main__":
+    main()
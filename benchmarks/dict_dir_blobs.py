@@ -0,0 +1,74 @@
+"""
+Compare writing many duplicated values to a `DictDir`, with and without `blobs=True`.
+
+Run with::
+
+    python -m benchmarks.dict_dir_blobs
+"""
+
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+import typedpath as tp
+from benchmarks.utils import bench
+
+_N_KEYS = 500
+_N_DISTINCT = 10
+
+
+def _disk_usage(root: Path) -> int:
+    """Returns the number of bytes used by the files under `root`, counting hard links once."""
+    inodes = {}
+    for path in root.rglob("*"):
+        stat = path.lstat()
+        if path.is_file():
+            inodes[stat.st_ino] = stat.st_blocks * 512
+    return sum(inodes.values())
+
+
+def _bytes_written() -> int:
+    """Returns the number of bytes this process has written to files, or 0 if unknown."""
+    io_path = Path("/proc/self/io")
+    if not io_path.exists():
+        return 0
+    fields = dict(line.split(": ") for line in io_path.read_text().splitlines())
+    return int(fields["wchar"])
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        values = [np.full(2**17, i, dtype=np.float64) for i in range(_N_DISTINCT)]  # 1 MiB each.
+
+        for blobs in [False, True]:
+            d = tp.DictDir(root / f"blobs={blobs}", int, tp.NpyFile, blobs=blobs)
+
+            def write(d: tp.DictDir[int, tp.NpyFile] = d) -> None:
+                for i in range(_N_KEYS):
+                    d[i].write(values[i % _N_DISTINCT])
+
+            def write_durably(write: Callable[[], None] = write) -> None:
+                with tp.durability():
+                    write()
+
+            bench(f"NpyFile.write() x {_N_KEYS} (blobs={blobs})", write, repeat=3, number=1)
+            bench(
+                f"NpyFile.write() x {_N_KEYS} (blobs={blobs}, durability)",
+                write_durably,
+                repeat=3,
+                number=1,
+            )
+            print(f"Disk usage (blobs={blobs}): {_disk_usage(d.pretty_path()) / 2**20:.1f} MiB")
+            before = _bytes_written()
+            write()
+            print(f"Bytes written (blobs={blobs}): {(_bytes_written() - before) / 2**20:.1f} MiB")
+
+        d = tp.DictDir(root / "blobs=True", int, tp.NpyFile, blobs=True)
+        bench("DictDir.collect_garbage()", d.collect_garbage, repeat=3, number=1)
+
+
+if __name__ == "__main__":
+    main()
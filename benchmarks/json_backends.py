@@ -0,0 +1,45 @@
+"""
+Compare the JSON backends, on small and large documents.
+
+Run with::
+
+    python -m benchmarks.json_backends
+"""
+
+import tempfile
+from functools import partial
+from pathlib import Path
+
+import typedpath as tp
+from benchmarks.utils import bench
+from typedpath.json import MSGSPEC_AVAILABLE, ORJSON_AVAILABLE, JSONBackendName
+
+SMALL: tp.JSON = {"name": "alice", "enabled": True, "retries": 3, "tags": ["a", "b"]}
+LARGE: tp.JSON = {
+    "records": [
+        {"id": i, "name": f"name-{i}", "score": i / 7, "tags": ["x", "y", "z"], "ok": i % 2 == 0}
+        for i in range(100_000)
+    ]
+}
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        backends: list[JSONBackendName] = ["stdlib"]
+        if ORJSON_AVAILABLE:
+            backends.append("orjson")
+        if MSGSPEC_AVAILABLE:
+            backends.append("msgspec")
+
+        for backend in backends:
+            small = tp.JSONFile(root / f"small_{backend}.json", backend=backend)
+            large = tp.JSONFile(root / f"large_{backend}.json", backend=backend)
+            bench(f"{backend}: write small", partial(small.write, SMALL))
+            bench(f"{backend}: read small", small.read)
+            bench(f"{backend}: write large", partial(large.write, LARGE), repeat=3)
+            bench(f"{backend}: read large", large.read, repeat=3)
+
+
+if __name__ == "__main__":
+    main()
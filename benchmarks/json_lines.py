@@ -0,0 +1,66 @@
+"""
+Compare storing an event log as many small `JSONFile`s in a `DictDir`, with one `JSONLinesFile`.
+
+Run with::
+
+    python -m benchmarks.json_lines
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+import typedpath as tp
+from benchmarks.utils import bench
+
+N_EVENTS = 10_000
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        events: list[tp.JSON] = [
+            {"id": i, "kind": "click", "x": i % 640, "y": i % 480} for i in range(N_EVENTS)
+        ]
+        dict_dir = tp.DictDir(root / "dict", int, tp.JSONFile)
+        lines = tp.JSONLinesFile(root / "events.jsonl")
+        indexed = tp.JSONLinesFile(root / "indexed.jsonl", index=True)
+
+        def write_dict_dir() -> None:
+            shutil.rmtree(root / "dict", ignore_errors=True)
+            for i, event in enumerate(events):
+                dict_dir[i].write(event)
+
+        def append_each(f: tp.JSONLinesFile) -> None:
+            f.write([])
+            for event in events:
+                f.append(event)
+
+        bench("DictDir[int, JSONFile] write each", write_dict_dir, repeat=1, number=1)
+        bench("JSONLinesFile append each", lambda: append_each(lines), repeat=1, number=1)
+        bench(
+            "JSONLinesFile(index=True) append each",
+            lambda: append_each(indexed),
+            repeat=1,
+            number=1,
+        )
+        bench("JSONLinesFile extend", lambda: lines.write(events), repeat=3)
+        bench("JSONLinesFile(index=True) extend", lambda: indexed.write(events), repeat=3)
+
+        bench(
+            "DictDir[int, JSONFile] read all",
+            lambda: [dict_dir[i].read() for i in dict_dir],
+            repeat=3,
+        )
+        bench("JSONLinesFile iter", lambda: list(lines.iter()), repeat=3)
+
+        middle = N_EVENTS // 2
+        bench("DictDir[int, JSONFile] read one", lambda: dict_dir[middle].read())
+        bench("JSONLinesFile record", lambda: lines.record(middle), repeat=3)
+        bench("JSONLinesFile(index=True) record", lambda: indexed.record(middle))
+        bench("JSONLinesFile tail(10)", lambda: lines.tail(10))
+        bench("JSONLinesFile(index=True) tail(10)", lambda: indexed.tail(10))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Compare the peak memory use of concatenating chunks before writing them, with appending them.
+
+Run with::
+
+    python -m benchmarks.npy_append
+"""
+
+import tempfile
+import tracemalloc
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import numpy as np
+
+import typedpath as tp
+
+N_CHUNKS = 100
+CHUNK_SHAPE = (10_000, 100)
+
+
+def chunks() -> Iterator[tp.AnyNDArray]:
+    for _ in range(N_CHUNKS):
+        yield np.ones(CHUNK_SHAPE, dtype=np.float32)
+
+
+def peak_mib(name: str, f: Callable[[], None]) -> None:
+    tracemalloc.start()
+    f()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<60} {peak / 2**20:>10.1f} MiB")
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        f = tp.NpyFile(root / "features.npy")
+
+        def concatenate() -> None:
+            f.write(np.concatenate(list(chunks())))
+
+        def appending() -> None:
+            f.pretty_path().unlink(missing_ok=True)
+            with f.appending() as appender:
+                for chunk in chunks():
+                    appender.append(chunk)
+
+        peak_mib("write(concatenate(chunks))", concatenate)
+        peak_mib("appending()", appending)
+
+
+if __name__ == "__main__":
+    main()
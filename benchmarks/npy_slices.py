@@ -0,0 +1,32 @@
+"""
+Compare reading a whole `.npy` file with reading a slice of it.
+
+Run with::
+
+    python -m benchmarks.npy_slices
+"""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+import typedpath as tp
+from benchmarks.utils import bench
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        f = tp.NpyFile(root / "features.npy")
+        f.write(np.zeros((100_000, 256), dtype=np.float32))
+        rows = slice(50_000, 50_100)
+
+        bench("read()[rows]", lambda: f.read()[rows], repeat=3)
+        bench("header()", f.header)
+        bench("read_slice(rows)", lambda: f.read_slice(rows))
+        bench("read_slice(rows, copy=False)", lambda: f.read_slice(rows, copy=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Compare writing, and reading, many arrays in one `.npz` file, in different ways.
+
+Run with::
+
+    python -m benchmarks.npz_arrays
+"""
+
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+import typedpath as tp
+from benchmarks.utils import bench
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        rng = np.random.default_rng(0)
+        arrays: dict[str, Any] = {f"a{i}": rng.integers(0, 100, 250_000) for i in range(8)}
+        compressed = tp.NpzFile(root / "compressed.npz")
+        stored = tp.NpzFile(root / "stored.npz", compressed=False, mmap_mode="r")
+
+        bench(
+            "np.savez_compressed", lambda: np.savez_compressed(root / "np.npz", **arrays), repeat=3
+        )
+        bench("write_arrays(compressed=True)", lambda: compressed.write_arrays(arrays), repeat=3)
+        bench("write_arrays(compressed=False)", lambda: stored.write_arrays(arrays), repeat=3)
+
+        def read_one_np() -> None:
+            with np.load(root / "np.npz") as npz_file:
+                npz_file["a0"]
+
+        def read_one(f: tp.NpzFile) -> None:
+            with f.read_arrays() as npz_arrays:
+                npz_arrays["a0"]
+
+        bench("np.load(...)['a0']", read_one_np)
+        bench("read_arrays()['a0'] (compressed=True)", lambda: read_one(compressed))
+        bench("read_arrays()['a0'] (compressed=False, mmap)", lambda: read_one(stored))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Compare appending to a Parquet file by rewriting it, with appending row groups.
+
+Run with::
+
+    python -m benchmarks.parquet_appends
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import typedpath as tp
+
+N_BATCHES = 50
+
+
+def batch() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({f"c{i}": rng.random(10_000) for i in range(10)})
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+
+        f = tp.PandasParquetFile(root / "rewrite.parquet")
+        f.write(batch())
+        start = time.perf_counter()
+        for _ in range(N_BATCHES):
+            f.write(pd.concat([f.read(), batch()], ignore_index=True))
+        print(f"{'read, concat and write':<60} {time.perf_counter() - start:>10.2f} s")
+
+        f = tp.PandasParquetFile(root / "appending.parquet")
+        start = time.perf_counter()
+        with f.appending() as appender:
+            for _ in range(N_BATCHES + 1):
+                appender.append(batch())
+        print(f"{'appending()':<60} {time.perf_counter() - start:>10.2f} s")
+
+        f = tp.PandasParquetFile(root / "append.parquet")
+        start = time.perf_counter()
+        for _ in range(N_BATCHES + 1):
+            f.append(batch())
+        print(f"{'append() (part files)':<60} {time.perf_counter() - start:>10.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Compare reading a whole, wide, Parquet file with reading a few columns and a range of rows.
+
+Run with::
+
+    python -m benchmarks.parquet_reads
+"""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import typedpath as tp
+from benchmarks.utils import bench
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        n_rows = 1_000_000
+        rng = np.random.default_rng(0)
+        data = pd.DataFrame({f"c{i}": rng.random(n_rows) for i in range(50)})
+        data["day"] = np.arange(n_rows) // 1000
+        f = tp.PandasParquetFile(root / "wide.parquet")
+        with f.writing() as path:
+            data.to_parquet(path, row_group_size=50_000)
+
+        bench("read()", f.read, repeat=3)
+        bench("read(columns=3)", lambda: f.read(columns=["day", "c0", "c1"]), repeat=3)
+        bench(
+            "read(columns=3, filters=10 days)",
+            lambda: f.read(columns=["day", "c0", "c1"], filters=[("day", "<", 10)]),
+            repeat=3,
+        )
+        bench("metadata()", f.metadata)
+
+
+if __name__ == "__main__":
+    main()
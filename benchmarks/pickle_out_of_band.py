@@ -0,0 +1,41 @@
+"""
+Compare pickling large NumPy arrays in-band, and out-of-band.
+
+Run with::
+
+    python -m benchmarks.pickle_out_of_band
+"""
+
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+import typedpath as tp
+from benchmarks.utils import bench
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        rng = np.random.default_rng(0)
+        data = {f"a{i}": rng.random(2_000_000) for i in range(8)}  # 128 MiB
+        in_band = tp.PickleFile(root / "in_band.pickle", dict)
+        out_of_band = tp.PickleFile(root / "out_of_band.pickle", dict, out_of_band=True)
+        no_mmap = tp.PickleFile(root / "out_of_band.pickle", dict, memory_map=False)
+
+        def read_one(f: tp.PickleFile[Any]) -> None:
+            f.read()["a0"].sum()
+
+        bench("write (in-band)", lambda: in_band.write(data), repeat=3)
+        bench("write (out_of_band=True)", lambda: out_of_band.write(data), repeat=3)
+        bench("read (in-band)", in_band.read, repeat=3)
+        bench("read (out_of_band=True)", out_of_band.read, repeat=3)
+        bench("read (out_of_band=True, memory_map=False)", no_mmap.read, repeat=3)
+        bench("read + use one array (in-band)", lambda: read_one(in_band), repeat=3)
+        bench("read + use one array (out_of_band=True)", lambda: read_one(out_of_band), repeat=3)
+
+
+if __name__ == "__main__":
+    main()
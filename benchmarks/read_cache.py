@@ -0,0 +1,45 @@
+"""
+Compare reading the same files repeatedly, with and without the read cache.
+
+Run with::
+
+    python -m benchmarks.read_cache
+"""
+
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+import typedpath as tp
+from benchmarks.utils import bench
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        json_file = tp.JSONFile(root / "config.json")
+        json_file.write(
+            {f"key{i}": {"enabled": True, "values": list(range(10))} for i in range(1_000)}
+        )
+        pickle_file = tp.PickleFile(root / "model.pickle", dict)
+        pickle_file.write({"weights": [float(i) for i in range(100_000)]})
+        npy_file = tp.NpyFile(root / "features.npy")
+        npy_file.write(np.ones((1_000, 100)))
+
+        reads: list[tuple[str, Callable[[], Any]]] = [
+            ("JSONFile", json_file.read),
+            ("PickleFile", pickle_file.read),
+            ("NpyFile", npy_file.read),
+        ]
+        for name, read in reads:
+            bench(f"{name}.read()", read)
+            with tp.read_cache():
+                bench(f"{name}.read() (read_cache)", read)
+                print(tp.get_read_cache_stats())
+
+
+if __name__ == "__main__":
+    main()
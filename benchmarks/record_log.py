@@ -0,0 +1,61 @@
+"""
+Compare checkpointing a stream of objects as many `PickleFile`s in a `DictDir`, with one
+`RecordLogFile`.
+
+Run with::
+
+    python -m benchmarks.record_log
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import typedpath as tp
+from benchmarks.utils import bench
+
+N_RECORDS = 10_000
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        records = [
+            {"step": i, "loss": 1 / (i + 1), "weights": list(range(16))} for i in range(N_RECORDS)
+        ]
+        dict_dir = tp.DictDir(root / "dict", int, tp.PickleFile[dict[str, Any]])
+        log = tp.RecordLogFile(root / "log.records", dict)
+
+        def write_dict_dir() -> None:
+            shutil.rmtree(root / "dict", ignore_errors=True)
+            for i, record in enumerate(records):
+                dict_dir[i].write(record)
+
+        def append_each() -> None:
+            log.write([])
+            for record in records:
+                log.append(record)
+
+        bench("DictDir[int, PickleFile] write each", write_dict_dir, repeat=1, number=1)
+        bench("RecordLogFile append each", append_each, repeat=1, number=1)
+        bench("RecordLogFile write", lambda: log.write(records), repeat=3)
+
+        bench(
+            "DictDir[int, PickleFile] read all",
+            lambda: [dict_dir[i].read() for i in dict_dir],
+            repeat=3,
+        )
+        bench("RecordLogFile iter", lambda: list(log.iter()), repeat=3)
+
+        middle = N_RECORDS // 2
+        bench("DictDir[int, PickleFile] read one", lambda: dict_dir[middle].read())
+        bench("RecordLogFile get", lambda: log.get(middle))
+        bench(
+            "RecordLogFile get (new instance)",
+            lambda: tp.RecordLogFile(log.pretty_path(), dict).get(middle),
+        )
+
+
+if __name__ == "__main__":
+    main()
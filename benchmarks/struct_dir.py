@@ -0,0 +1,60 @@
+"""
+Benchmark the cost of creating `StructDir` handles.
+
+Run with::
+
+    python -m benchmarks.struct_dir
+"""
+
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import typedpath as tp
+from benchmarks.utils import bench
+
+
+class Leaf(tp.StructDir):
+    name: tp.TextFile
+    config: tp.JSONFile
+    data: tp.BytesFile
+
+
+class Level3(tp.StructDir):
+    leaf: Leaf
+    text: tp.TextFile
+
+
+class Level2(tp.StructDir):
+    child: Level3
+    text: tp.TextFile
+
+
+class Deep(tp.StructDir):
+    child: Level2
+    text: tp.TextFile
+
+
+Wide = type(
+    "Wide",
+    (tp.StructDir,),
+    {"__annotations__": {f"member_{i}": tp.TextFile for i in range(64)}},
+)
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        people: tp.DictDir[str, Any] = tp.DictDir(root / "people", str, Leaf)
+
+        bench("Leaf()", lambda: Leaf(root))
+        bench("Leaf().name", lambda: Leaf(root).name)
+        bench("Deep()", lambda: Deep(root))
+        bench("Deep().child.child.leaf.name", lambda: Deep(root).child.child.leaf.name)
+        bench("Wide()", lambda: Wide(root))
+        bench("Wide().member_0", lambda: Wide(root).member_0)
+        bench("DictDir[str, Leaf]['alice'].name", lambda: people["alice"].name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Count the file-system calls made when reading and writing many small files.
+
+Run with::
+
+    python -m benchmarks.syscalls
+"""
+
+import builtins
+import os
+import tempfile
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import typedpath as tp
+
+
+@contextmanager
+def count_calls() -> Iterator[Counter[str]]:
+    """Patch `os.stat`, `os.mkdir` and `open` to count how often they are called."""
+    counts: Counter[str] = Counter()
+    originals: list[tuple[Any, str, Callable[..., Any]]] = [
+        (os, "stat", os.stat),
+        (os, "mkdir", os.mkdir),
+        (builtins, "open", builtins.open),
+    ]
+
+    def counting(name: str, f: Callable[..., Any]) -> Callable[..., Any]:
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            counts[name] += 1
+            return f(*args, **kwargs)
+
+        return wrapper
+
+    for module, name, f in originals:
+        setattr(module, name, counting(name, f))
+    try:
+        yield counts
+    finally:
+        for module, name, f in originals:
+            setattr(module, name, f)
+
+
+def main() -> None:
+    n = 10_000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        files = [tp.JSONFile(root / f"dir_{i % 4}" / f"{i}.json") for i in range(n)]
+
+        with count_calls() as counts:
+            for f in files:
+                f.write({"value": 1})
+        print(f"{n} writes: {dict(counts)}")
+
+        with count_calls() as counts:
+            for f in files:
+                f.read()
+        print(f"{n} reads:  {dict(counts)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Compare the latency, and peak memory use, of reading a table from different file formats.
+
+Each read is measured in a fresh process, so the memory measurements do not affect each other.
+
+Run with::
+
+    python -m benchmarks.table_formats
+"""
+
+import multiprocessing
+import os
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+import typedpath as tp
+
+
+def make_readers(root: Path) -> dict[str, Callable[[], Any]]:
+    parquet = tp.PandasParquetFile(root / "table.parquet")
+    feather = tp.PandasFeatherFile(root / "table.feather")
+    feather_mmap = tp.PandasFeatherFile(root / "table.feather", memory_map=True)
+    arrow = tp.ArrowIpcFile(root / "table.arrow")
+    return {
+        "PandasParquetFile.read()": parquet.read,
+        "PandasParquetFile.read(columns=2)": lambda: parquet.read(columns=["c0", "c1"]),
+        "PandasFeatherFile.read()": feather.read,
+        "PandasFeatherFile(memory_map=True).read(columns=2)": lambda: feather_mmap.read(
+            columns=["c0", "c1"]
+        ),
+        "ArrowIpcFile.read()": arrow.read,
+        "ArrowIpcFile.read(columns=2)": lambda: arrow.read(columns=["c0", "c1"]),
+    }
+
+
+def rss_mib() -> float:
+    """Returns the resident set size of this process, in MiB. Only works on Linux."""
+    with open("/proc/self/statm") as fp:
+        return int(fp.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def measure(root: Path, name: str) -> tuple[float, float]:
+    """Returns the time, in seconds, and the increase in RSS, in MiB, of reading."""
+    read = make_readers(root)[name]
+    before = rss_mib()
+    start = time.perf_counter()
+    result = read()
+    duration = time.perf_counter() - start
+    after = rss_mib()
+    del result
+    return duration, after - before
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        rng = np.random.default_rng(0)
+        data = pd.DataFrame({f"c{i}": rng.random(1_000_000) for i in range(20)})
+        tp.PandasParquetFile(root / "table.parquet").write(data)
+        tp.PandasFeatherFile(root / "table.feather").write(data)
+        tp.ArrowIpcFile(root / "table.arrow").write(pa.Table.from_pandas(data))
+        del data
+
+        context = multiprocessing.get_context("spawn")
+        for name in make_readers(root):
+            with context.Pool(1) as pool:
+                duration, rss_mib = pool.apply(measure, (root, name))
+            print(f"{name:<60} {duration * 1e3:>10.1f} ms {rss_mib:>10.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
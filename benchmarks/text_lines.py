@@ -0,0 +1,39 @@
+"""
+Compare reading, and appending to, a large log-style `TextFile`, with and without the line APIs.
+
+Run with::
+
+    python -m benchmarks.text_lines
+"""
+
+import tempfile
+from pathlib import Path
+
+import typedpath as tp
+from benchmarks.utils import bench
+
+N_LINES = 1_000_000
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        f = tp.TextFile(root / "log.txt")
+        f.write("".join(f"2024-01-01T00:00:00 INFO request {i} handled\n" for i in range(N_LINES)))
+
+        def count_lines() -> int:
+            return sum(1 for _ in f.iter_lines(buffer_size=2**20))
+
+        def rewrite() -> None:
+            f.write(f.read() + "2024-01-01T00:00:00 INFO new line\n")
+
+        bench("len(read().splitlines())", lambda: len(f.read().splitlines()), repeat=3)
+        bench("iter_lines()", count_lines, repeat=3)
+        bench("read().splitlines()[-10:]", lambda: f.read().splitlines()[-10:], repeat=3)
+        bench("tail(10)", lambda: f.tail(10))
+        bench("write(read() + line)", rewrite, repeat=3)
+        bench("append(line)", lambda: f.append("2024-01-01T00:00:00 INFO new line\n"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+import timeit
+from collections.abc import Callable
+from typing import Any
+
+
+def bench(name: str, f: Callable[[], Any], *, repeat: int = 5, number: int = 0) -> float:
+    """
+    Time `f`, print the result, and return the best time per call, in seconds.
+
+    :param number: Number of calls per repetition. If `0` this is determined automatically.
+    """
+    timer = timeit.Timer(f)
+    if number == 0:
+        number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+    print(f"{name:<60} {best * 1e6:>12.2f} µs")
+    return best
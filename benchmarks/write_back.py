@@ -0,0 +1,52 @@
+"""
+Compare bursts of small writes, with and without write-back buffering.
+
+Run with::
+
+    python -m benchmarks.write_back
+"""
+
+import tempfile
+from pathlib import Path
+
+import typedpath as tp
+from benchmarks.utils import bench
+
+_N_FILES = 100
+_N_WRITES = 10_000
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        d = tp.DictDir(root / "counters", int, tp.JSONFile)
+        texts = tp.DictDir(root / "texts", int, tp.TextFile)
+
+        def write_json() -> None:
+            for i in range(_N_WRITES):
+                d[i % _N_FILES].write({"count": i, "tags": ["a", "b"]})
+
+        def write_text() -> None:
+            for i in range(_N_WRITES):
+                texts[i % _N_FILES].write(f"status {i}\n")
+
+        bench(f"JSONFile.write() x {_N_WRITES}", write_json, repeat=3, number=1)
+        bench(f"TextFile.write() x {_N_WRITES}", write_text, repeat=3, number=1)
+        with tp.write_back():
+            bench(f"JSONFile.write() x {_N_WRITES} (write_back)", write_json, repeat=3, number=1)
+            bench(f"TextFile.write() x {_N_WRITES} (write_back)", write_text, repeat=3, number=1)
+            bench("flush_writes()", tp.flush_writes, repeat=3, number=1)
+            print(tp.get_write_back_stats())
+        with tp.atomic_writes():
+            bench(f"JSONFile.write() x {_N_WRITES} (atomic)", write_json, repeat=3, number=1)
+            with tp.write_back():
+                bench(
+                    f"JSONFile.write() x {_N_WRITES} (atomic, write_back)",
+                    write_json,
+                    repeat=3,
+                    number=1,
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import asyncio
+from pathlib import Path
+
+import pyarrow as pa
+import pytest
+
+from typedpath import ArrowIpcFile
+from typedpath.arrow import ArrowIpcCompression
+
+_TABLE = pa.table({"a": [0, 1, 2], "b": ["foo", "bar", "baz"], "c": [0.5, None, 1.5]})
+_DATA = [
+    _TABLE.slice(0, 0),
+    _TABLE,
+]
+
+
+@pytest.mark.parametrize("memory_map", [False, True])
+@pytest.mark.parametrize("compression", [None, "lz4", "zstd"])
+@pytest.mark.parametrize("data", _DATA)
+def test_arrow_ipc_file(
+    tmp_path: Path, memory_map: bool, compression: ArrowIpcCompression, data: pa.Table
+) -> None:
+    d = tmp_path / "dir"
+    assert not d.exists()
+    p = d / "test.arrow"
+
+    f = ArrowIpcFile(p, memory_map=memory_map, compression=compression)
+    f.write(data)
+
+    assert d.exists()
+    with pa.memory_map(str(p)) as source, pa.ipc.open_file(source) as reader:
+        assert data.equals(reader.read_all())
+    assert data.equals(f.read())
+    assert data.select(["c", "a"]).equals(f.read(columns=["c", "a"]))
+
+
+def test_arrow_ipc_file__memory_map(tmp_path: Path) -> None:
+    f = ArrowIpcFile(tmp_path / "test.arrow")
+    f.write(_TABLE)
+
+    allocated = pa.total_allocated_bytes()
+    table = f.read()
+    # Memory-mapped data is not copied into memory allocated by Arrow:
+    assert allocated == pa.total_allocated_bytes()
+    assert _TABLE.equals(table)
+
+
+def test_arrow_ipc_file__missing(tmp_path: Path) -> None:
+    with pytest.raises(AssertionError):
+        ArrowIpcFile(tmp_path / "test.arrow").read()
+
+
+def test_arrow_ipc_file__async(tmp_path: Path) -> None:
+    f = ArrowIpcFile(tmp_path / "test.arrow")
+    asyncio.run(f.awrite(_TABLE))
+    assert _TABLE.equals(asyncio.run(f.aread()))
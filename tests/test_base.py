@@ -0,0 +1,60 @@
+import shutil
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from tests.utils import TestFile
+
+
+def test_typed_file__open_write(tmp_path: Path) -> None:
+    p = tmp_path / "a/b/c.test"
+    f = TestFile(p)
+    with f.open_write("wt", encoding="utf-8") as fp:
+        fp.write("foo")
+    assert p.read_text(encoding="utf-8") == "foo"
+
+
+def test_typed_file__open_write__known_dirs(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    mkdirs = []
+    mkdir = Path.mkdir
+
+    def counting_mkdir(self: Path, *args: Any, **kwargs: Any) -> None:
+        mkdirs.append(self)
+        mkdir(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "mkdir", counting_mkdir)
+
+    TestFile(tmp_path / "a/b/0.test").write("0")
+    assert mkdirs
+    n_mkdirs = len(mkdirs)
+    TestFile(tmp_path / "a/b/1.test").write("1")
+    TestFile(tmp_path / "a/b/2.test").write("2")
+    assert n_mkdirs == len(mkdirs)
+
+    # Directories deleted behind our back are re-created:
+    shutil.rmtree(tmp_path / "a")
+    TestFile(tmp_path / "a/b/3.test").write("3")
+    assert (tmp_path / "a/b/3.test").read_text(encoding="utf-8") == "3"
+
+
+def test_typed_file__open_read(tmp_path: Path) -> None:
+    p = tmp_path / "a.test"
+    p.write_text("foo", encoding="utf-8")
+    f = TestFile(p)
+    with f.open_read("rt", encoding="utf-8") as fp:
+        assert fp.read() == "foo"
+
+
+@pytest.mark.parametrize("mkdir", [False, True])
+def test_typed_file__open_read__missing(tmp_path: Path, mkdir: bool) -> None:
+    p = tmp_path / "a.test"
+    if mkdir:
+        p.mkdir()
+    f = TestFile(p)
+    with pytest.raises(AssertionError), f.open_read():
+        pass
+    with pytest.raises(AssertionError), f.reading() as path:
+        path.read_bytes()
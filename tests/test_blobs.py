@@ -0,0 +1,111 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from typedpath import (
+    BlobStore,
+    BytesFile,
+    DictDir,
+    NpyFile,
+    PandasParquetFile,
+    PickleFile,
+    TextFile,
+    write_back,
+)
+
+
+def _blobs(root: Path) -> list[Path]:
+    return [p for p in root.glob(".typedpath-blobs/*/*") if p.parent.name != "tmp"]
+
+
+def test_blobs(tmp_path: Path) -> None:
+    d = DictDir(tmp_path, str, BytesFile, blobs=True)
+    d["a"].write(b"foo")
+    d["b"].write(b"foo")
+    d["c"].write(b"bar")
+
+    assert set(d) == {"a", "b", "c"}
+    assert {k: v.read() for k, v in d.items()} == {"a": b"foo", "b": b"foo", "c": b"bar"}
+    a = (tmp_path / "a.bin").stat()
+    assert a.st_ino == (tmp_path / "b.bin").stat().st_ino
+    assert a.st_nlink == 3
+    assert len(_blobs(tmp_path)) == 2
+
+    # Writing the same value again does not change the file:
+    d["a"].write(b"foo")
+    assert (tmp_path / "a.bin").stat().st_ino == a.st_ino
+
+    d["a"].write(b"baz")
+    assert d["a"].read() == b"baz"
+    assert d["b"].read() == b"foo"
+    assert (tmp_path / "b.bin").stat().st_nlink == 2
+
+
+def test_blobs__modify_in_place(tmp_path: Path) -> None:
+    texts = DictDir(tmp_path / "texts", str, TextFile, blobs=True)
+    texts["a"].write("foo\n")
+    texts["b"].write("foo\n")
+    texts["a"].append("bar\n")
+    assert texts["a"].read() == "foo\nbar\n"
+    assert texts["b"].read() == "foo\n"
+
+    arrays = DictDir(tmp_path / "arrays", str, NpyFile, blobs=True)
+    arrays["a"].write(np.arange(3))
+    arrays["b"].write(np.arange(3))
+    arrays["a"].append(np.arange(2))
+    np.testing.assert_array_equal(arrays["a"].read(), [0, 1, 2, 0, 1])
+    np.testing.assert_array_equal(arrays["b"].read(), [0, 1, 2])
+
+
+def test_blobs__writing(tmp_path: Path) -> None:
+    d = DictDir(tmp_path, str, PandasParquetFile, blobs=True)
+    df = pd.DataFrame({"a": [1, 2, 3]})
+    d["a"].write(df)
+    d["b"].write(df)
+    pd.testing.assert_frame_equal(d["b"].read(), df)
+    assert (tmp_path / "a.parquet").stat().st_ino == (tmp_path / "b.parquet").stat().st_ino
+    assert len(_blobs(tmp_path)) == 1
+
+
+def test_blobs__collect_garbage(tmp_path: Path) -> None:
+    d = DictDir(tmp_path, str, PickleFile[list[int]], blobs=True)
+    d["a"].write([1, 2, 3])
+    d["b"].write([1, 2, 3])
+    size = (tmp_path / "a.pickle").stat().st_size
+    assert d.collect_garbage() == 0
+
+    d["a"].write([4])
+    assert d.collect_garbage() == 0
+    (tmp_path / "b.pickle").unlink()
+    assert d.collect_garbage() == size
+    assert len(_blobs(tmp_path)) == 1
+    assert d["a"].read() == [4]
+
+    # Blobs deleted by garbage collection are added again when needed:
+    d["b"].write([1, 2, 3])
+    assert d["b"].read() == [1, 2, 3]
+
+
+def test_blobs__shared_store(tmp_path: Path) -> None:
+    store = BlobStore(tmp_path / ".typedpath-blobs")
+    d1 = DictDir(tmp_path / "d1", str, BytesFile, blobs=store)
+    d2 = DictDir(tmp_path / "d2", int, BytesFile, blobs=store)
+    d1["a"].write(b"foo")
+    d2[1].write(b"foo")
+    assert (tmp_path / "d1" / "a.bin").stat().st_ino == (tmp_path / "d2" / "1.bin").stat().st_ino
+    assert set(d1) == {"a"}
+    assert store.collect_garbage() == 0
+
+
+def test_blobs__write_back(tmp_path: Path) -> None:
+    d = DictDir(tmp_path, str, BytesFile, blobs=True)
+    with write_back(delay=60):
+        for _ in range(10):
+            d["a"].write(os.urandom(10))
+            d["b"].write(b"foo")
+            d["c"].write(b"foo")
+        assert d["c"].read() == b"foo"
+    assert (tmp_path / "b.bin").stat().st_ino == (tmp_path / "c.bin").stat().st_ino
+    assert len(_blobs(tmp_path)) == 2
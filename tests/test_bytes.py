@@ -1,6 +1,13 @@
+import asyncio
+import io
+import os
+import socket
 from pathlib import Path
 
-from typedpath import BytesFile
+import numpy as np
+import pytest
+
+from typedpath import BytesFile, atomic_writes
 
 
 def test_bytes_file(tmp_path: Path) -> None:
@@ -14,3 +21,85 @@ def test_bytes_file(tmp_path: Path) -> None:
     assert d.exists()
     assert p.read_bytes() == b"foo"
     assert f.read() == b"foo"
+
+
+def test_bytes_file__async(tmp_path: Path) -> None:
+    f = BytesFile(tmp_path / "test.bin")
+    assert asyncio.run(f.awrite(b"foo")) == 3
+    assert asyncio.run(f.aread()) == b"foo"
+
+
+def test_bytes_file__read_range(tmp_path: Path) -> None:
+    f = BytesFile(tmp_path / "test.bin")
+    f.write(bytes(range(256)))
+    assert f.read_range(0, 4) == bytes([0, 1, 2, 3])
+    assert f.read_range(250, 10) == bytes(range(250, 256))
+    assert f.read_range(300, 10) == b""
+    assert f.read_range(10, 0) == b""
+    assert asyncio.run(f.aread_range(1, 2)) == bytes([1, 2])
+    with pytest.raises(AssertionError):
+        BytesFile(tmp_path / "missing.bin").read_range(0, 1)
+    with pytest.raises(AssertionError):
+        BytesFile(tmp_path).read_range(0, 1)
+
+
+def test_bytes_file__readinto(tmp_path: Path) -> None:
+    f = BytesFile(tmp_path / "test.bin")
+    f.write(bytes(range(256)))
+
+    buffer = bytearray(4)
+    assert f.readinto(buffer) == 4
+    assert buffer == bytes([0, 1, 2, 3])
+    assert f.readinto(buffer, 254) == 2
+    assert buffer == bytes([254, 255, 2, 3])
+
+    array = np.zeros(32, dtype=np.uint64)
+    assert f.readinto(array.data) == 256
+    assert array.tobytes() == bytes(range(256))
+
+
+def test_bytes_file__write_chunks(tmp_path: Path) -> None:
+    f = BytesFile(tmp_path / "test.bin")
+    chunks: list[bytes | bytearray | memoryview] = [b"foo", bytearray(b"bar"), memoryview(b"baz")]
+    assert f.write_chunks(iter(chunks)) == 9
+    assert f.read() == b"foobarbaz"
+    assert f.write_chunks([]) == 0
+    assert f.read() == b""
+
+
+@pytest.mark.parametrize("kernel_copy", [False, True])
+def test_bytes_file__write_from_file(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, kernel_copy: bool
+) -> None:
+    if not kernel_copy:
+        monkeypatch.delattr(os, "copy_file_range", raising=False)
+        monkeypatch.delattr(os, "sendfile", raising=False)
+    data = os.urandom(3_000_000)
+    source = tmp_path / "source.bin"
+    source.write_bytes(data)
+
+    f = BytesFile(tmp_path / "test.bin")
+    with open(source, "rb") as fp:
+        fp.read(10)
+        assert f.write_from(fp) == len(data) - 10
+        assert fp.read() == b""
+    assert f.read() == data[10:]
+
+    with atomic_writes(), open(source, "rb") as fp:
+        assert asyncio.run(f.awrite_from(fp)) == len(data)
+    assert f.read() == data
+
+
+def test_bytes_file__write_from_stream(tmp_path: Path) -> None:
+    data = os.urandom(3_000_000)
+    f = BytesFile(tmp_path / "test.bin")
+    assert f.write_from(io.BytesIO(data)) == len(data)
+    assert f.read() == data
+
+    reader, writer = socket.socketpair()
+    with reader, writer:
+        writer.sendall(b"foobar")
+        writer.shutdown(socket.SHUT_WR)
+        with reader.makefile("rb") as fp:
+            assert f.write_from(fp) == 6
+    assert f.read() == b"foobar"
@@ -0,0 +1,208 @@
+import os
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from typedpath import (
+    BytesFile,
+    DictDir,
+    JSONFile,
+    NpyFile,
+    PickleFile,
+    ReadCacheStats,
+    StdlibJSONBackend,
+    TextFile,
+    atomic_writes,
+    get_read_cache_stats,
+    read_cache,
+    set_read_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def enable_read_cache() -> Iterator[None]:
+    with read_cache(10_000):
+        yield
+
+
+def _hits_misses() -> tuple[int, int]:
+    stats = get_read_cache_stats()
+    return stats.hits, stats.misses
+
+
+def test_read_cache(tmp_path: Path) -> None:
+    f = JSONFile(tmp_path / "test.json")
+    f.write({"a": [1, 2]})
+
+    first = f.read()
+    assert _hits_misses() == (0, 1)
+    assert f.read() == first
+    assert JSONFile(tmp_path / "test.json").read() == first
+    assert _hits_misses() == (2, 1)
+
+    f.write({"a": [3]})
+    assert f.read() == {"a": [3]}
+    assert _hits_misses() == (2, 2)
+
+    stats = get_read_cache_stats()
+    assert stats.entries == 1
+    assert stats.size == (tmp_path / "test.json").stat().st_size
+    assert stats.max_size == 10_000
+
+
+def test_read_cache__external_changes(tmp_path: Path) -> None:
+    p = tmp_path / "test.txt"
+    f = TextFile(p)
+    f.write("foo")
+    assert f.read() == "foo"
+
+    p.write_text("foobar")
+    assert f.read() == "foobar"
+    tmp = tmp_path / "tmp.txt"
+    tmp.write_text("barfoo")
+    tmp.replace(p)
+    assert f.read() == "barfoo"
+    assert _hits_misses() == (0, 3)
+
+
+def test_read_cache__invalidated_by_appends(tmp_path: Path) -> None:
+    f = TextFile(tmp_path / "test.txt")
+    f.write("foo\n")
+    assert f.read() == "foo\n"
+    f.append("bar\n")
+    assert f.read() == "foo\nbar\n"
+
+
+def test_read_cache__options_and_arguments(tmp_path: Path) -> None:
+    p = tmp_path / "test.txt"
+    p.write_bytes("Søren".encode())
+
+    assert TextFile(p).read() == "Søren"
+    assert TextFile(p, encoding="latin-1").read() == "Søren".encode().decode("latin-1")
+    assert BytesFile(p).read() == "Søren".encode()
+    assert TextFile(p, encoding="ascii").read(errors="replace") == "S��ren"
+    assert _hits_misses() == (0, 4)
+
+
+def test_read_cache__copies(tmp_path: Path) -> None:
+    f = JSONFile(tmp_path / "test.json")
+    f.write([{"a": 1}])
+    value = f.read()
+    assert isinstance(value, list) and isinstance(value[0], dict)
+    value[0]["b"] = 2
+    value.append(3)
+    assert f.read() == [{"a": 1}]
+
+    a = NpyFile(tmp_path / "test.npy")
+    a.write(np.arange(3))
+    with pytest.raises(ValueError):
+        a.read()[0] = 5
+    assert a.read() is a.read()
+
+    # Copy-on-write memory-maps are not cached, so they are not copied:
+    c = NpyFile(tmp_path / "test.npy", mmap_mode="c")
+    c.read()[0] = 5
+    assert c.read()[0] == 0
+    assert isinstance(c.read(), np.memmap)
+    assert _hits_misses() == (3, 2)
+
+
+def test_read_cache__pickle_types(tmp_path: Path) -> None:
+    p = tmp_path / "test.pickle"
+    PickleFile(p, list[int]).write([1])
+    assert PickleFile(p, list[int]).read() == [1]
+    with pytest.raises(AssertionError):
+        PickleFile(p, dict[str, int]).read()
+
+
+def test_read_cache__json_backends(tmp_path: Path) -> None:
+    p = tmp_path / "test.json"
+    JSONFile(p).write({"a": 1})
+    assert JSONFile(p, backend="stdlib").read() == {"a": 1}
+    assert JSONFile(p, backend="stdlib").read() == {"a": 1}
+    assert JSONFile(p, backend=StdlibJSONBackend()).read() == {"a": 1}
+    assert _hits_misses() == (2, 1)
+
+
+def test_read_cache__eviction(tmp_path: Path) -> None:
+    files = [BytesFile(tmp_path / f"{i}.bin") for i in range(5)]
+    for f in files:
+        f.write(os.urandom(3_000))
+        f.read()
+    stats = get_read_cache_stats()
+    assert stats.entries == 3
+    assert stats.evictions == 2
+    assert stats.size <= 10_000
+
+    files[2].read()  # Most recently used, so 3 is evicted next.
+    BytesFile(tmp_path / "big.bin").write(os.urandom(20_000))
+    BytesFile(tmp_path / "big.bin").read()  # Too large to cache.
+    files[0].read()
+    assert _hits_misses() == (1, 7)
+    files[2].read()
+    assert _hits_misses() == (2, 7)
+
+
+def test_read_cache__numpy_size(tmp_path: Path) -> None:
+    f = NpyFile(tmp_path / "test.npy")
+    f.write(np.zeros(100, dtype=np.float64))
+    f.read()
+    assert get_read_cache_stats().size == 800
+
+
+def test_read_cache__dict_dir(tmp_path: Path) -> None:
+    d = DictDir(tmp_path, str, PickleFile[list[int]])
+    d["a"].write([1])
+    assert d["a"].read() == [1]
+    d["a"].write([2])
+    assert d["a"].read() == [2]
+    assert d.read_many(["a"]) == {"a": [2]}
+    assert _hits_misses() == (1, 2)
+
+
+def test_read_cache__threads(tmp_path: Path) -> None:
+    files = [JSONFile(tmp_path / f"{i}.json") for i in range(20)]
+    for i, f in enumerate(files):
+        f.write([i])
+
+    def read(i: int) -> None:
+        assert files[i % 20].read() == [i % 20]
+        if i % 7 == 0:
+            files[i % 20].write([i % 20])
+
+    with atomic_writes(), ThreadPoolExecutor(8) as executor:
+        list(executor.map(read, range(2_000)))
+    stats = get_read_cache_stats()
+    assert stats.hits + stats.misses == 2_000
+    assert stats.size <= stats.max_size
+
+
+def test_read_cache__nested(tmp_path: Path) -> None:
+    p = tmp_path / "test.txt"
+    f = TextFile(p)
+    f.write("foo")
+    assert f.read() == "foo"
+    mtime_ns = p.stat().st_mtime_ns
+    with read_cache(10_000):
+        f.write("bar")
+        # As if written in the same tick of the clock, so only the invalidation tells them apart:
+        os.utime(p, ns=(mtime_ns, mtime_ns))
+        assert f.read() == "bar"
+    assert f.read() == "bar"
+
+
+def test_set_read_cache(tmp_path: Path) -> None:
+    f = BytesFile(tmp_path / "test.bin")
+    f.write(b"foo")
+    with read_cache(None):
+        f.read()
+        assert get_read_cache_stats() == ReadCacheStats(0, 0, 0, 0, 0, 0)
+    try:
+        set_read_cache(100)
+        f.read()
+        assert get_read_cache_stats().max_size == 100
+    finally:
+        set_read_cache(None)
@@ -0,0 +1,205 @@
+import gzip
+import io
+import lzma
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from typedpath import (
+    BytesFile,
+    Compressed,
+    Compression,
+    CompressionFormat,
+    DictDir,
+    JSONFile,
+    JSONLinesFile,
+    PandasCsvFile,
+    PandasFeatherFile,
+    PickleFile,
+    StructDir,
+    TextFile,
+    atomic_writes,
+    compressed,
+    withargs,
+    write_back,
+)
+from typedpath.compression import ZSTD_AVAILABLE
+
+FORMATS = [
+    "gzip",
+    "xz",
+    pytest.param(
+        "zstd", marks=pytest.mark.skipif(not ZSTD_AVAILABLE, reason="zstandard not installed")
+    ),
+]
+
+
+def test_compressed__struct_dir(tmp_path: Path) -> None:
+    class TestDir(StructDir):
+        config: Compressed[JSONFile]
+        log: Compressed[TextFile] = withargs(compression=Compression("xz", level=1))
+        raw: TextFile
+
+    d = TestDir(tmp_path)
+    d.config.write({"a": [1, 2]})
+    d.log.write("foo\n")
+    d.raw.write("bar\n")
+
+    assert {p.name for p in tmp_path.iterdir()} == {"config.json.gz", "log.txt.xz", "raw.txt"}
+    assert gzip.decompress((tmp_path / "config.json.gz").read_bytes()) == b'{"a": [1, 2]}'
+    assert lzma.decompress((tmp_path / "log.txt.xz").read_bytes()) == b"foo\n"
+    assert d.config.read() == {"a": [1, 2]}
+    assert d.log.read() == "foo\n"
+
+
+def test_compressed__dict_dir(tmp_path: Path) -> None:
+    d = DictDir(
+        tmp_path,
+        str,
+        Compressed[PickleFile[list[int]]],
+        value_args=withargs(compression=Compression("xz"), out_of_band=True),
+    )
+    d["a"].write([1, 2, 3])
+    d["b"].write([4])
+
+    assert {p.name for p in tmp_path.iterdir()} == {"a.pickle.xz", "b.pickle.xz"}
+    assert set(d) == {"a", "b"}
+    assert d["a"].read() == [1, 2, 3]
+
+
+@pytest.mark.parametrize("compression_format", FORMATS)
+def test_compressed__text_file(tmp_path: Path, compression_format: CompressionFormat) -> None:
+    f = compressed(TextFile(tmp_path / "test.txt"), Compression(compression_format))
+    f.write("foo\nbar\n")
+    f.append("baz\n")
+
+    assert f.read() == "foo\nbar\nbaz\n"
+    assert list(f.iter_lines()) == ["foo", "bar", "baz"]
+    assert f.tail(2) == ["bar", "baz"]
+    assert (tmp_path / "test.txt").read_bytes() != b"foo\nbar\nbaz\n"
+
+
+def test_compressed__json_lines_file(tmp_path: Path) -> None:
+    f = compressed(JSONLinesFile(tmp_path / "test.jsonl.gz"))
+    f.write([{"i": i} for i in range(3)])
+    f.extend([{"i": 3}])
+
+    assert f.read() == [{"i": i} for i in range(4)]
+    assert f.tail(2) == [{"i": 2}, {"i": 3}]
+    assert f.record(-1) == {"i": 3}
+
+    indexed = compressed(JSONLinesFile(tmp_path / "indexed.jsonl.gz", index=True))
+    with pytest.raises(AssertionError):
+        indexed.write([{"i": 0}])
+
+
+def test_compressed__pickle_file(tmp_path: Path) -> None:
+    f = compressed(PickleFile(tmp_path / "test.pickle.gz", dict, out_of_band=True))
+    data = {"array": np.arange(10_000)}
+    f.write(data)
+
+    np.testing.assert_array_equal(f.read()["array"], data["array"])
+
+
+def test_compressed__pandas_csv_file(tmp_path: Path) -> None:
+    f = compressed(PandasCsvFile(tmp_path / "test.csv.gz", schema=True))
+    df = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+    f.write(df)
+    f.append(df)
+
+    expected = pd.concat([df, df], ignore_index=True)
+    pd.testing.assert_frame_equal(f.read(), expected)
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "test.csv.gz"), expected)
+    pd.testing.assert_frame_equal(
+        pd.concat(f.iter_chunks(chunksize=3), ignore_index=True), expected
+    )
+
+
+def test_compressed__bytes_file(tmp_path: Path) -> None:
+    f = compressed(BytesFile(tmp_path / "test.bin.gz"))
+    f.write_from(io.BytesIO(b"0123456789"))
+
+    assert f.read() == b"0123456789"
+    assert f.read_range(2, 3) == b"234"
+    buffer = bytearray(4)
+    assert f.readinto(buffer, offset=8) == 2
+    assert buffer[:2] == b"89"
+
+    source = tmp_path / "source.bin"
+    source.write_bytes(b"abc")
+    with source.open("rb") as fp:
+        f.write_from(fp)
+    assert f.read() == b"abc"
+    assert gzip.decompress((tmp_path / "test.bin.gz").read_bytes()) == b"abc"
+
+
+def test_compressed__paths(tmp_path: Path) -> None:
+    f = compressed(PandasFeatherFile(tmp_path / "test.feather.gz"))
+    df = pd.DataFrame({"a": [1, 2, 3]})
+    f.write(df)
+
+    pd.testing.assert_frame_equal(f.read(), df)
+    assert [p.name for p in tmp_path.iterdir()] == ["test.feather.gz"]
+    data = gzip.decompress((tmp_path / "test.feather.gz").read_bytes())
+    pd.testing.assert_frame_equal(pd.read_feather(io.BytesIO(data)), df)
+
+    with pytest.raises(AssertionError):
+        f.read_path()
+    with pytest.raises(AssertionError):
+        f.write_path()
+
+    # Decompressed copies are not written next to the data:
+    with f.reading() as path:
+        assert path.name == "test.feather"
+        assert path.parent != tmp_path
+        assert [p.name for p in tmp_path.iterdir()] == ["test.feather.gz"]
+    assert not path.exists()
+    with f.writing() as path:
+        assert path.parent != tmp_path
+        df.to_feather(path)
+    pd.testing.assert_frame_equal(f.read(), df)
+
+
+def test_compressed__read_write_modes(tmp_path: Path) -> None:
+    f = compressed(BytesFile(tmp_path / "test.bin.gz"))
+    f.write(b"foo")
+    with pytest.raises(AssertionError), f.open_write("r+b"):
+        pass
+    assert f.read() == b"foo"
+
+
+def test_compressed__write_back(tmp_path: Path) -> None:
+    d = DictDir(tmp_path, int, Compressed[JSONFile], blobs=True)
+    with write_back(delay=60), atomic_writes():
+        for i in range(10):
+            d[i].write({"value": i % 2})
+        assert d[3].read() == {"value": 1}
+
+    assert (tmp_path / "1.json.gz").stat().st_ino == (tmp_path / "3.json.gz").stat().st_ino
+    assert d[0].read() == {"value": 0}
+
+
+def test_compressed__missing(tmp_path: Path) -> None:
+    f = compressed(TextFile(tmp_path / "test.txt.gz"))
+    with pytest.raises(AssertionError):
+        f.read()
+
+
+def test_compression__invalid() -> None:
+    with pytest.raises(AssertionError):
+        Compression("gzip", threads=2)
+    with pytest.raises(AssertionError):
+        Compression("xz", level=10)
+    with pytest.raises(AssertionError):
+        Compression("gzip", level=-1)
+    with pytest.raises(AssertionError):
+        DictDir(Path("test"), str, Compressed[DictDir[str, TextFile]])
+
+
+@pytest.mark.skipif(not ZSTD_AVAILABLE, reason="zstandard not installed")
+def test_compression__zstd_threads(tmp_path: Path) -> None:
+    f = compressed(TextFile(tmp_path / "test.txt.zst"), Compression("zstd", level=1, threads=2))
+    f.write("foo\n" * 100_000)
+    assert f.read() == "foo\n" * 100_000
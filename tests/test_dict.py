@@ -1,9 +1,13 @@
+import asyncio
+import os
 from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 import pytest
 
+import typedpath.dict
 from tests.utils import TestFile, TestGenericDir
 from typedpath import DictDir, StrKeyCodec, withargs
 
@@ -131,3 +135,234 @@ def test_dict_dir__args(tmp_path: Path) -> None:
     assert int is d2["test"].t
     assert str is d2["test"].u
     assert d2["test"].kwargs == {"foo": 1, "bar": 2}
+
+
+def test_dict_dir__snapshot(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    scans = []
+    scandir = os.scandir
+
+    def counting_scandir(path: Path) -> Any:
+        scans.append(path)
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", counting_scandir)
+
+    d = DictDir(tmp_path, str, TestFile, snapshot=True)
+    d["a"].write("1")
+    d["b"].write("2")
+    # Pretend the directory was last modified a long time ago, so the snapshot can be trusted:
+    os.utime(tmp_path, ns=(0, 0))
+
+    assert len(d) == 2
+    assert set(d) == {"a", "b"}
+    assert "a" in d
+    assert "c" not in d
+    assert len(scans) == 1
+
+    # Overwriting a value does not modify the directory, so the snapshot is kept:
+    d["a"].write("4")
+    assert len(d) == 2
+    assert len(scans) == 1
+
+    # Adding a value through the `DictDir` updates the snapshot, without scanning again:
+    d["c"].write("3")
+    assert len(d) == 3
+    assert set(d) == {"a", "b", "c"}
+    assert "c" in d
+    assert len(scans) == 1
+
+    # Other changes are detected through the modification time of the directory:
+    (tmp_path / "a.test").unlink()
+    os.utime(tmp_path, ns=(10**9, 10**9))
+    assert len(d) == 2
+    assert set(d) == {"b", "c"}
+    assert "a" not in d
+    assert len(scans) == 2
+
+
+def test_dict_dir__snapshot__many_writes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    scans = []
+    scandir = os.scandir
+
+    def counting_scandir(path: Path) -> Any:
+        scans.append(path)
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", counting_scandir)
+
+    d = DictDir(tmp_path, int, TestFile, snapshot=True)
+    assert len(d) == 0
+    for i in range(100):
+        d[i].write(str(i))
+        assert i in d
+        assert len(d) == i + 1
+    assert len(scans) == 1
+
+
+def test_dict_dir__snapshot__missing(tmp_path: Path) -> None:
+    d = DictDir(tmp_path / "missing", str, TestFile, snapshot=True)
+    assert "a" not in d
+    assert len(d) == 0
+    assert list(d) == []
+
+    d["a"].write("1")
+    assert "a" in d
+    assert list(d) == ["a"]
+
+
+def test_dict_dir__snapshot__racy(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    d = DictDir(tmp_path, str, TestFile, snapshot=True)
+
+    # The directory was just modified, so the snapshot is checked again later:
+    (tmp_path / "a.test").write_text("1")
+    mtime_ns = tmp_path.stat().st_mtime_ns
+    assert len(d) == 1
+
+    # Simulate a modification so fast that the modification time does not change:
+    (tmp_path / "b.test").write_text("2")
+    os.utime(tmp_path, ns=(mtime_ns, mtime_ns))
+    assert len(d) == 1
+    # Found once the modification time could no longer stay the same:
+    monkeypatch.setattr(typedpath.dict, "_RACY_NS", 0)
+    assert len(d) == 2
+
+    # The same applies to modifications just after a write through the `DictDir`:
+    monkeypatch.setattr(typedpath.dict, "_RACY_NS", 10**12)
+    d["c"].write("3")
+    mtime_ns = tmp_path.stat().st_mtime_ns
+    (tmp_path / "d.test").write_text("4")
+    os.utime(tmp_path, ns=(mtime_ns, mtime_ns))
+    assert len(d) == 3
+    monkeypatch.setattr(typedpath.dict, "_RACY_NS", 0)
+    assert len(d) == 4
+
+
+class _CountingKeyCodec(StrKeyCodec):
+    def __init__(self, bijective: bool) -> None:
+        super().__init__()
+        self.bijective = bijective
+        self.encodes = 0
+        self.decodes = 0
+
+    def encode(self, key: Any) -> str:
+        self.encodes += 1
+        return super().encode(key)
+
+    def decode(self, key_str: str, key_type: type[Any]) -> Any:
+        self.decodes += 1
+        return super().decode(key_str, key_type)
+
+    def is_bijective(self, key_type: type[Any]) -> bool:
+        return self.bijective
+
+
+@pytest.mark.parametrize("bijective,expected_decodes", [(False, 2), (True, 0)])
+def test_dict_dir__cache(tmp_path: Path, bijective: bool, expected_decodes: int) -> None:
+    codec = _CountingKeyCodec(bijective)
+    d = DictDir(tmp_path, str, TestFile, key_codec=codec, cache_size=2)
+
+    a = d["a"]
+    assert a is d["a"]
+    assert tmp_path / "a.test" == a.pretty_path()
+    b = d["b"]
+    assert b is d["b"]
+    assert a is d["a"]
+    assert codec.encodes == 2
+    assert codec.decodes == expected_decodes
+
+    d["c"]
+    assert b is not d["b"]
+    assert codec.encodes == 4
+
+
+def test_dict_dir__bool_keys_of_int(tmp_path: Path) -> None:
+    d = DictDir(tmp_path, int, TestFile)
+    d[1].write("1")
+    # `bool` is a subclass of `int`, but `True` is stored as "True", which is not an `int`:
+    with pytest.raises(ValueError, match="True"):
+        d[True]
+    assert list(d) == [1]
+
+
+def test_dict_dir__no_cache(tmp_path: Path) -> None:
+    d = DictDir(tmp_path, str, TestFile, cache_size=0)
+    assert d["a"] is not d["a"]
+    assert d["a"].pretty_path() == d["a"].pretty_path()
+
+
+def test_dict_dir__async(tmp_path: Path) -> None:
+    data = {str(i): str(i) for i in range(3000)}
+
+    async def run() -> None:
+        d = DictDir(tmp_path, str, TestFile)
+        for k, v in data.items():
+            d[k].write(v)
+
+        assert set(data) == {k async for k in d}
+        assert data == {k: v.read() async for k, v in d.aitems()}
+
+    asyncio.run(run())
+
+
+def test_dict_dir__read_write_many(tmp_path: Path) -> None:
+    d = DictDir(tmp_path, int, TestFile)
+    data = {i: str(i) for i in reversed(range(100))}
+
+    assert {i: len(v) for i, v in data.items()} == d.write_many(data, max_in_flight=8)
+    result = d.read_many(data, max_in_flight=8)
+    assert data == result
+    assert list(data) == list(result)
+
+
+def test_dict_dir__read_write_many__executor(tmp_path: Path) -> None:
+    d = DictDir(tmp_path, int, TestFile)
+    data = {i: str(i) for i in range(10)}
+
+    with ThreadPoolExecutor(2) as executor:
+        d.write_many(((k, v) for k, v in data.items()), executor=executor)
+        assert data == d.read_many(range(10), executor=executor)
+
+
+def test_dict_dir__read_many__errors(tmp_path: Path) -> None:
+    d = DictDir(tmp_path, int, TestFile)
+    d.write_many({0: "0", 2: "2"})
+
+    with pytest.raises(AssertionError):
+        d.read_many(range(3))
+
+    result = d.read_many(range(3), return_exceptions=True)
+    assert list(result) == [0, 1, 2]
+    assert result[0] == "0"
+    assert isinstance(result[1], AssertionError)
+    assert result[2] == "2"
+
+
+@pytest.mark.parametrize("snapshot", [False, True])
+def test_dict_dir__items_values__no_key_encoding(tmp_path: Path, snapshot: bool) -> None:
+    DictDir(tmp_path, str, TestFile).write_many({"a": "1", "b": "2"})
+    codec = _CountingKeyCodec(bijective=False)
+    d = DictDir(tmp_path, str, TestFile, key_codec=codec, snapshot=snapshot)
+
+    assert len(d.items()) == 2
+    assert ("a", d["a"]) in d.items()
+    assert {k: v.read() for k, v in d.items()} == {"a": "1", "b": "2"}
+    assert {"1", "2"} == {v.read() for v in d.values()}
+    codec.encodes = 0
+    assert {k: v.read() for k, v in d.items()} == {"a": "1", "b": "2"}
+    assert {"1", "2"} == {v.read() for v in d.values()}
+    assert codec.encodes == 0
+
+
+@pytest.mark.parametrize("snapshot", [False, True])
+@pytest.mark.parametrize(
+    "prefetch,max_prefetch_bytes", [(0, None), (3, None), (100, None), (100, 10), (100, 0)]
+)
+def test_dict_dir__read_items(
+    tmp_path: Path, snapshot: bool, prefetch: int, max_prefetch_bytes: int | None
+) -> None:
+    d = DictDir(tmp_path, int, TestFile, snapshot=snapshot)
+    data = {i: str(i) for i in range(20)}
+    d.write_many(data)
+
+    result = dict(d.read_items(prefetch=prefetch, max_prefetch_bytes=max_prefetch_bytes))
+    assert data == result
@@ -0,0 +1,149 @@
+import os
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.utils import TestFile
+from typedpath import (
+    BytesFile,
+    DictDir,
+    JSONFile,
+    NpyFile,
+    NpzFile,
+    PandasCsvFile,
+    PandasFeatherFile,
+    PandasParquetFile,
+    PickleFile,
+    TextFile,
+    TypedFile,
+    atomic_writes,
+    durability,
+)
+from typedpath.base import RESERVED_PREFIX
+from typedpath.durability import is_atomic
+
+
+def test_atomic_writes() -> None:
+    assert not is_atomic()
+    with atomic_writes():
+        assert is_atomic()
+        with atomic_writes(False):
+            assert not is_atomic()
+        assert is_atomic()
+    assert not is_atomic()
+
+
+def test_atomic_writes__open_write(tmp_path: Path) -> None:
+    p = tmp_path / "a.test"
+    f = TestFile(p)
+    f.write("old")
+
+    with atomic_writes(), f.open_write("wt", encoding="utf-8") as fp:
+        fp.write("new")
+        fp.flush()
+        assert p.read_text(encoding="utf-8") == "old"
+        assert len(list(tmp_path.iterdir())) == 2
+    assert p.read_text(encoding="utf-8") == "new"
+    assert [p] == list(tmp_path.iterdir())
+
+
+def test_atomic_writes__error(tmp_path: Path) -> None:
+    p = tmp_path / "a.test"
+    f = TestFile(p)
+    f.write("old")
+
+    def write_and_fail() -> None:
+        with atomic_writes(), f.open_write("wt", encoding="utf-8") as fp:
+            fp.write("new")
+            raise ValueError("Test error")
+
+    with pytest.raises(ValueError):
+        write_and_fail()
+    assert p.read_text(encoding="utf-8") == "old"
+    assert [p] == list(tmp_path.iterdir())
+
+
+def test_atomic_writes__dict_dir_ignores_temporary_files(tmp_path: Path) -> None:
+    d = DictDir(tmp_path, str, TestFile)
+    d["a"].write("a")
+    with atomic_writes(), d["b"].open_write() as fp:
+        fp.write(b"b")
+        assert len(list(tmp_path.iterdir())) == 2
+        assert len(d) == 1
+        assert {"a"} == set(d)
+    assert len(d) == 2
+    assert {"a", "b"} == set(d)
+
+
+_FILES: list[tuple[type[TypedFile], Callable[[Path], Any], Any]] = [
+    (TextFile, TextFile, "foo"),
+    (BytesFile, BytesFile, b"foo"),
+    (JSONFile, JSONFile, {"foo": 1}),
+    (PickleFile, lambda p: PickleFile(p, int), 1),
+    (NpyFile, NpyFile, np.arange(3)),
+    (NpzFile, NpzFile, np.arange(3)),
+    (PandasCsvFile, PandasCsvFile, pd.DataFrame({"a": [1]})),
+    (PandasFeatherFile, PandasFeatherFile, pd.DataFrame({"a": [1]})),
+    (PandasParquetFile, PandasParquetFile, pd.DataFrame({"a": [1]})),
+]
+
+
+@pytest.mark.parametrize("file_type,make_file,data", _FILES)
+def test_durability(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    file_type: type[TypedFile],
+    make_file: Callable[[Path], Any],
+    data: Any,
+) -> None:
+    synced = []
+    fsync = os.fsync
+
+    def recording_fsync(fd: int) -> None:
+        synced.append(Path(f"/proc/self/fd/{fd}").readlink())
+        fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", recording_fsync)
+
+    f1 = make_file(tmp_path / "a" / f"1{file_type.default_suffix}")
+    f2 = make_file(tmp_path / "b" / f"2{file_type.default_suffix}")
+    with durability():
+        assert is_atomic()
+        f1.write(data)
+        f2.write(data)
+        f1.write(data)
+        # The temporary files are synced before they are renamed into place:
+        assert len(synced) == 3
+        assert all(p.name.startswith(RESERVED_PREFIX) for p in synced)
+    assert not is_atomic()
+
+    p1 = f1.pretty_path()
+    p2 = f2.pretty_path()
+    # Files synced before their rename are not synced again, only their directories:
+    assert len(synced) == 5
+    assert {p1.parent, p2.parent} == set(synced[3:])
+    assert {p1} == set((tmp_path / "a").iterdir())
+    assert {p2} == set((tmp_path / "b").iterdir())
+
+
+def test_durability__appends(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    synced = []
+    fsync = os.fsync
+
+    def recording_fsync(fd: int) -> None:
+        synced.append(Path(f"/proc/self/fd/{fd}").readlink())
+        fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", recording_fsync)
+
+    f = TextFile(tmp_path / "test.txt")
+    with durability():
+        f.write("foo\n")
+        f.append("bar\n")
+    # Modified since it was synced before its rename, so synced again:
+    assert synced[1:] == [f.pretty_path(), tmp_path]
+    assert f.read() == "foo\nbar\n"
@@ -0,0 +1,55 @@
+import asyncio
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+from typedpath import get_io_executor, set_io_executor, set_io_workers
+from typedpath.executor import DEFAULT_IO_WORKERS, map_bounded, run_io
+
+
+def test_run_io() -> None:
+    def f(a: int, *, b: int) -> tuple[int, str]:
+        return a + b, threading.current_thread().name
+
+    result, thread_name = asyncio.run(run_io(f, 1, b=2))
+    assert result == 3
+    assert thread_name.startswith("typedpath-io")
+
+
+def test_set_io_workers() -> None:
+    try:
+        set_io_workers(2)
+        executor = get_io_executor()
+        assert isinstance(executor, ThreadPoolExecutor)
+        assert executor._max_workers == 2
+        assert executor is get_io_executor()
+    finally:
+        set_io_workers(DEFAULT_IO_WORKERS)
+
+
+def test_set_io_executor() -> None:
+    with ThreadPoolExecutor(1, thread_name_prefix="test-executor") as executor:
+        try:
+            set_io_executor(executor)
+            assert executor is get_io_executor()
+            thread_name = asyncio.run(run_io(lambda: threading.current_thread().name))
+            assert thread_name.startswith("test-executor")
+        finally:
+            set_io_executor(None)
+    assert executor is not get_io_executor()
+
+
+def test_map_bounded() -> None:
+    consumed = []
+
+    def items() -> Iterator[int]:
+        for i in range(10):
+            consumed.append(i)
+            yield i
+
+    results = map_bounded(lambda i: 2 * i, items(), max_in_flight=3)
+    assert not consumed
+    assert next((i, f.result()) for i, f in results) == (0, 0)
+    assert len(consumed) == 3
+    assert [(i, 2 * i) for i in range(1, 10)] == [(i, f.result()) for i, f in results]
+    assert len(consumed) == 10
@@ -1,10 +1,24 @@
+import asyncio
 import json
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from pathlib import Path
+from typing import Any
 
 import pytest
 
-from typedpath import JSON, JSONFile
+from typedpath import (
+    JSON,
+    JSONBackend,
+    JSONFile,
+    JSONLinesFile,
+    MutableJSON,
+    StdlibJSONBackend,
+    StructDir,
+    get_json_backend,
+    set_json_backend,
+    withargs,
+)
+from typedpath.json import MSGSPEC_AVAILABLE, ORJSON_AVAILABLE, JSONBackendName
 
 _DATA: Sequence[JSON] = [
     42,
@@ -23,16 +37,181 @@ _DATA: Sequence[JSON] = [
 ]
 
 
+_BACKENDS = [
+    "stdlib",
+    pytest.param(
+        "orjson", marks=pytest.mark.skipif(not ORJSON_AVAILABLE, reason="orjson not installed")
+    ),
+    pytest.param(
+        "msgspec", marks=pytest.mark.skipif(not MSGSPEC_AVAILABLE, reason="msgspec not installed")
+    ),
+    "auto",
+]
+
+
+@pytest.fixture
+def restore_json_backend() -> Iterator[None]:
+    backend = get_json_backend()
+    yield
+    set_json_backend(backend)
+
+
+@pytest.mark.parametrize("backend", _BACKENDS)
 @pytest.mark.parametrize("data", _DATA)
-def test_json_file(tmp_path: Path, data: JSON) -> None:
+def test_json_file(tmp_path: Path, backend: JSONBackendName, data: JSON) -> None:
     d = tmp_path / "dir"
     assert not d.exists()
     p = d / "test.json"
 
-    f = JSONFile(p)
+    f = JSONFile(p, backend=backend)
     f.write(data)
 
     assert d.exists()
     with open(p, "rt", encoding="utf-8") as fp:
         assert data == json.load(fp)
     assert data == f.read()
+
+
+@pytest.mark.parametrize("backend", _BACKENDS)
+def test_json_file__encoding(tmp_path: Path, backend: JSONBackendName) -> None:
+    data = {"name": "Søren"}
+    f = JSONFile(tmp_path / "test.json", encoding="latin-1", backend=backend)
+    f.write(data)
+    assert data == f.read()
+    with open(f.pretty_path(), "rt", encoding="latin-1") as fp:
+        assert data == json.load(fp)
+
+
+def test_json_file__kwargs(tmp_path: Path) -> None:
+    f = JSONFile(tmp_path / "test.json", backend="stdlib")
+    f.write({"b": 1, "a": 2}, indent=2, sort_keys=True)
+    assert f.pretty_path().read_text() == '{\n  "a": 2,\n  "b": 1\n}'
+    assert f.read(parse_int=float) == {"a": 2.0, "b": 1.0}
+
+
+class _CountingBackend(StdlibJSONBackend):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def dumps(self, data: JSON, **kwargs: Any) -> bytes:
+        self.calls += 1
+        return super().dumps(data, **kwargs)
+
+    def loads(self, data: bytes | str, **kwargs: Any) -> MutableJSON:
+        self.calls += 1
+        return super().loads(data, **kwargs)
+
+
+@pytest.mark.usefixtures("restore_json_backend")
+def test_set_json_backend(tmp_path: Path) -> None:
+    backend = _CountingBackend()
+    f = JSONFile(tmp_path / "test.json")
+
+    set_json_backend(backend)
+    assert backend is get_json_backend()
+    f.write([1])
+    assert f.read() == [1]
+    assert backend.calls == 2
+
+    set_json_backend("stdlib")
+    f.read()
+    assert backend.calls == 2
+
+
+def test_json_file__backend_withargs(tmp_path: Path) -> None:
+    backend = _CountingBackend()
+
+    class Config(StructDir):
+        settings: JSONFile = withargs(backend=backend)
+
+    config = Config(tmp_path)
+    config.settings.write({"a": 1})
+    assert config.settings.read() == {"a": 1}
+    assert backend.calls == 2
+    assert isinstance(backend, JSONBackend)
+
+
+def test_json_file__async(tmp_path: Path) -> None:
+    f = JSONFile(tmp_path / "test.json")
+    asyncio.run(f.awrite({"foo": [1, 2]}))
+    assert asyncio.run(f.aread()) == {"foo": [1, 2]}
+
+
+@pytest.mark.parametrize("backend", _BACKENDS)
+@pytest.mark.parametrize("index", [False, True])
+def test_json_lines_file(tmp_path: Path, backend: JSONBackendName, index: bool) -> None:
+    p = tmp_path / "dir" / "events.jsonl"
+    f = JSONLinesFile(p, backend=backend, index=index)
+
+    f.append(_DATA[0])
+    f.extend(_DATA[1:])
+
+    lines = p.read_text("utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == list(_DATA)
+    assert f.read() == list(_DATA)
+    assert list(f.iter()) == list(_DATA)
+    for i, data in enumerate(_DATA):
+        assert f.record(i) == data
+        assert f.record(i - len(_DATA)) == data
+    assert f.tail(0) == []
+    assert f.tail(2) == list(_DATA[-2:])
+    assert f.tail(100) == list(_DATA)
+    with pytest.raises(IndexError):
+        f.record(len(_DATA))
+    with pytest.raises(IndexError):
+        f.record(-len(_DATA) - 1)
+
+    f.write(["a", "b"])
+    assert f.read() == ["a", "b"]
+    assert f.record(-1) == "b"
+    assert f.tail(1) == ["b"]
+    expected = [".typedpath-index-events.jsonl", "events.jsonl"] if index else ["events.jsonl"]
+    assert sorted(c.name for c in p.parent.iterdir()) == expected
+
+
+def test_json_lines_file__large(tmp_path: Path) -> None:
+    records: list[JSON] = [{"i": i, "text": "x" * (i % 100)} for i in range(20_000)]
+    f = JSONLinesFile(tmp_path / "events.jsonl", index=True)
+    f.extend(iter(records))
+
+    assert list(f.iter()) == records
+    assert f.record(12_345) == records[12_345]
+    assert f.tail(3) == records[-3:]
+    assert JSONLinesFile(tmp_path / "events.jsonl").tail(1_000) == records[-1_000:]
+
+
+def test_json_lines_file__index_external_changes(tmp_path: Path) -> None:
+    p = tmp_path / "events.jsonl"
+    f = JSONLinesFile(p, index=True)
+    f.extend([1, 2])
+    assert f.record(-1) == 2
+
+    # Appended by someone else, with blank lines:
+    with open(p, "ab") as fp:
+        fp.write(b"3\n\n4\n")
+    assert f.record(2) == 3
+    assert f.record(-1) == 4
+    f.append(5)
+    assert JSONLinesFile(p, index=True).tail(3) == [3, 4, 5]
+
+    # Rewritten by someone else:
+    p.write_bytes(b"6\n")
+    assert JSONLinesFile(p, index=True).read() == [6]
+    assert JSONLinesFile(p, index=True).record(0) == 6
+    with pytest.raises(IndexError):
+        JSONLinesFile(p, index=True).record(1)
+
+
+def test_json_lines_file__missing(tmp_path: Path) -> None:
+    f = JSONLinesFile(tmp_path / "events.jsonl", index=True)
+    with pytest.raises(AssertionError):
+        f.record(0)
+    with pytest.raises(AssertionError):
+        f.read()
+
+
+def test_json_lines_file__async(tmp_path: Path) -> None:
+    f = JSONLinesFile(tmp_path / "events.jsonl")
+    asyncio.run(f.awrite([1]))
+    asyncio.run(f.aextend([2, 3]))
+    assert asyncio.run(f.aread()) == [1, 2, 3]
@@ -44,3 +44,20 @@ def test_get_key_codec() -> None:
     assert isinstance(get_key_codec(str), StrKeyCodec)
     assert isinstance(get_key_codec(float), StrKeyCodec)
     assert isinstance(get_key_codec(bool), BoolKeyCodec)
+
+
+@pytest.mark.parametrize(
+    "codec,key_type,expected",
+    [
+        (StrKeyCodec(), str, True),
+        (StrKeyCodec(), int, True),
+        (StrKeyCodec(), float, False),
+        (StrKeyCodec(), Path, False),
+        (StrKeyCodec(escape=False), str, True),
+        (StrKeyCodec(escape=False), int, True),
+        (StrKeyCodec(escape=False), float, False),
+        (BoolKeyCodec(), bool, True),
+    ],
+)
+def test_key_codec__is_bijective(codec: KeyCodec[T], key_type: type[T], expected: bool) -> None:
+    assert expected == codec.is_bijective(key_type)
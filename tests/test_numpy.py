@@ -1,9 +1,23 @@
+import asyncio
+import zipfile
 from pathlib import Path
+from typing import Any
 
 import numpy as np
 import pytest
 
-from typedpath import AnyNDArray, NpyFile, NpzFile
+import typedpath.base
+import typedpath.numpy
+from typedpath import (
+    AnyNDArray,
+    DictDir,
+    NpyFile,
+    NpyHeader,
+    NpzArrays,
+    NpzFile,
+    set_io_workers,
+)
+from typedpath.executor import DEFAULT_IO_WORKERS
 
 _DATA = [
     np.array([], dtype=np.float32),
@@ -26,6 +40,149 @@ def test_npy_file(tmp_path: Path, data: AnyNDArray) -> None:
     np.testing.assert_array_equal(data, f.read(), strict=True)
 
 
+@pytest.mark.parametrize("data", _DATA)
+def test_npy_file__mmap(tmp_path: Path, data: AnyNDArray) -> None:
+    f = NpyFile(tmp_path / "test.npy", mmap_mode="r")
+    f.write(data)
+
+    result = f.read()
+    assert isinstance(result, np.memmap)
+    np.testing.assert_array_equal(data, result)
+    assert not result.flags.writeable
+
+
+@pytest.mark.parametrize("order", ["C", "F"])
+def test_npy_file__header(tmp_path: Path, order: str) -> None:
+    data = np.zeros((3, 4), dtype=np.float32, order=order)  # type: ignore[call-overload]
+    f = NpyFile(tmp_path / "test.npy")
+    f.write(data)
+
+    header = f.header()
+    assert header.shape == (3, 4)
+    assert header.dtype == np.float32
+    assert header.fortran_order == (order == "F")
+    assert header.size == 12
+    assert header.nbytes == 48
+    assert header is f.header()
+
+    f.write(np.arange(5))
+    assert NpyHeader((5,), np.dtype(np.int64), False, header.offset) == f.header()
+
+
+def test_npy_file__header_versions(tmp_path: Path) -> None:
+    # Field names that are not latin-1 need version 3.0:
+    data = np.zeros(2, dtype=[("数", np.int32)])
+    p = tmp_path / "test.npy"
+    np.save(p, data)
+    assert p.read_bytes()[6:8] == b"\x03\x00"
+    header = NpyFile(p).header()
+    assert header.shape == (2,)
+    assert header.dtype == data.dtype
+    assert header.offset == len(p.read_bytes()) - data.nbytes
+
+    encoded = bytearray(p.read_bytes())
+    encoded[6:8] = b"\x04\x00"
+    (tmp_path / "unknown.npy").write_bytes(encoded)
+    with pytest.raises(ValueError, match="4.0"):
+        NpyFile(tmp_path / "unknown.npy").header()
+
+
+@pytest.mark.parametrize("order", ["C", "F"])
+@pytest.mark.parametrize(
+    "index",
+    [0, -1, slice(None), slice(2, 5), slice(1, 9, 3), (slice(None), 1), (4, 2), np.array([5, 0])],
+)
+def test_npy_file__read_slice(tmp_path: Path, order: str, index: Any) -> None:
+    data = np.asarray(np.arange(30).reshape(10, 3), order=order)  # type: ignore[call-overload]
+    f = NpyFile(tmp_path / "test.npy")
+    f.write(data)
+
+    np.testing.assert_array_equal(data[index], f.read_slice(index), strict=True)
+    view = f.read_slice(index, copy=False)
+    np.testing.assert_array_equal(data[index], view)
+    if isinstance(view, np.ndarray) and not isinstance(index, np.ndarray):
+        assert not view.flags.writeable
+
+
+def test_npy_file__read_slice__empty(tmp_path: Path) -> None:
+    data = np.zeros((0, 3))
+    f = NpyFile(tmp_path / "test.npy")
+    f.write(data)
+
+    np.testing.assert_array_equal(data[:5], f.read_slice(slice(5)), strict=True)
+
+
+def test_npy_file__read_slice__missing(tmp_path: Path) -> None:
+    with pytest.raises(AssertionError):
+        NpyFile(tmp_path / "test.npy").read_slice(0)
+
+
+def test_npy_file__append(tmp_path: Path) -> None:
+    f = NpyFile(tmp_path / "dir" / "test.npy")
+    f.append(np.zeros((2, 3), dtype=np.int32))
+    f.append(np.ones((1, 3), dtype=np.int32))
+    f.append(np.zeros((0, 3), dtype=np.int32))
+
+    expected = np.array([[0, 0, 0], [0, 0, 0], [1, 1, 1]], dtype=np.int32)
+    np.testing.assert_array_equal(expected, f.read(), strict=True)
+    np.testing.assert_array_equal(expected, np.load(f.pretty_path()), strict=True)
+
+
+def test_npy_file__append__existing(tmp_path: Path) -> None:
+    f = NpyFile(tmp_path / "test.npy")
+    f.write(np.arange(3))
+    f.append(np.arange(3, 5))
+    np.testing.assert_array_equal(np.arange(5), f.read(), strict=True)
+
+    # Anything after the data is discarded:
+    with open(f.pretty_path(), "ab") as fp:
+        fp.write(b"garbage")
+    f.append(np.arange(5, 6))
+    np.testing.assert_array_equal(np.arange(6), f.read(), strict=True)
+
+
+def test_npy_file__append__bad_chunk(tmp_path: Path) -> None:
+    f = NpyFile(tmp_path / "test.npy")
+    f.write(np.zeros((2, 3), dtype=np.int32))
+
+    with pytest.raises(AssertionError):
+        f.append(np.zeros((2, 4), dtype=np.int32))
+    with pytest.raises(AssertionError):
+        f.append(np.zeros((2, 3), dtype=np.int64))
+    with pytest.raises(AssertionError):
+        f.append(np.array(1, dtype=np.int32))
+    np.testing.assert_array_equal(np.zeros((2, 3), dtype=np.int32), f.read(), strict=True)
+
+
+def test_npy_file__appending(tmp_path: Path) -> None:
+    f = NpyFile(tmp_path / "test.npy")
+    with f.appending() as appender:
+        for i in range(100):
+            appender.append(np.full((i, 2), i, dtype=np.float64))
+
+    expected = np.concatenate([np.full((i, 2), i, dtype=np.float64) for i in range(100)])
+    np.testing.assert_array_equal(expected, f.read(), strict=True)
+    assert f.header().shape == (4950, 2)
+
+
+def test_npy_file__appending__new_directory(tmp_path: Path) -> None:
+    NpyFile(tmp_path / "other" / "test.npy").write(np.arange(1))
+    f = NpyFile(tmp_path / "dir" / "test.npy")
+    with f.appending() as appender:
+        appender.append(np.arange(3))
+    np.testing.assert_array_equal(np.arange(3), f.read())
+    # Creating the file is not mistaken for a directory having been deleted, which would forget
+    # all known directories:
+    assert tmp_path / "other" in typedpath.base._known_dirs
+
+
+def test_npy_file__appending__nothing(tmp_path: Path) -> None:
+    f = NpyFile(tmp_path / "test.npy")
+    with f.appending():
+        pass
+    assert not f.pretty_path().exists()
+
+
 @pytest.mark.parametrize("data", _DATA)
 def test_npz_file(tmp_path: Path, data: AnyNDArray) -> None:
     d = tmp_path / "dir"
@@ -39,3 +196,116 @@ def test_npz_file(tmp_path: Path, data: AnyNDArray) -> None:
     with np.load(p) as npz_file:
         np.testing.assert_array_equal(data, npz_file["array"], strict=True)
     np.testing.assert_array_equal(data, f.read(), strict=True)
+
+
+_ARRAYS: dict[str, AnyNDArray] = {
+    "empty": np.array([], dtype=np.float32),
+    "ints": np.arange(1000, dtype=np.int64),
+    "fortran": np.asfortranarray(np.arange(12, dtype=np.float64).reshape(3, 4)),
+    "bools": np.array([[True, False], [False, True]]),
+}
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_npz_file__arrays(tmp_path: Path, compressed: bool) -> None:
+    f = NpzFile(tmp_path / "test.npz", compressed=compressed)
+    f.write_arrays(_ARRAYS)
+
+    with np.load(f.pretty_path()) as npz_file:
+        assert set(_ARRAYS) == set(npz_file)
+        for name, data in _ARRAYS.items():
+            np.testing.assert_array_equal(data, npz_file[name], strict=True)
+
+    with f.read_arrays() as arrays:
+        assert isinstance(arrays, NpzArrays)
+        assert list(_ARRAYS) == list(arrays)
+        assert len(_ARRAYS) == len(arrays)
+        for name, data in _ARRAYS.items():
+            np.testing.assert_array_equal(data, arrays[name], strict=True)
+        with pytest.raises(KeyError):
+            arrays["missing"]
+
+
+def test_npz_file__compressed(tmp_path: Path) -> None:
+    data = {"zeros": np.zeros(100_000)}
+    compressed = NpzFile(tmp_path / "compressed.npz", compressed=True)
+    compressed.write_arrays(data)
+    stored = NpzFile(tmp_path / "stored.npz", compressed=False)
+    stored.write_arrays(data)
+
+    assert compressed.pretty_path().stat().st_size * 10 < stored.pretty_path().stat().st_size
+
+
+def test_npz_file__write_many(tmp_path: Path) -> None:
+    # Each write runs on the I/O executor, so compressing on it too could deadlock:
+    d = DictDir(tmp_path, str, NpzFile)
+    data = {f"k{i}": np.arange(i) for i in range(16)}
+    try:
+        set_io_workers(2)
+        d.write_many(data)
+    finally:
+        set_io_workers(DEFAULT_IO_WORKERS)
+    for key, array in data.items():
+        np.testing.assert_array_equal(array, d[key].read())
+
+
+@pytest.mark.parametrize("zip64", [False, True])
+def test_npz_file__compressed__zip(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, zip64: bool
+) -> None:
+    if zip64:
+        monkeypatch.setattr(typedpath.numpy, "_ZIP64_LIMIT", 0)
+        monkeypatch.setattr(typedpath.numpy, "_ZIP64_COUNT_LIMIT", 0)
+    f = NpzFile(tmp_path / "test.npz", compressed=True)
+    f.write_arrays({"a": np.arange(10), "ø": np.ones(3)})
+
+    with zipfile.ZipFile(f.pretty_path()) as zip_file:
+        assert zip_file.testzip() is None
+        assert zip_file.namelist() == ["a.npy", "ø.npy"]
+        assert all(info.compress_type == zipfile.ZIP_DEFLATED for info in zip_file.infolist())
+    with np.load(f.pretty_path()) as arrays:
+        np.testing.assert_array_equal(arrays["a"], np.arange(10))
+        np.testing.assert_array_equal(arrays["ø"], np.ones(3))
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_npz_file__mmap(tmp_path: Path, compressed: bool) -> None:
+    f = NpzFile(tmp_path / "test.npz", compressed=compressed, mmap_mode="r")
+    f.write_arrays(_ARRAYS)
+
+    with f.read_arrays() as arrays:
+        for name, data in _ARRAYS.items():
+            array = arrays[name]
+            np.testing.assert_array_equal(data, array)
+            is_mapped = not compressed and data.size > 0
+            assert isinstance(array, np.memmap) == is_mapped
+
+
+def test_npz_file__allow_pickle(tmp_path: Path) -> None:
+    data = np.array([{"a": 1}, None], dtype=object)
+
+    with pytest.raises(ValueError):
+        NpzFile(tmp_path / "test.npz").write(data)
+
+    f = NpzFile(tmp_path / "test.npz", allow_pickle=True)
+    f.write(data)
+    np.testing.assert_array_equal(data, f.read(), strict=True)
+
+
+def test_npz_file__missing(tmp_path: Path) -> None:
+    with pytest.raises(AssertionError):
+        NpzFile(tmp_path / "test.npz").read_arrays()
+
+
+def test_npy_file__async(tmp_path: Path) -> None:
+    data = np.arange(3)
+    f = NpyFile(tmp_path / "test.npy")
+    asyncio.run(f.awrite(data))
+    np.testing.assert_array_equal(data, asyncio.run(f.aread()), strict=True)
+
+
+def test_npz_file__async(tmp_path: Path) -> None:
+    data = np.arange(3)
+    f = NpzFile(tmp_path / "test.npz")
+    asyncio.run(f.awrite(data))
+    np.testing.assert_array_equal(data, asyncio.run(f.aread()), strict=True)
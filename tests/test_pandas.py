@@ -1,9 +1,12 @@
+import asyncio
 from pathlib import Path
 
 import pandas as pd
 import pytest
 
 from typedpath import PandasCsvFile, PandasFeatherFile, PandasParquetFile
+from typedpath.base import is_reserved_name
+from typedpath.pandas import CsvEngine
 
 _DF = pd.DataFrame(
     {
@@ -47,6 +50,64 @@ def test_pandas_csv_file__append(tmp_path: Path) -> None:
     pd.testing.assert_frame_equal(data, f.read())
 
 
+@pytest.mark.parametrize("engine", ["c", "python", "pyarrow"])
+def test_pandas_csv_file__engine(tmp_path: Path, engine: CsvEngine) -> None:
+    f = PandasCsvFile(tmp_path / "test.csv", engine=engine)
+    f.write(_DF)
+    pd.testing.assert_frame_equal(_DF, f.read())
+
+
+@pytest.mark.parametrize("engine", ["c", "pyarrow"])
+@pytest.mark.parametrize("chunksize", [1, 2, 10])
+def test_pandas_csv_file__iter_chunks(tmp_path: Path, engine: CsvEngine, chunksize: int) -> None:
+    f = PandasCsvFile(tmp_path / "test.csv", engine=engine)
+    f.write(_DF)
+
+    chunks = list(f.iter_chunks(chunksize))
+    assert all(len(chunk) <= chunksize for chunk in chunks)
+    pd.testing.assert_frame_equal(_DF, pd.concat(chunks))
+
+
+_TYPED_DF = pd.DataFrame(
+    {
+        "zip_code": ["0123", "4567"],
+        "when": pd.to_datetime(["2020-01-01", "2021-06-01"]),
+        "kind": pd.Categorical(["x", "y"]),
+        "count": [1, 2],
+    }
+)
+
+
+@pytest.mark.parametrize("engine", ["c", "pyarrow"])
+def test_pandas_csv_file__schema(tmp_path: Path, engine: CsvEngine) -> None:
+    f = PandasCsvFile(tmp_path / "test.csv", engine=engine, schema=True)
+    f.write(_TYPED_DF)
+
+    pd.testing.assert_frame_equal(_TYPED_DF, f.read())
+    # Each chunk has its own categories, so they are lost by `concat`:
+    chunks = pd.concat(f.iter_chunks(1)).astype({"kind": "category"})
+    pd.testing.assert_frame_equal(_TYPED_DF, chunks)
+    # The schema is stored next to the file, but is not data:
+    assert [f.pretty_path()] == [p for p in tmp_path.iterdir() if not is_reserved_name(p.name)]
+
+    # Without the schema the types are inferred:
+    inferred = PandasCsvFile(tmp_path / "test.csv", engine=engine).read()
+    assert inferred.zip_code.tolist() == [123, 4567]
+
+
+def test_pandas_csv_file__schema__append(tmp_path: Path) -> None:
+    f = PandasCsvFile(tmp_path / "test.csv", schema=True)
+    f.append(_TYPED_DF)
+    f.append(_TYPED_DF[["count", "kind", "when", "zip_code"]])
+
+    expected = pd.concat([_TYPED_DF, _TYPED_DF], ignore_index=True)
+    expected["kind"] = expected.kind.astype("category")
+    pd.testing.assert_frame_equal(expected, f.read())
+
+    with pytest.raises(AssertionError):
+        f.append(_TYPED_DF[["count", "kind"]])
+
+
 @pytest.mark.parametrize("data", _DATA)
 def test_pandas_feather_file(tmp_path: Path, data: pd.DataFrame) -> None:
     d = tmp_path / "dir"
@@ -61,6 +122,15 @@ def test_pandas_feather_file(tmp_path: Path, data: pd.DataFrame) -> None:
     pd.testing.assert_frame_equal(data, f.read())
 
 
+@pytest.mark.parametrize("memory_map", [False, True])
+def test_pandas_feather_file__columns(tmp_path: Path, memory_map: bool) -> None:
+    f = PandasFeatherFile(tmp_path / "test.feather", memory_map=memory_map)
+    f.write(_DF)
+
+    pd.testing.assert_frame_equal(_DF, f.read())
+    pd.testing.assert_frame_equal(_DF[["b"]], f.read(columns=["b"]))
+
+
 @pytest.mark.parametrize("data", _DATA)
 def test_pandas_parquet_file(tmp_path: Path, data: pd.DataFrame) -> None:
     d = tmp_path / "dir"
@@ -73,3 +143,109 @@ def test_pandas_parquet_file(tmp_path: Path, data: pd.DataFrame) -> None:
     assert d.exists()
     pd.testing.assert_frame_equal(data, pd.read_parquet(p))
     pd.testing.assert_frame_equal(data, f.read())
+
+
+@pytest.mark.parametrize("file_type", [PandasCsvFile, PandasFeatherFile, PandasParquetFile])
+def test_pandas_file__async(
+    tmp_path: Path, file_type: type[PandasCsvFile | PandasFeatherFile | PandasParquetFile]
+) -> None:
+    f = file_type(tmp_path / f"test{file_type.default_suffix}")
+    asyncio.run(f.awrite(_DF))
+    pd.testing.assert_frame_equal(_DF, asyncio.run(f.aread()))
+
+
+def _write_parquet_rows(tmp_path: Path) -> tuple[PandasParquetFile, pd.DataFrame]:
+    data = pd.DataFrame(
+        {
+            "a": range(100),
+            "b": [f"b{i}" for i in range(100)],
+            "c": [float(i) for i in range(100)],
+        }
+    )
+    f = PandasParquetFile(tmp_path / "test.parquet")
+    with f.writing() as path:
+        data.to_parquet(path, row_group_size=10)
+    return f, data
+
+
+def test_pandas_parquet_file__read__columns_filters(tmp_path: Path) -> None:
+    f, data = _write_parquet_rows(tmp_path)
+
+    pd.testing.assert_frame_equal(data[["c", "a"]], f.read(columns=["c", "a"]))
+
+    expected = data[(data.a >= 15) & (data.a < 25)][["b"]].reset_index(drop=True)
+    actual = f.read(columns=["b"], filters=[("a", ">=", 15), ("a", "<", 25)])
+    pd.testing.assert_frame_equal(expected, actual)
+
+
+@pytest.mark.parametrize("batch_size", [1, 7, 1000])
+def test_pandas_parquet_file__iter_batches(tmp_path: Path, batch_size: int) -> None:
+    f, data = _write_parquet_rows(tmp_path)
+
+    batches = list(f.iter_batches(batch_size, columns=["a", "b"]))
+    assert all(len(batch) <= batch_size for batch in batches)
+    pd.testing.assert_frame_equal(data[["a", "b"]], pd.concat(batches, ignore_index=True))
+
+
+def test_pandas_parquet_file__metadata(tmp_path: Path) -> None:
+    f, _ = _write_parquet_rows(tmp_path)
+
+    metadata = f.metadata()
+    assert metadata.num_rows == 100
+    assert metadata.num_row_groups == 10
+    assert metadata.schema.to_arrow_schema().names == ["a", "b", "c"]
+    statistics = metadata.row_group(1).column(0).statistics
+    assert (statistics.min, statistics.max) == (10, 19)
+
+
+def test_pandas_parquet_file__missing(tmp_path: Path) -> None:
+    f = PandasParquetFile(tmp_path / "test.parquet")
+    with pytest.raises(AssertionError):
+        f.metadata()
+    with pytest.raises(AssertionError):
+        next(f.iter_batches())
+
+
+def test_pandas_parquet_file__append(tmp_path: Path) -> None:
+    f = PandasParquetFile(tmp_path / "dir" / "test.parquet")
+    for i in range(len(_DF)):
+        f.append(_DF.iloc[i : i + 1])
+
+    pd.testing.assert_frame_equal(_DF, f.read())
+    pd.testing.assert_frame_equal(_DF, pd.concat(f.iter_batches(), ignore_index=True))
+    assert f.metadata().num_rows == len(_DF)
+    # Only the first append created the file, so the rest are in part files:
+    assert len(list((tmp_path / "dir").iterdir())) == len(_DF)
+
+    f.write(_DF)
+    assert [f.pretty_path()] == list((tmp_path / "dir").iterdir())
+    pd.testing.assert_frame_equal(_DF, f.read())
+
+
+def test_pandas_parquet_file__appending(tmp_path: Path) -> None:
+    f = PandasParquetFile(tmp_path / "test.parquet")
+    f.write(_DF)
+    with f.appending() as appender:
+        appender.append(_DF[["b", "a"]])
+        appender.append(_DF.iloc[:1])
+
+    expected = pd.concat([_DF, _DF, _DF.iloc[:1]], ignore_index=True)
+    pd.testing.assert_frame_equal(expected, f.read())
+    pd.testing.assert_frame_equal(expected[["b"]], f.read(columns=["b"]))
+    assert f.metadata().num_row_groups == 3
+
+
+def test_pandas_parquet_file__append__bad_schema(tmp_path: Path) -> None:
+    f = PandasParquetFile(tmp_path / "test.parquet")
+    f.write(_DF)
+
+    with pytest.raises(AssertionError):
+        f.append(pd.DataFrame({"a": [1]}))
+    with pytest.raises(AssertionError):
+        f.append(pd.DataFrame({"a": ["not an int"], "b": ["foo"]}))
+    pd.testing.assert_frame_equal(_DF, f.read())
+
+    indexed = PandasParquetFile(tmp_path / "indexed.parquet")
+    indexed.write(_DF.set_index("b"))
+    with pytest.raises(AssertionError):
+        indexed.append(_DF.set_index("b"))
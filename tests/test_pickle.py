@@ -1,10 +1,12 @@
 # ruff: noqa: S301
 
+import asyncio
 import pickle
 from collections.abc import Sequence
 from pathlib import Path
 from typing import Any, TypeVar
 
+import numpy as np
 import pytest
 
 from typedpath import PickleFile
@@ -41,3 +43,49 @@ def test_pickle_file(tmp_path: Path, data: T) -> None:
     with open(p, "rb") as fp:
         assert data == pickle.load(fp)
     assert data == f.read()
+
+
+def test_pickle_file__async(tmp_path: Path) -> None:
+    f = PickleFile(tmp_path / "test.pickle", dict)
+    asyncio.run(f.awrite({"foo": [1, 2]}))
+    assert asyncio.run(f.aread()) == {"foo": [1, 2]}
+
+
+@pytest.mark.parametrize("memory_map", [False, True])
+def test_pickle_file__out_of_band(tmp_path: Path, memory_map: bool) -> None:
+    data = {
+        "small": np.arange(10),
+        "large": np.arange(100_000, dtype=np.float32).reshape(1000, 100),
+        "fortran": np.asfortranarray(np.ones((100, 100))),
+        "strided": np.arange(10_000)[::2],
+        "bytes": b"x" * 10_000,
+        "bytearray": bytearray(10_000),
+        "empty": np.array([], dtype=np.int8),
+        "value": [1, "two"],
+    }
+    f = PickleFile(tmp_path / "test.pickle", dict, out_of_band=True, memory_map=memory_map)
+    f.write(data)
+
+    with pytest.raises(pickle.UnpicklingError):
+        pickle.loads(f.pretty_path().read_bytes())
+
+    result = f.read()
+    assert result.keys() == data.keys()
+    for key, value in data.items():
+        if isinstance(value, np.ndarray):
+            np.testing.assert_array_equal(result[key], value)
+            assert result[key].dtype == value.dtype
+        else:
+            assert result[key] == value
+
+    assert result["fortran"].flags.f_contiguous
+    large = result["large"]
+    assert not large.flags.owndata
+    assert large.ctypes.data % 64 == 0
+    large[0, 0] = 42.0
+    assert f.read()["large"][0, 0] == 0.0
+
+
+def test_pickle_file__out_of_band_reads_normal_pickles(tmp_path: Path) -> None:
+    PickleFile(tmp_path / "test.pickle", list).write([1, 2], protocol=0)
+    assert PickleFile(tmp_path / "test.pickle", list, out_of_band=True).read() == [1, 2]
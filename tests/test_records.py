@@ -0,0 +1,125 @@
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from typedpath import RecordLogFile, StructDir
+
+_DATA: list[Any] = [
+    42,
+    "foo",
+    None,
+    {"ints": [1, 2, 3], "nested": {"a": (1, 2)}},
+    b"x" * 10_000,
+]
+
+
+def test_record_log_file(tmp_path: Path) -> None:
+    p = tmp_path / "dir" / "test.records"
+    f = RecordLogFile(p, object)
+
+    f.append(_DATA[0])
+    f.extend(_DATA[1:])
+
+    assert f.read() == _DATA
+    assert list(f.iter()) == _DATA
+    assert f.count() == len(_DATA)
+    for i, data in enumerate(_DATA):
+        assert f.get(i) == data
+        assert f.get(i - len(_DATA)) == data
+    with pytest.raises(IndexError):
+        f.get(len(_DATA))
+    assert sorted(c.name for c in p.parent.iterdir()) == [
+        ".typedpath-index-test.records",
+        "test.records",
+    ]
+
+    f.write(["a", "b"])
+    assert f.read() == ["a", "b"]
+    assert f.get(-1) == "b"
+    assert RecordLogFile(p, object).get(1) == "b"
+
+
+def test_record_log_file__bytes(tmp_path: Path) -> None:
+    f = RecordLogFile(tmp_path / "test.records", bytes)
+    f.extend([b"foo", b"", b"bar"])
+    assert f.read() == [b"foo", b"", b"bar"]
+    assert f.get(2) == b"bar"
+    assert f.pretty_path().read_bytes().endswith(b"bar")
+    with pytest.raises(AssertionError):
+        f.append("foo")  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("cut", [1, 5, 12, 15])
+def test_record_log_file__truncated(tmp_path: Path, cut: int) -> None:
+    p = tmp_path / "test.records"
+    f = RecordLogFile(p, bytes)
+    f.extend([b"foo", b"bar", b"bazquux"])
+    size = p.stat().st_size
+
+    # Simulate a crash while appending:
+    with open(p, "r+b") as fp:
+        fp.truncate(size - cut)
+    for g in [f, RecordLogFile(p, bytes)]:
+        assert g.read() == [b"foo", b"bar"]
+        assert g.count() == 2
+        assert g.get(-1) == b"bar"
+
+    f.append(b"new")
+    assert f.read() == [b"foo", b"bar", b"new"]
+    assert RecordLogFile(p, bytes).get(2) == b"new"
+
+
+def test_record_log_file__corrupt(tmp_path: Path) -> None:
+    p = tmp_path / "test.records"
+    f = RecordLogFile(p, bytes)
+    f.extend([b"foo", b"bar"])
+    data = p.read_bytes()
+    p.write_bytes(data[:-1] + b"X")
+    assert RecordLogFile(p, bytes).read() == [b"foo"]
+    # A corrupt size:
+    p.write_bytes(data[:15] + b"\xff" * 8 + data[23:])
+    assert RecordLogFile(p, bytes).read() == [b"foo"]
+
+
+def test_record_log_file__external_changes(tmp_path: Path) -> None:
+    p = tmp_path / "test.records"
+    f = RecordLogFile(p, int)
+    f.extend([1, 2])
+    assert f.get(-1) == 2
+
+    RecordLogFile(p, int).append(3)
+    assert f.get(-1) == 3
+    f.append(4)
+    assert RecordLogFile(p, int).read() == [1, 2, 3, 4]
+
+    RecordLogFile(p, int).write([5])
+    assert f.count() == 1
+    assert f.get(0) == 5
+
+
+def test_record_log_file__missing(tmp_path: Path) -> None:
+    f = RecordLogFile(tmp_path / "test.records", int)
+    with pytest.raises(AssertionError):
+        f.get(0)
+    with pytest.raises(AssertionError):
+        f.read()
+
+
+def test_record_log_file__struct_dir(tmp_path: Path) -> None:
+    class Checkpoints(StructDir):
+        states: RecordLogFile[dict[str, int]]
+
+    d = Checkpoints(tmp_path)
+    d.states.append({"step": 1})
+    assert d.states.get(0) == {"step": 1}
+    assert (tmp_path / "states.records").exists()
+
+
+def test_record_log_file__async(tmp_path: Path) -> None:
+    f = RecordLogFile(tmp_path / "test.records", int)
+    asyncio.run(f.awrite([1]))
+    asyncio.run(f.aextend([2, 3]))
+    assert asyncio.run(f.aread()) == [1, 2, 3]
+    assert asyncio.run(f.aget(1)) == 2
@@ -1,5 +1,10 @@
+import typing
 from pathlib import Path
+from typing import Annotated, Any
 
+import pytest
+
+import typedpath.struct
 from tests.utils import TestFile, TestGenericDir
 from typedpath import StructDir, withargs
 
@@ -41,3 +46,63 @@ def test_struct_dir__args(tmp_path: Path) -> None:
     assert str is d.b.t
     assert TestFile == d.b.u
     assert d.b.kwargs == {"arg1": 21, "arg2": 22}
+
+
+def test_struct_dir__lazy_members(tmp_path: Path) -> None:
+    class TestDir(StructDir):
+        a: TestFile
+        b: TestGenericDir[int, float]
+
+    d = TestDir(tmp_path)
+    assert "a" not in vars(d)
+    assert "b" not in vars(d)
+
+    a = d.a
+    assert a is d.a
+    assert tmp_path / "a.test" == a.pretty_path()
+    assert "a" in vars(d)
+    assert "b" not in vars(d)
+
+
+def test_struct_dir__schema_is_cached(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    class TestDir(StructDir):
+        a: TestFile
+
+    calls = []
+
+    def get_type_hints(*args: Any, **kwargs: Any) -> dict[str, Any]:
+        calls.append(args)
+        return typing.get_type_hints(*args, **kwargs)
+
+    monkeypatch.setattr(typedpath.struct, "get_type_hints", get_type_hints)
+
+    for i in range(3):
+        assert tmp_path / str(i) / "a.test" == TestDir(tmp_path / str(i)).a.pretty_path()
+    assert len(calls) == 1
+
+
+def test_struct_dir__inheritance(tmp_path: Path) -> None:
+    class TestDir1(StructDir):
+        a: TestFile = withargs(arg=1)
+
+    class TestDir2(TestDir1):
+        b: TestFile = withargs(arg=2)
+
+    d1 = TestDir1(tmp_path / "1")
+    assert not hasattr(d1, "b")
+    assert d1.a.kwargs == {"arg": 1}
+
+    d2 = TestDir2(tmp_path / "2")
+    assert tmp_path / "2/a.test" == d2.a.pretty_path()
+    assert d2.a.kwargs == {"arg": 1}
+    assert tmp_path / "2/b.test" == d2.b.pretty_path()
+    assert d2.b.kwargs == {"arg": 2}
+
+
+def test_struct_dir__annotated(tmp_path: Path) -> None:
+    class TestDir(StructDir):
+        a: Annotated[TestFile, "unrelated"] = withargs(arg=1)
+
+    d = TestDir(tmp_path)
+    assert tmp_path / "a.test" == d.a.pretty_path()
+    assert d.a.kwargs == {"arg": 1}
@@ -1,5 +1,8 @@
+import asyncio
 from pathlib import Path
 
+import pytest
+
 from typedpath import TextFile
 
 
@@ -14,3 +17,55 @@ def test_text_file(tmp_path: Path) -> None:
     assert d.exists()
     assert p.read_text() == "foo"
     assert f.read() == "foo"
+
+
+def test_text_file__async(tmp_path: Path) -> None:
+    f = TextFile(tmp_path / "test.txt")
+    assert asyncio.run(f.awrite("foo")) == 3
+    assert asyncio.run(f.aread()) == "foo"
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "latin-1", "utf-16"])
+def test_text_file__lines(tmp_path: Path, encoding: str) -> None:
+    f = TextFile(tmp_path / "test.txt", encoding=encoding)
+    f.append("første\n")
+    f.append("second\r\n\nfourth")
+
+    expected = ["første", "second", "", "fourth"]
+    assert list(f.iter_lines()) == expected
+    assert list(f.iter_lines(buffer_size=1)) == expected
+    for n in range(6):
+        assert f.tail(n) == expected[max(0, len(expected) - n) :]
+
+    f.append("\n")
+    assert list(f.iter_lines()) == expected
+    assert f.tail(1) == ["fourth"]
+
+
+def test_text_file__tail_large(tmp_path: Path) -> None:
+    lines = [f"line {i} {'ø' * (i % 50)}" for i in range(20_000)]
+    f = TextFile(tmp_path / "test.txt")
+    f.write("\n".join(lines) + "\n")
+    assert f.tail(3) == lines[-3:]
+    assert f.tail(5_000) == lines[-5_000:]
+    assert list(f.iter_lines()) == lines
+
+
+def test_text_file__lines_errors(tmp_path: Path) -> None:
+    p = tmp_path / "test.txt"
+    p.write_bytes(b"ok\nbad \xff\n")
+    f = TextFile(p)
+    with pytest.raises(UnicodeDecodeError):
+        f.tail(1)
+    with pytest.raises(UnicodeDecodeError):
+        list(f.iter_lines())
+    assert f.tail(1, errors="replace") == ["bad \ufffd"]
+    assert list(f.iter_lines(errors="replace")) == ["ok", "bad \ufffd"]
+
+
+def test_text_file__append_missing(tmp_path: Path) -> None:
+    f = TextFile(tmp_path / "dir" / "test.txt")
+    assert f.append("foo\n") == 4
+    assert f.read() == "foo\n"
+    assert asyncio.run(f.aappend("bar\n")) == 4
+    assert f.tail(10) == ["foo", "bar"]
@@ -0,0 +1,186 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from typedpath import (
+    DictDir,
+    JSONFile,
+    JSONLinesFile,
+    RecordLogFile,
+    TextFile,
+    WriteBackStats,
+    atomic_writes,
+    durability,
+    flush_writes,
+    get_write_back_stats,
+    read_cache,
+    set_write_back,
+    write_back,
+)
+
+
+def test_write_back(tmp_path: Path) -> None:
+    p = tmp_path / "dir" / "test.json"
+    f = JSONFile(p)
+    with write_back(delay=60):
+        for i in range(3):
+            f.write({"i": i})
+        assert not p.exists()
+        stats = get_write_back_stats()
+
+        assert f.read() == {"i": 2}
+        assert stats == WriteBackStats(
+            writes=3,
+            coalesced=2,
+            flushed=0,
+            pending=1,
+            dirty_bytes=p.stat().st_size,
+            max_dirty_bytes=64 * 2**20,
+        )
+        stats = get_write_back_stats()
+        assert (stats.flushed, stats.pending, stats.dirty_bytes) == (1, 0, 0)
+
+        f.write({"i": 3})
+    assert JSONFile(p).read() == {"i": 3}
+    assert get_write_back_stats() == WriteBackStats(0, 0, 0, 0, 0, 0)
+
+
+def test_write_back__background(tmp_path: Path) -> None:
+    p = tmp_path / "test.txt"
+    with write_back(delay=0.01):
+        TextFile(p).write("foo")
+        # Wait for the write to finish, not just start - a file that exists may still be empty:
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            stats = get_write_back_stats()
+            if stats.pending == 0 and stats.flushed >= 1:
+                break
+            time.sleep(0.01)
+        assert p.read_text() == "foo"
+
+
+def test_write_back__text_options(tmp_path: Path) -> None:
+    p = tmp_path / "test.txt"
+    with write_back(delay=60):
+        TextFile(p, encoding="utf-16").write("a\nb\n", newline="\r\n")
+    assert p.read_bytes() == "a\r\nb\r\n".encode("utf-16")
+
+
+def test_write_back__max_dirty_bytes(tmp_path: Path) -> None:
+    files = [TextFile(tmp_path / f"{i}.txt") for i in range(10)]
+    with write_back(max_dirty_bytes=100, delay=60):
+        for f in files:
+            f.write("x" * 30)
+            assert get_write_back_stats().dirty_bytes <= 100
+        assert len(list(tmp_path.iterdir())) >= 6
+
+        # Too large to buffer, so written directly:
+        files[9].write("y" * 200)
+        assert (tmp_path / "9.txt").read_text() == "y" * 200
+    assert all(f.read() == "x" * 30 for f in files[:9])
+
+
+def test_write_back__error(tmp_path: Path) -> None:
+    p = tmp_path / "test.txt"
+    f = TextFile(p)
+    f.write("old")
+
+    def write_and_fail() -> None:
+        with f.open_write("wt") as fp:
+            fp.write("new")
+            raise ValueError("Test error")
+
+    with write_back(delay=60):
+        with pytest.raises(ValueError):
+            write_and_fail()
+        assert f.read() == "old"
+
+    (tmp_path / "file").touch()
+    with pytest.raises(FileExistsError), write_back(delay=0):  # noqa: PT012
+        TextFile(tmp_path / "file" / "test.txt").write("foo")
+        time.sleep(0.1)
+
+
+def test_write_back__appends(tmp_path: Path) -> None:
+    text = TextFile(tmp_path / "test.txt")
+    lines = JSONLinesFile(tmp_path / "test.jsonl", index=True)
+    records = RecordLogFile(tmp_path / "test.records", bytes)
+    with write_back(delay=60):
+        text.write("a\n")
+        text.append("b\n")
+        lines.write([1, 2])
+        lines.extend([3])
+        records.write([b"a"])
+        records.append(b"b")
+        assert records.get(1) == b"b"
+        assert lines.record(2) == 3
+    assert text.read() == "a\nb\n"
+    assert lines.read() == [1, 2, 3]
+    assert records.read() == [b"a", b"b"]
+
+
+@pytest.mark.parametrize("snapshot", [False, True])
+def test_write_back__dict_dir(tmp_path: Path, snapshot: bool) -> None:
+    d = DictDir(tmp_path, str, TextFile, snapshot=snapshot)
+    d["a"].write("a")
+    with write_back(delay=60):
+        d["b"].write("b")
+        assert "b" in d
+        assert len(d) == 2
+        assert set(d) == {"a", "b"}
+        d["c"].write("c")
+        assert {k: v.read() for k, v in d.items()} == {"a": "a", "b": "b", "c": "c"}
+        d["d"].write("d")
+        assert d.read_many(["d"]) == {"d": "d"}
+
+
+def test_write_back__durability(tmp_path: Path) -> None:
+    p = tmp_path / "test.txt"
+    with write_back(delay=60):
+        with durability():
+            TextFile(p).write("foo")
+        assert p.read_text() == "foo"
+
+
+def test_write_back__read_cache(tmp_path: Path) -> None:
+    f = TextFile(tmp_path / "test.txt")
+    with read_cache(), write_back(delay=60):
+        f.write("foo")
+        assert f.read() == "foo"
+        f.write("bar")
+        assert f.read() == "bar"
+
+
+def test_write_back__threads(tmp_path: Path) -> None:
+    files = [JSONFile(tmp_path / f"{i}.json") for i in range(20)]
+
+    def write(i: int) -> None:
+        f = files[i % 20]
+        f.write(i)
+        value = f.read()
+        assert isinstance(value, int)
+        assert value % 20 == i % 20
+
+    with (
+        atomic_writes(),
+        write_back(max_dirty_bytes=50, delay=0.001),
+        ThreadPoolExecutor(8) as executor,
+    ):
+        list(executor.map(write, range(2_000)))
+        flush_writes()
+    assert [f.read() % 20 for f in files] == list(range(20))  # type: ignore[operator]
+
+
+def test_set_write_back(tmp_path: Path) -> None:
+    p = tmp_path / "test.txt"
+    try:
+        set_write_back(delay=60)
+        TextFile(p).write("foo")
+        assert not p.exists()
+        flush_writes(tmp_path)
+        assert p.read_text() == "foo"
+    finally:
+        set_write_back(None)
+    assert get_write_back_stats().max_dirty_bytes == 0
@@ -14,7 +14,8 @@ class TestFile(TypedFile):
         self.kwargs = kwargs
 
     def write(self, data: str) -> int:
-        return self.write_path().write_text(data, encoding="utf-8")
+        with self.open_write("wt", encoding="utf-8") as fp:
+            return fp.write(data)
 
     def read(self) -> str:
         return self.read_path().read_text(encoding="utf-8")
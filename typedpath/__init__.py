@@ -34,10 +34,33 @@ Creates::
 """
 
 from typedpath.args import NO_ARGS, Args, withargs
+from typedpath.arrow import ArrowIpcFile
 from typedpath.base import PathLikeLike, TypedDir, TypedFile, TypedPath
+from typedpath.blobs import BlobStore
 from typedpath.bytes import BytesFile
+from typedpath.cache import (
+    ReadCacheStats,
+    cached_read,
+    get_read_cache_stats,
+    read_cache,
+    set_read_cache,
+)
+from typedpath.compression import Compressed, Compression, CompressionFormat, compressed
 from typedpath.dict import DictDir
-from typedpath.json import JSON, JSONFile, MutableJSON
+from typedpath.durability import atomic_writes, durability, set_atomic_writes
+from typedpath.executor import get_io_executor, set_io_executor, set_io_workers
+from typedpath.json import (
+    JSON,
+    JSONBackend,
+    JSONFile,
+    JSONLinesFile,
+    MsgspecJSONBackend,
+    MutableJSON,
+    OrjsonJSONBackend,
+    StdlibJSONBackend,
+    get_json_backend,
+    set_json_backend,
+)
 from typedpath.keycodec import (
     BoolKeyCodec,
     KeyCodec,
@@ -45,11 +68,32 @@ from typedpath.keycodec import (
     add_key_codec,
     get_key_codec,
 )
-from typedpath.numpy import AnyNDArray, NpyFile, NpzFile
-from typedpath.pandas import PandasCsvFile, PandasFeatherFile, PandasParquetFile
+from typedpath.numpy import (
+    AnyNDArray,
+    MMapMode,
+    NpyAppender,
+    NpyFile,
+    NpyHeader,
+    NpzArrays,
+    NpzFile,
+)
+from typedpath.pandas import (
+    PandasCsvFile,
+    PandasFeatherFile,
+    PandasParquetFile,
+    ParquetAppender,
+)
 from typedpath.pickle import PickleFile
+from typedpath.records import RecordLogFile
 from typedpath.struct import StructDir
 from typedpath.text import TextFile
+from typedpath.writeback import (
+    WriteBackStats,
+    flush_writes,
+    get_write_back_stats,
+    set_write_back,
+    write_back,
+)
 
 __version__ = "0.1.0"
 
@@ -58,27 +102,62 @@ __all__ = [
     "NO_ARGS",
     "AnyNDArray",
     "Args",
+    "ArrowIpcFile",
+    "BlobStore",
     "BoolKeyCodec",
     "BytesFile",
+    "Compressed",
+    "Compression",
+    "CompressionFormat",
     "DictDir",
+    "JSONBackend",
     "JSONFile",
+    "JSONLinesFile",
     "KeyCodec",
+    "MMapMode",
+    "MsgspecJSONBackend",
     "MutableJSON",
+    "NpyAppender",
     "NpyFile",
+    "NpyHeader",
+    "NpzArrays",
     "NpzFile",
+    "OrjsonJSONBackend",
     "PandasCsvFile",
     "PandasFeatherFile",
     "PandasParquetFile",
+    "ParquetAppender",
     "PathLikeLike",
     "PickleFile",
+    "ReadCacheStats",
+    "RecordLogFile",
+    "StdlibJSONBackend",
     "StrKeyCodec",
     "StructDir",
     "TextFile",
     "TypedDir",
     "TypedFile",
     "TypedPath",
+    "WriteBackStats",
     "__version__",
     "add_key_codec",
+    "atomic_writes",
+    "cached_read",
+    "compressed",
+    "durability",
+    "flush_writes",
+    "get_io_executor",
+    "get_json_backend",
     "get_key_codec",
+    "get_read_cache_stats",
+    "get_write_back_stats",
+    "read_cache",
+    "set_atomic_writes",
+    "set_io_executor",
+    "set_io_workers",
+    "set_json_backend",
+    "set_read_cache",
+    "set_write_back",
     "withargs",
+    "write_back",
 ]
@@ -0,0 +1,81 @@
+from collections.abc import Hashable, Sequence
+from typing import Literal, TypeAlias
+
+from typedpath.base import PathLikeLike, TypedFile
+from typedpath.cache import cached_read
+
+try:
+    import pyarrow as pa
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    from unittest.mock import MagicMock
+
+    pa = MagicMock()
+
+    PYARROW_AVAILABLE = False
+
+
+ArrowIpcCompression: TypeAlias = Literal["lz4", "zstd", None]
+
+
+class ArrowIpcFile(TypedFile):
+    """
+    A file containing an Apache Arrow table, in the Arrow IPC file format.
+
+    Tables are read, and written, without any conversion. By default the file is memory-mapped
+    when reading, so reading is nearly free, and data is only loaded from disk when it is used.
+    """
+
+    default_suffix = ".arrow"
+
+    def __init__(
+        self,
+        path: PathLikeLike,
+        *,
+        memory_map: bool = True,
+        compression: ArrowIpcCompression = None,
+    ) -> None:
+        """
+        :param path: Path this object refers to on disk.
+        :param memory_map: Whether to memory-map the file when reading, instead of reading it into
+            memory. Do not overwrite a file while it is memory-mapped, unless `atomic_writes` are
+            enabled.
+        :param compression: Compression to use when writing. Compressed data must be decompressed
+            into memory when read, so cannot be memory-mapped.
+        """
+        super().__init__(path)
+        assert PYARROW_AVAILABLE, (
+            "PyArrow does not appear to be installed on this system. Try: pip install pyarrow"
+        )
+
+        self._memory_map = memory_map
+        self._compression = compression
+
+    def write(self, data: "pa.Table") -> None:
+        options = pa.ipc.IpcWriteOptions(compression=self._compression)
+        with (
+            self.open_write("wb") as fp,
+            pa.ipc.new_file(fp, data.schema, options=options) as writer,
+        ):
+            writer.write_table(data)
+
+    def _read_cache_options(self) -> Hashable:
+        return self._memory_map
+
+    def _share_cached_value(self, value: "pa.Table") -> "pa.Table":
+        # Arrow tables are immutable:
+        return value
+
+    @cached_read
+    def read(self, *, columns: Sequence[str] | None = None) -> "pa.Table":
+        """
+        :param columns: If set, only read these columns.
+        """
+        with self.reading() as path:
+            source = pa.memory_map(str(path)) if self._memory_map else pa.OSFile(str(path))
+        with source, pa.ipc.open_file(source) as reader:
+            table = reader.read_all()
+        if columns is not None:
+            table = table.select(list(columns))
+        return table
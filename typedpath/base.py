@@ -1,10 +1,174 @@
+import copy
+import io
+import secrets
+import shutil
+import tempfile
 from abc import ABC
+from collections.abc import Callable, Hashable, Iterator, Mapping
+from contextlib import AbstractContextManager, contextmanager
+from functools import partial
 from os import PathLike
 from pathlib import Path
-from typing import TypeAlias
+from threading import Lock
+from typing import IO, Any, ParamSpec, Protocol, TypeAlias, TypeVar
+
+from typedpath.cache import invalidate_read_cache
+from typedpath.durability import durable_replace, is_atomic, track_write
+from typedpath.executor import run_io
+from typedpath.writeback import buffer_write, is_write_back, settle
 
 PathLikeLike: TypeAlias = PathLike[str] | str
 
+P = ParamSpec("P")
+T = TypeVar("T")
+T_co = TypeVar("T_co", covariant=True)
+
+RESERVED_PREFIX = ".typedpath-"
+"""
+Files with names starting with this prefix are used internally by `typedpath`, and are not
+considered part of the data, when listing directories.
+"""
+
+
+def is_reserved_name(name: str) -> bool:
+    """Whether `name` is the name of a file used internally by `typedpath`."""
+    return name.startswith(RESERVED_PREFIX)
+
+
+_COPY_BUFFER_SIZE = 2**20
+
+_MAX_KNOWN_DIRS = 65536
+_known_dirs: set[Path] = set()
+"""Directories we know exist, so we do not need to create them."""
+_known_dirs_lock = Lock()
+
+
+def _make_parents(path: Path) -> None:
+    """
+    Creates the parent directories of `path`, unless they are already known to exist.
+    """
+    parent = path.parent
+    # Reading the set without the lock is safe - at worst we call `mkdir` unnecessarily.
+    if parent in _known_dirs:
+        return
+    parent.mkdir(parents=True, exist_ok=True)
+    with _known_dirs_lock:
+        if len(_known_dirs) >= _MAX_KNOWN_DIRS:
+            _known_dirs.clear()
+        _known_dirs.add(parent)
+
+
+def _open_making_parents(path: Path, mode: str, kwargs: Mapping[str, Any]) -> IO[Any]:
+    """
+    Opens `path` for writing, creating parent directories as necessary.
+    """
+    _make_parents(path)
+    try:
+        return open(path, mode, **kwargs)
+    except FileNotFoundError:
+        # A directory we thought existed has been deleted:
+        with _known_dirs_lock:
+            _known_dirs.clear()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return open(path, mode, **kwargs)
+
+
+def _tmp_sibling(path: Path) -> Path:
+    """Returns a temporary path in the same directory as `path`."""
+    return path.with_name(f"{RESERVED_PREFIX}{secrets.token_hex(8)}-{path.name}")
+
+
+def _binary_mode(mode: str) -> str:
+    """Returns the binary version of the `open` mode `mode`."""
+    return mode.replace("t", "") if "b" in mode else f"{mode.replace('t', '')}b"
+
+
+@contextmanager
+def _replacing(path: Path, atomic: bool) -> Iterator[Path]:
+    """
+    Returns the path to write `path` to.
+
+    If `atomic` this is a temporary path, which is renamed to `path` if writing succeeds.
+    """
+    if not atomic:
+        yield path
+        return
+
+    tmp_path = _tmp_sibling(path)
+    try:
+        yield tmp_path
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    durable_replace(tmp_path, path)
+
+
+def _write_bytes(path: Path, atomic: bool, data: bytes) -> None:
+    """
+    Writes a file that was buffered by write-back.
+    """
+    with _replacing(path, atomic) as write_path, _open_making_parents(write_path, "wb", {}) as fp:
+        fp.write(data)
+    track_write(path)
+
+
+class _Reader(Protocol[P, T_co]):
+    def read(self, *args: P.args, **kwargs: P.kwargs) -> T_co: ...
+
+
+class _Writer(Protocol[P, T_co]):
+    def write(self, *args: P.args, **kwargs: P.kwargs) -> T_co: ...
+
+
+class ContentStore(Protocol):
+    """
+    Stores the contents of files, on behalf of the files, for example to deduplicate them. See
+    `BlobStore`.
+    """
+
+    def write(self, path: Path, data: bytes) -> None:
+        """Sets the contents of the file at `path`."""
+
+    def adopt(self, path: Path) -> None:
+        """Takes over the contents of the file at `path`, which has just been written."""
+
+    def unshare(self, path: Path, keep_data: bool) -> None:
+        """Prepares the file at `path` for being modified in place."""
+
+
+class ContentCodec(Protocol):
+    """
+    Encodes the contents of files, as they are written, and decodes them, as they are read, for
+    example to compress them. See `Compression`.
+    """
+
+    @property
+    def suffix(self) -> str:
+        """The suffix of encoded files, such as `".gz"`."""
+
+    def open(
+        self, fp: IO[bytes], mode: str, kwargs: Mapping[str, Any]
+    ) -> AbstractContextManager[IO[Any]]:
+        """
+        Wraps `fp`, the encoded file, in a file that reads, or writes, the decoded contents.
+
+        :param mode: The mode `fp` would have been opened in, if the file was not encoded.
+        :param kwargs: Key-word arguments that would have been passed to `open`.
+        """
+
+
+@contextmanager
+def _decoded_tmp_path(path: Path, codec: ContentCodec) -> Iterator[Path]:
+    """
+    Returns a temporary path, for the decoded contents of `path`, which is deleted on exit.
+
+    The path is in the system's temporary directory, rather than next to `path`, so the decoded
+    contents are not written to the, possibly read-only, or remote, directory of `path`. The suffix
+    of `codec` is removed, so libraries do not try to decode the file again.
+    """
+    with tempfile.TemporaryDirectory(prefix=RESERVED_PREFIX) as tmp_dir:
+        yield Path(tmp_dir) / path.name.removesuffix(codec.suffix)
+
 
 class TypedPath(ABC):
     """
@@ -37,36 +201,280 @@ class TypedFile(TypedPath):
     """
     Base class for `TypedPath`s representing a file.
 
-    To read the represented file you should access `.read_path()`.
-    To write to the represented file you should access `.write_path()`.
+    To read the represented file you should use `.open_read()` or `.reading()`, or access
+    `.read_path()`.
+    To write to the represented file you should use `.open_write()` or `.writing()`, or access
+    `.write_path()`.
     For any other purposes, use `.pretty_path()`.
     """
 
+    _on_written: Callable[["TypedFile"], None] | None = None
+    """Callback to call after this file has been written."""
+
+    _store: ContentStore | None = None
+    """Where the contents of this file are stored, if not simply in the file."""
+
+    _codec: ContentCodec | None = None
+    """How the contents of this file are encoded, if they are. See `Compressed`."""
+
     def read_path(self) -> Path:
         """
         Returns the path of this file, for reading.
 
-        It is an error if the file does not exist.
+        It is an error if the file does not exist, or if the file is compressed.
         """
+        settle(self._path)
+        assert self._codec is None, (
+            f"Cannot read {self._path} directly, as it is compressed. Use .reading() instead."
+        )
         assert self._path.is_file()
         return self._path
 
+    @contextmanager
+    def _reading_encoded(self) -> Iterator[Path]:
+        """
+        Like `.reading()`, but returns the path of the file, even if it is encoded.
+        """
+        settle(self._path)
+        try:
+            yield self._path
+        except (FileNotFoundError, IsADirectoryError) as e:
+            raise AssertionError(f"Cannot read {self._path}: {e}") from e
+
+    @contextmanager
+    def reading(self) -> Iterator[Path]:
+        """
+        Context manager returning the path to read this file from.
+
+        Unlike `.read_path()` this does not check that the file exists up front. Instead, a
+        `FileNotFoundError` or `IsADirectoryError` raised while reading is turned into the same
+        error `.read_path()` would raise. Prefer this over `.read_path()`, and prefer
+        `.open_read()` over this, where possible.
+
+        If this file is compressed, the returned path is of a temporary, decompressed, copy of it,
+        in the system's temporary directory.
+        """
+        codec = self._codec
+        with self._reading_encoded() as path:
+            if codec is None:
+                yield path
+                return
+            with _decoded_tmp_path(path, codec) as tmp_path:
+                with (
+                    open(path, "rb") as encoded,
+                    codec.open(encoded, "rb", {}) as src,
+                    open(tmp_path, "wb") as dst,
+                ):
+                    shutil.copyfileobj(src, dst, _COPY_BUFFER_SIZE)
+                yield tmp_path
+
+    @contextmanager
+    def open_read(self, mode: str = "rb", **kwargs: Any) -> Iterator[IO[Any]]:
+        """
+        Opens this file for reading.
+
+        It is an error if the file does not exist.
+
+        If this file is compressed, it is decompressed as it is read. The returned file does not
+        have a `fileno`, and seeking backwards in it is slow.
+
+        :param mode: Mode to pass to `open`.
+        :param kwargs: Key-word arguments to pass to `open`.
+        """
+        codec = self._codec
+        if codec is None:
+            with self.reading() as path, open(path, mode, **kwargs) as fp:
+                yield fp
+            return
+
+        with (
+            self._reading_encoded() as path,
+            open(path, "rb") as encoded,
+            codec.open(encoded, mode, kwargs) as fp,
+        ):
+            yield fp
+
     def write_path(self) -> Path:
         """
         Returns the path of this file, for writing.
 
         This creates any necessary parent directories.
         The file may or may not already exist.
+
+        It is an error if the file is compressed.
         """
+        settle(self._path)
+        assert self._codec is None, (
+            f"Cannot write {self._path} directly, as it is compressed. Use .writing() instead."
+        )
         self._path.parent.mkdir(parents=True, exist_ok=True)
+        if self._store is not None:
+            self._store.unshare(self._path, keep_data=True)
         return self._path
 
+    @contextmanager
+    def writing(self) -> Iterator[Path]:
+        """
+        Context manager returning the path to write this file to.
+
+        Like `.write_path()` this creates any necessary parent directories, but it also notifies
+        anyone observing this file, when writing is done, and supports `atomic_writes`. Prefer
+        this over `.write_path()`, and prefer `.open_write()` over this, where possible.
+
+        If this file is compressed, the returned path is of a temporary file, in the system's
+        temporary directory, which is compressed into this file when writing is done.
+        """
+        codec = self._codec
+        if codec is not None:
+            with _decoded_tmp_path(self._path, codec) as tmp_path:
+                yield tmp_path
+                with open(tmp_path, "rb") as src, self.open_write("wb") as dst:
+                    shutil.copyfileobj(src, dst, _COPY_BUFFER_SIZE)
+            return
+
+        store = self._store
+        if store is None:
+            write_path = self.write_path()
+        else:
+            # Never write a file with a `ContentStore` in place, as its contents may be shared:
+            settle(self._path)
+            _make_parents(self._path)
+            write_path = self._path
+        with _replacing(write_path, is_atomic() or store is not None) as path:
+            yield path
+        if store is not None:
+            store.adopt(self._path)
+        self._written()
+
+    @contextmanager
+    def open_write(self, mode: str = "wb", **kwargs: Any) -> Iterator[IO[Any]]:
+        """
+        Opens this file for writing.
+
+        This creates any necessary parent directories. Directories that have been created before
+        are remembered, so they do not need to be created again.
+
+        If `atomic_writes` are enabled, and `mode` truncates the file, the data is written to a
+        temporary file, which is renamed into place when closed.
+
+        If `write_back` is enabled, or this file has a `ContentStore`, and `mode` truncates the
+        file without reading it, the data is written to an in-memory file, which is written to disk
+        in the background, or stored by the `ContentStore`, when closed.
+
+        If this file is compressed, the data is compressed as it is written, and modes that both
+        read and write, such as `"r+b"`, are not supported.
+
+        :param mode: Mode to pass to `open`.
+        :param kwargs: Key-word arguments to pass to `open`.
+        """
+        store = self._store
+        codec = self._codec
+        if "w" in mode and "+" not in mode and (store is not None or is_write_back()):
+            with self._open_buffered(mode, kwargs) as fp:
+                yield fp
+            return
+
+        settle(self._path)
+        if store is not None:
+            store.unshare(self._path, keep_data="w" not in mode)
+        atomic = "w" in mode and is_atomic()
+        with _replacing(self._path, atomic) as path:
+            if codec is None:
+                with _open_making_parents(path, mode, kwargs) as fp:
+                    yield fp
+            else:
+                with (
+                    _open_making_parents(path, _binary_mode(mode), {}) as encoded,
+                    codec.open(encoded, mode, kwargs) as fp,
+                ):
+                    yield fp
+        self._written()
+
+    @contextmanager
+    def _open_buffered(self, mode: str, kwargs: Mapping[str, Any]) -> Iterator[IO[Any]]:
+        """
+        Opens an in-memory file, which is written to this file, by write-back or the
+        `ContentStore`, when closed.
+        """
+        buffer = io.BytesIO()
+        codec = self._codec
+        if codec is None:
+            fp: IO[Any] = buffer
+            if "b" not in mode:
+                fp = io.TextIOWrapper(
+                    buffer,
+                    encoding=kwargs.get("encoding"),
+                    errors=kwargs.get("errors"),
+                    newline=kwargs.get("newline"),
+                )
+            yield fp
+            fp.flush()
+        else:
+            # Closing the encoding file finishes the encoding, without closing `buffer`:
+            with codec.open(buffer, mode, kwargs) as fp:
+                yield fp
+        store = self._store
+        write = (
+            partial(_write_bytes, self._path, is_atomic())
+            if store is None
+            else partial(store.write, self._path)
+        )
+        buffer_write(self._path, buffer.getvalue(), write)
+        self._written()
+
+    def _written(self) -> None:
+        """
+        Should be called after this file has been modified.
+
+        You do not need to call this if you write through `.open_write()` or `.writing()`.
+        """
+        track_write(self._path)
+        invalidate_read_cache(self._path)
+        if self._on_written is not None:
+            self._on_written(self)
+
     def pretty_path(self) -> Path:
         """
         Returns the path of this file, for printing.
         """
         return self._path
 
+    def _read_cache_options(self) -> Hashable:
+        """
+        Returns the options of this object that affect the values returned by `read`.
+
+        Subclasses decorating `read` with `cached_read` must override this, if they have such
+        options, so that objects with different options do not share cached values.
+        """
+        return ()
+
+    def _is_read_cacheable(self) -> bool:
+        """
+        Whether values returned by `read` may be cached. Subclasses should override this to return
+        `False` if, with their current options, the values cannot be shared cheaply.
+        """
+        return True
+
+    def _share_cached_value(self, value: Any) -> Any:
+        """
+        Returns `value`, a value returned by `read` that is stored in the read cache, in a form that
+        is safe to give to a caller.
+
+        Cached values are shared by all callers, so modifying the value given to one caller must not
+        change the value given to others. The default returns a deep copy. Subclasses should
+        override this, if their values are immutable, or can be made immutable, or can be copied
+        faster.
+        """
+        return copy.deepcopy(value)
+
+    async def aread(self: _Reader[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        """Like `read`, but does not block the event loop. Only for files that have a `read`."""
+        return await run_io(self.read, *args, **kwargs)
+
+    async def awrite(self: _Writer[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        """Like `write`, but does not block the event loop. Only for files that have a `write`."""
+        return await run_io(self.write, *args, **kwargs)
+
 
 class TypedDir(TypedPath):
     """
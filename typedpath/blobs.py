@@ -0,0 +1,219 @@
+import errno
+import hashlib
+import os
+import secrets
+import shutil
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+from typedpath.base import PathLikeLike, _tmp_sibling
+from typedpath.durability import durable_replace, track_write
+
+_HASH_CHUNK_SIZE = 2**20
+_STALE_TMP_SECONDS = 3600
+"""Temporary files older than this are assumed to be left by a crash, and are garbage."""
+
+_hash = hashlib.sha256
+"""
+Hash used to name blobs. SHA-256 is hardware accelerated on most modern CPUs, making it faster than
+BLAKE2, and it is collision resistant, so blobs with the same name can be assumed to be equal.
+"""
+
+
+class BlobStore:
+    """
+    A content-addressed store of file contents, used to deduplicate the values of a `DictDir`.
+
+    Each distinct content is stored once, in a "blob" named by its hash, and files with that
+    content are hard links to the blob. Writing content that is already stored only creates a link,
+    so no data is written.
+
+    Files linked to a blob share their contents, so they must never be modified in place. Writes
+    through `typedpath` take care of this, by replacing the file rather than modifying it, and by
+    copying it before appending to it. Do not modify the files by other means, or by memory mapping
+    them with `mmap_mode="r+"`.
+
+    Blobs are never deleted automatically. Use `collect_garbage` to delete blobs that are no longer
+    linked to by any file.
+
+    If the file system does not support hard links, or the files are on a different file system
+    than the store, files are written normally, without deduplication.
+    """
+
+    def __init__(self, path: PathLikeLike) -> None:
+        """
+        :param path: Directory to store the blobs in. Should be on the same file system as the
+            files using the store, and should not be listed by a `DictDir`, so its name should
+            start with `RESERVED_PREFIX`.
+        """
+        self._path = Path(path)
+
+    def __str__(self) -> str:
+        return str(self._path)
+
+    def pretty_path(self) -> Path:
+        """Returns the path of this store, for printing."""
+        return self._path
+
+    def _blob_path(self, digest: str) -> Path:
+        return self._path / digest[:2] / digest[2:]
+
+    def _tmp_path(self) -> Path:
+        tmp_dir = self._path / "tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        return tmp_dir / secrets.token_hex(8)
+
+    def write(self, path: Path, data: bytes) -> None:
+        """Sets the contents of the file at `path` to `data`, linking it to the blob of `data`."""
+        blob = self._blob_path(_hash(data).hexdigest())
+        path.parent.mkdir(parents=True, exist_ok=True)
+        for _ in range(2):
+            if _link_into_place(blob, path):
+                track_write(path)
+                return
+            if blob.exists():
+                # Hard links are not supported.
+                break
+            self._add_blob(blob, data)
+        # Fall back to writing a copy:
+        tmp_path = _tmp_sibling(path)
+        try:
+            tmp_path.write_bytes(data)
+            durable_replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        track_write(path)
+
+    def adopt(self, path: Path) -> None:
+        """
+        Links the file at `path`, which has just been written, to the blob of its contents.
+
+        If there is no such blob, `path` becomes the blob. Otherwise `path` is replaced by a link to
+        the blob, which frees the space used by the new file.
+        """
+        digest = _hash()
+        with open(path, "rb") as fp:
+            while chunk := fp.read(_HASH_CHUNK_SIZE):
+                digest.update(chunk)
+        blob = self._blob_path(digest.hexdigest())
+        for _ in range(2):
+            if _link_into_place(blob, path):
+                track_write(path)
+                return
+            try:
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                os.link(path, blob)
+            except FileExistsError:
+                # Added by someone else since we looked. Link to their blob instead:
+                continue
+            except OSError as e:
+                if e.errno not in _NO_LINK_ERRNOS:
+                    raise
+            else:
+                track_write(blob)
+            return
+
+    def unshare(self, path: Path, keep_data: bool) -> None:
+        """
+        Makes sure the file at `path` does not share its contents with a blob, before it is
+        modified in place.
+
+        :param keep_data: If `True` the contents are copied. Otherwise the file is just unlinked,
+            because it is about to be truncated.
+        """
+        try:
+            if path.stat().st_nlink <= 1:
+                return
+        except FileNotFoundError:
+            return
+        if not keep_data:
+            path.unlink(missing_ok=True)
+            return
+        tmp_path = _tmp_sibling(path)
+        try:
+            shutil.copyfile(path, tmp_path)
+            durable_replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def collect_garbage(self) -> int:
+        """
+        Deletes blobs that no file links to any more, and temporary files left by crashes.
+
+        It is safe to write files using this store while collecting garbage.
+
+        :return: The number of bytes freed.
+        """
+        freed = 0
+        stale = time.time() - _STALE_TMP_SECONDS
+        for path in self._iter_files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            is_tmp = path.parent.name == "tmp"
+            if (is_tmp and stat.st_mtime < stale) or (not is_tmp and stat.st_nlink <= 1):
+                path.unlink(missing_ok=True)
+                freed += stat.st_size
+        return freed
+
+    def _iter_files(self) -> Iterator[Path]:
+        if not self._path.is_dir():
+            return
+        for directory in self._path.iterdir():
+            if directory.is_dir():
+                yield from directory.iterdir()
+
+    def _add_blob(self, blob: Path, data: bytes) -> None:
+        tmp_path = self._tmp_path()
+        try:
+            tmp_path.write_bytes(data)
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            durable_replace(tmp_path, blob)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        track_write(blob)
+
+
+_NO_LINK_ERRNOS = {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP, errno.EOPNOTSUPP}
+"""Errors meaning a hard link cannot be created, although the file exists."""
+
+
+def _link_into_place(blob: Path, path: Path) -> bool:
+    """
+    Replaces `path` with a hard link to `blob`.
+
+    Returns `False` if `blob` does not exist, or cannot be linked to.
+    """
+    try:
+        blob_stat = blob.stat()
+    except FileNotFoundError:
+        return False
+    try:
+        path_stat = path.stat()
+    except FileNotFoundError:
+        pass
+    else:
+        if (path_stat.st_dev, path_stat.st_ino) == (blob_stat.st_dev, blob_stat.st_ino):
+            # Already linked, so there is nothing to do:
+            return True
+    tmp_path = _tmp_sibling(path)
+    try:
+        os.link(blob, tmp_path)
+    except FileNotFoundError:
+        # Deleted by `collect_garbage`, since we looked:
+        return False
+    except OSError as e:
+        if e.errno in _NO_LINK_ERRNOS:
+            return False
+        raise
+    try:
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return True
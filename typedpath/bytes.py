@@ -1,4 +1,18 @@
+import errno
+import os
+import stat
+from collections.abc import Iterable
+from typing import IO
+
 from typedpath.base import TypedFile
+from typedpath.cache import cached_read
+from typedpath.executor import run_io
+
+_COPY_CHUNK_SIZE = 2**20
+_MAX_KERNEL_COPY = 2**30
+"""Maximum number of bytes to copy in one `copy_file_range`/`sendfile` call."""
+_KERNEL_COPY_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP}
+"""Errors meaning the kernel cannot copy between the given files, so we must do it ourselves."""
 
 
 class BytesFile(TypedFile):
@@ -8,8 +22,155 @@ class BytesFile(TypedFile):
 
     def write(self, data: bytes) -> int:
         """Sets the contents of this file."""
-        return self.write_path().write_bytes(data)
+        with self.open_write("wb") as fp:
+            return fp.write(data)
+
+    def write_chunks(self, chunks: Iterable[bytes | bytearray | memoryview]) -> int:
+        """
+        Sets the contents of this file, to the concatenation of `chunks`.
+
+        `chunks` are consumed lazily, so they do not need to be in memory at the same time.
+
+        :return: The number of bytes written.
+        """
+        size = 0
+        with self.open_write("wb") as fp:
+            for chunk in chunks:
+                size += fp.write(chunk)
+        return size
 
+    def write_from(self, source: IO[bytes]) -> int:
+        """
+        Sets the contents of this file, to the rest of `source`, reading it until it is exhausted.
+
+        If `source` is a regular file the data is copied by the operating system, with
+        `os.copy_file_range` or `os.sendfile`, where available, so it never enters Python.
+        Otherwise, for example for sockets, it is copied in chunks.
+
+        :return: The number of bytes written.
+        """
+        with self.open_write("wb") as fp:
+            size = _kernel_copy(source, fp)
+            if size is None:
+                size = 0
+                buffer = bytearray(_COPY_CHUNK_SIZE)
+                view = memoryview(buffer)
+                while n := source.readinto(view):  # type: ignore[attr-defined]
+                    size += fp.write(view[:n])
+        return size
+
+    @cached_read
     def read(self) -> bytes:
         """Gets the contents of this file."""
-        return self.read_path().read_bytes()
+        with self.open_read("rb") as fp:
+            return fp.read()  # type: ignore[no-any-return]
+
+    def read_range(self, offset: int, length: int) -> bytes:
+        """
+        Gets `length` bytes of this file, starting at `offset`, without reading the rest of the
+        file.
+
+        Fewer bytes are returned if the file ends before `offset + length`.
+        """
+        assert offset >= 0, f"Offset must be non-negative. Found: {offset}"
+        assert length >= 0, f"Length must be non-negative. Found: {length}"
+        if self._codec is not None:
+            # The file must be decompressed from the start, but only the range is kept:
+            with self.open_read("rb") as fp:
+                fp.seek(offset)
+                return fp.read(length)  # type: ignore[no-any-return]
+        with self.reading() as path:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                return _pread(fd, offset, length)
+            finally:
+                os.close(fd)
+
+    def readinto(self, buffer: bytearray | memoryview, offset: int = 0) -> int:
+        """
+        Reads this file into `buffer`, starting at `offset` in the file, until `buffer` is full, or
+        the file ends.
+
+        :param buffer: A writable buffer, such as a `bytearray`, or the `.data` of a NumPy array.
+        :return: The number of bytes read.
+        """
+        assert offset >= 0, f"Offset must be non-negative. Found: {offset}"
+        view = memoryview(buffer).cast("B")
+        size = 0
+        with self.open_read("rb", buffering=0) as fp:
+            if offset:
+                fp.seek(offset)
+            while size < len(view):
+                n = fp.readinto(view[size:])  # type: ignore[attr-defined]
+                if not n:
+                    break
+                size += n
+        return size
+
+    async def awrite_from(self, source: IO[bytes]) -> int:
+        """Like `write_from`, but does not block the event loop."""
+        return await run_io(self.write_from, source)
+
+    async def aread_range(self, offset: int, length: int) -> bytes:
+        """Like `read_range`, but does not block the event loop."""
+        return await run_io(self.read_range, offset, length)
+
+
+def _pread(fd: int, offset: int, length: int) -> bytes:
+    if not hasattr(os, "pread"):
+        os.lseek(fd, offset, os.SEEK_SET)
+        return os.read(fd, length)
+    data = os.pread(fd, length, offset)
+    if len(data) in (0, length):
+        return data
+    # Reads can be short, for example on network file systems:
+    chunks = [data]
+    read = len(data)
+    while read < length and (chunk := os.pread(fd, length - read, offset + read)):
+        chunks.append(chunk)
+        read += len(chunk)
+    return b"".join(chunks)
+
+
+def _kernel_copy(source: IO[bytes], target: IO[bytes]) -> int | None:
+    """
+    Copies the rest of `source` to `target` in the kernel, if both are regular files.
+
+    Returns the number of bytes copied, or `None` if the kernel cannot copy the files, in which case
+    nothing has been copied.
+    """
+    try:
+        source_fd = source.fileno()
+        target_fd = target.fileno()
+    except (AttributeError, OSError):
+        return None
+    source_stat = os.fstat(source_fd)
+    if not stat.S_ISREG(source_stat.st_mode):
+        return None
+
+    start = source.tell()
+    target.flush()
+    copied = 0
+    for name in ("copy_file_range", "sendfile"):
+        copy = getattr(os, name, None)
+        if copy is None:
+            continue
+        try:
+            while copied < source_stat.st_size - start:
+                count = min(source_stat.st_size - start - copied, _MAX_KERNEL_COPY)
+                if name == "copy_file_range":
+                    n = copy(source_fd, target_fd, count, start + copied)
+                else:
+                    n = copy(target_fd, source_fd, start + copied, count)
+                if n == 0:
+                    break
+                copied += n
+        except OSError as e:
+            if copied or e.errno not in _KERNEL_COPY_ERRNOS:
+                raise
+            continue
+        # Let the Python file objects know where the kernel left the file positions:
+        source.seek(start + copied)
+        target.seek(os.lseek(target_fd, 0, os.SEEK_CUR))
+        return copied
+    return None
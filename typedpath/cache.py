@@ -0,0 +1,242 @@
+import functools
+import os
+import sys
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Any, Protocol, TypeVar, cast
+
+from typedpath.writeback import settle
+
+R = TypeVar("R", bound=Callable[..., Any])
+
+DEFAULT_READ_CACHE_BYTES = 256 * 2**20
+"""Default size of the read cache, when enabled."""
+
+
+class CacheableFile(Protocol):
+    def pretty_path(self) -> Path: ...
+
+    def _read_cache_options(self) -> Hashable: ...
+
+    def _is_read_cacheable(self) -> bool: ...
+
+    def _share_cached_value(self, value: Any) -> Any: ...
+
+
+@dataclass(frozen=True)
+class ReadCacheStats:
+    """Statistics about the read cache. See `set_read_cache`."""
+
+    hits: int
+    """Number of reads answered from the cache."""
+    misses: int
+    """Number of reads that had to read the file."""
+    evictions: int
+    """Number of values removed from the cache, to make room for others."""
+    entries: int
+    """Number of values currently in the cache."""
+    size: int
+    """Approximate size, in bytes, of the values currently in the cache."""
+    max_size: int
+    """Maximum size, in bytes, of the values in the cache. `0` if the cache is disabled."""
+
+
+StatKey = tuple[int, int, int]
+
+
+def stat_key(stat: os.stat_result) -> StatKey:
+    """Returns values that change whenever a file is modified."""
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+_Key = tuple[str, type, Hashable, tuple[Any, ...], tuple[tuple[str, Any], ...]]
+
+
+@dataclass(frozen=True)
+class _Entry:
+    stat_key: StatKey
+    value: Any
+    size: int
+
+
+class _ReadCache:
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.lock = Lock()
+        self.entries: OrderedDict[_Key, _Entry] = OrderedDict()
+        self.keys_by_path: dict[str, set[_Key]] = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: _Key, stat_key: StatKey) -> _Entry | None:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry.stat_key == stat_key:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def put(self, key: _Key, entry: _Entry) -> None:
+        if entry.size > self.max_size:
+            return
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            while self.size + entry.size > self.max_size:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+            self.entries[key] = entry
+            self.keys_by_path.setdefault(key[0], set()).add(key)
+            self.size += entry.size
+
+    def invalidate(self, path: str) -> None:
+        with self.lock:
+            for key in self.keys_by_path.get(path, set()).copy():
+                self._remove(key)
+
+    def _remove(self, key: _Key) -> None:
+        entry = self.entries.pop(key)
+        self.size -= entry.size
+        keys = self.keys_by_path[key[0]]
+        keys.discard(key)
+        if not keys:
+            del self.keys_by_path[key[0]]
+
+
+_cache: _ReadCache | None = None
+_suspended: list[_ReadCache] = []
+"""Caches replaced by `read_cache`, which are restored when it exits."""
+
+
+def set_read_cache(max_size: int | None = DEFAULT_READ_CACHE_BYTES) -> None:
+    """
+    Enables, or disables, caching of the values read from files, process-wide.
+
+    When enabled, the value returned by `read` is cached, and returned again by later calls to
+    `read` on any object representing the same file, for as long as the modification time, size
+    and inode of the file are unchanged. Writes through `typedpath` remove the file from the cache.
+    The least recently used values are removed when the cache is full.
+
+    Callers are given copies of the cached values, so modifying a value does not change the values
+    read by others. Values that can be shared safely are not copied: NumPy arrays are made
+    read-only, and immutable values, such as `str`, `bytes` and Arrow tables, are shared as they are.
+
+    :param max_size: Maximum total size, in bytes, of the cached values. The size of NumPy arrays,
+        `bytes` and `str`s is known exactly. For other values the size of the file is used. Set
+        to `None` to disable the cache.
+    """
+    global _cache
+    _cache = None if max_size is None else _ReadCache(max_size)
+
+
+@contextmanager
+def read_cache(max_size: int | None = DEFAULT_READ_CACHE_BYTES) -> Iterator[None]:
+    """
+    Context manager for temporarily enabling, or disabling, the read cache.
+
+    See `set_read_cache`.
+    """
+    global _cache
+    previous = _cache
+    if previous is not None:
+        # Keep invalidating the previous cache, so it is not stale when restored:
+        _suspended.append(previous)
+    set_read_cache(max_size)
+    try:
+        yield
+    finally:
+        _cache = previous
+        if previous is not None:
+            _suspended.remove(previous)
+
+
+def get_read_cache_stats() -> ReadCacheStats:
+    """Gets statistics about the read cache."""
+    cache = _cache
+    if cache is None:
+        return ReadCacheStats(0, 0, 0, 0, 0, 0)
+    with cache.lock:
+        return ReadCacheStats(
+            hits=cache.hits,
+            misses=cache.misses,
+            evictions=cache.evictions,
+            entries=len(cache.entries),
+            size=cache.size,
+            max_size=cache.max_size,
+        )
+
+
+def invalidate_read_cache(path: Path) -> None:
+    """Removes all values read from `path` from the read cache."""
+    cache = _cache
+    if cache is None and not _suspended:
+        return
+    key = str(path.absolute())
+    if cache is not None:
+        cache.invalidate(key)
+    for suspended in tuple(_suspended):
+        suspended.invalidate(key)
+
+
+def _sizeof(value: Any, file_size: int) -> int:
+    if isinstance(value, bytes | bytearray | str):
+        return sys.getsizeof(value)
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    return file_size
+
+
+def cached_read(read: R) -> R:
+    """
+    Decorator for the `read` method of a `TypedFile`, making it use the read cache, when enabled.
+
+    The values read also depend on `_read_cache_options()` of the file, and the arguments to `read`.
+    If any argument is not hashable, or `_is_read_cacheable()` of the file is `False`, the cache is
+    not used. Values are given to callers through
+    `_share_cached_value()` of the file, so callers cannot modify each other's values.
+    """
+
+    @functools.wraps(read)
+    def wrapper(self: CacheableFile, *args: Any, **kwargs: Any) -> Any:
+        cache = _cache
+        if cache is None or not self._is_read_cacheable():
+            return read(self, *args, **kwargs)
+
+        path = self.pretty_path().absolute()
+        settle(path)
+        key = (
+            str(path),
+            type(self),
+            self._read_cache_options(),
+            args,
+            tuple(sorted(kwargs.items())),
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return read(self, *args, **kwargs)
+        try:
+            stat = path.stat()
+        except OSError:
+            return read(self, *args, **kwargs)
+
+        file_key = stat_key(stat)
+        entry = cache.get(key, file_key)
+        if entry is not None:
+            return self._share_cached_value(entry.value)
+        value = read(self, *args, **kwargs)
+        cache.put(key, _Entry(file_key, value, _sizeof(value, stat.st_size)))
+        return self._share_cached_value(value)
+
+    return cast("R", wrapper)
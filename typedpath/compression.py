@@ -0,0 +1,184 @@
+import gzip
+import io
+import lzma
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import IO, Annotated, Any, Literal, TypeAlias, TypeVar, cast
+
+from typedpath.base import TypedFile
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    from unittest.mock import MagicMock
+
+    zstandard = MagicMock()
+
+    ZSTD_AVAILABLE = False
+
+
+def _assert_zstd_available() -> None:
+    assert ZSTD_AVAILABLE, (
+        "zstandard does not appear to be installed on this system. Try: pip install zstandard"
+    )
+
+
+CompressionFormat: TypeAlias = Literal["gzip", "xz", "zstd"]
+
+_SUFFIXES: Mapping[CompressionFormat, str] = {"gzip": ".gz", "xz": ".xz", "zstd": ".zst"}
+_DEFAULT_LEVELS: Mapping[CompressionFormat, int] = {"gzip": 6, "xz": 6, "zstd": 3}
+_MAX_LEVELS: Mapping[CompressionFormat, int] = {"gzip": 9, "xz": 9, "zstd": 22}
+
+
+class _HiddenFileno:
+    """
+    Wraps a file, hiding its file descriptor.
+
+    Streams that compress, or decompress, a file expose the `fileno` of the file. Code that uses
+    the file descriptor directly, for example to memory-map the file, or to copy data with
+    `os.sendfile`, would then bypass the compression, so we hide it.
+    """
+
+    def __init__(self, fp: IO[bytes]) -> None:
+        self._fp = fp
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._fp, name)
+
+    def fileno(self) -> int:
+        raise io.UnsupportedOperation("fileno")
+
+
+@dataclass(frozen=True)
+class Compression:
+    """
+    How to compress the contents of a file. See `Compressed`.
+    """
+
+    format: CompressionFormat = "gzip"
+    """
+    The compression format. `"gzip"` and `"xz"` use the standard library. `"zstd"` requires
+    `zstandard` to be installed.
+    """
+
+    level: int | None = None
+    """
+    The compression level. Higher levels compress better, but more slowly. The levels are 0-9 for
+    `"gzip"` and `"xz"`, and up to 22 for `"zstd"`. If unset, the default level of the format is
+    used.
+    """
+
+    threads: int = 0
+    """
+    Number of threads to compress with, in addition to the calling thread. Only `"zstd"` supports
+    compressing with multiple threads. Use -1 for one thread per CPU.
+    """
+
+    def __post_init__(self) -> None:
+        assert self.format in _SUFFIXES, f"Unknown compression format: {self.format}"
+        if self.format == "zstd":
+            _assert_zstd_available()
+        else:
+            assert self.threads == 0, (
+                f"Only zstd supports compressing with threads. Found: {self.format}"
+            )
+        if self.level is not None:
+            assert self.level <= _MAX_LEVELS[self.format], (
+                f"Level of {self.format} must be at most {_MAX_LEVELS[self.format]}."
+                f" Found: {self.level}"
+            )
+            assert self.format == "zstd" or self.level >= 0, (
+                f"Level of {self.format} must be non-negative. Found: {self.level}"
+            )
+
+    @property
+    def suffix(self) -> str:
+        """The suffix of files compressed with this format, such as `".gz"`."""
+        return _SUFFIXES[self.format]
+
+    @contextmanager
+    def open(self, fp: IO[bytes], mode: str, kwargs: Mapping[str, Any]) -> Iterator[IO[Any]]:
+        """
+        Wraps `fp` in a file that compresses the data written to it, or decompresses the data read
+        from it.
+
+        Appending adds a new compressed stream to the end of the file. All the streams in a file
+        are read, one after the other.
+
+        :param fp: The compressed file, opened in binary mode.
+        :param mode: The mode `fp` would have been opened in, without compression. Modes that both
+            read and write are not supported.
+        :param kwargs: Key-word arguments that would have been passed to `open`. Only `encoding`,
+            `errors` and `newline` are used, in text modes.
+        """
+        assert "+" not in mode, f"Cannot both read and write compressed files. Found: {mode}"
+        hidden = cast("IO[bytes]", _HiddenFileno(fp))
+        binary = self._open_reader(hidden) if "r" in mode else self._open_writer(hidden)
+        stream: IO[Any] = binary
+        if "b" not in mode:
+            stream = io.TextIOWrapper(
+                binary,
+                encoding=kwargs.get("encoding"),
+                errors=kwargs.get("errors"),
+                newline=kwargs.get("newline"),
+            )
+        with stream:
+            yield stream
+
+    def _open_reader(self, fp: IO[bytes]) -> IO[bytes]:
+        if self.format == "gzip":
+            return cast("IO[bytes]", gzip.GzipFile(fileobj=fp, mode="rb"))
+        if self.format == "xz":
+            return cast("IO[bytes]", lzma.LZMAFile(fp, "rb"))
+        reader = zstandard.ZstdDecompressor().stream_reader(
+            fp, read_across_frames=True, closefd=False
+        )
+        # Buffered, so it supports `peek`, like the other formats:
+        return cast("IO[bytes]", io.BufferedReader(reader))
+
+    def _open_writer(self, fp: IO[bytes]) -> IO[bytes]:
+        level = _DEFAULT_LEVELS[self.format] if self.level is None else self.level
+        if self.format == "gzip":
+            # No name or time in the header, so equal contents compress to equal files:
+            return cast(
+                "IO[bytes]",
+                gzip.GzipFile(filename="", fileobj=fp, mode="wb", compresslevel=level, mtime=0),
+            )
+        if self.format == "xz":
+            return cast("IO[bytes]", lzma.LZMAFile(fp, "wb", preset=level))
+        compressor = zstandard.ZstdCompressor(level=level, threads=self.threads)
+        return cast("IO[bytes]", compressor.stream_writer(fp, closefd=False))
+
+
+TF = TypeVar("TF", bound=TypedFile)
+
+Compressed: TypeAlias = Annotated[TF, Compression()]
+"""
+A `TypedFile` whose contents are compressed, for use in `StructDir` annotations, and as the value
+type of `DictDir`::
+
+    class Dataset(tp.StructDir):
+        config: tp.Compressed[tp.JSONFile]
+        log: tp.Compressed[tp.TextFile] = tp.withargs(compression=tp.Compression("zstd", level=9))
+
+    samples = tp.DictDir("samples", str, tp.Compressed[tp.PickleFile[list[float]]])
+
+The suffix of the format is appended to the `default_suffix` of the wrapped type, so `config` above
+is stored in `config.json.gz`. Files are compressed with gzip, unless a different `Compression` is
+passed with `withargs(compression=...)`.
+"""
+
+
+def compressed(file: TF, compression: Compression = Compression()) -> TF:  # noqa: B008
+    """
+    Makes `file` compress its contents, and returns it.
+
+    Use this to compress a file that is not created by a `StructDir` or `DictDir`. Unlike
+    `Compressed`, this does not change the path of `file`, so it should already end with
+    `compression.suffix`.
+    """
+    file._codec = compression
+    return file
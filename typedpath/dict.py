@@ -1,15 +1,41 @@
-from collections.abc import Iterator, Mapping
+import os
+import time
+from collections.abc import AsyncIterator, ItemsView, Iterable, Iterator, Mapping, ValuesView
+from concurrent.futures import Executor, Future
+from contextlib import suppress
+from functools import lru_cache, partial
+from itertools import islice
 from pathlib import Path
-from typing import Generic, TypeVar
+from threading import Lock
+from typing import Any, Generic, TypeVar
 
 from typedpath.args import NO_ARGS, Args
-from typedpath.base import PathLikeLike, TypedDir, TypedPath
-from typedpath.inspect import make
+from typedpath.base import (
+    RESERVED_PREFIX,
+    PathLikeLike,
+    TypedDir,
+    TypedFile,
+    TypedPath,
+    is_reserved_name,
+)
+from typedpath.blobs import BlobStore
+from typedpath.executor import DEFAULT_MAX_IN_FLIGHT, map_bounded, run_io
+from typedpath.inspect import compile_maker
 from typedpath.keycodec import KeyCodec, get_key_codec
+from typedpath.writeback import flush_writes
 
 K = TypeVar("K")
 TP = TypeVar("TP", bound=TypedPath)
 
+_ASYNC_BATCH_SIZE = 1024
+"""Number of keys to list at a time, when iterating asynchronously."""
+
+_RACY_NS = 2_000_000_000
+"""
+Snapshots taken less than this long after the directory was modified are checked again once this
+long has passed, as the directory may be modified again without its timestamp changing.
+"""
+
 
 class DictDir(TypedDir, Mapping[K, TP], Generic[K, TP]):
     """
@@ -26,6 +52,21 @@ class DictDir(TypedDir, Mapping[K, TP], Generic[K, TP]):
     to an object again using `X(s)`. You can override this behaviour by implementing the `KeyCodec`
     interface, and either passing an instance when creating the `DictDir`, or registering your codec
     with `add_key_codec`.
+
+    For very large directories you can set `snapshot=True`, to keep the set of keys in memory. The
+    snapshot is validated against the modification time of the directory, and is kept up to date by
+    writes to files through this `DictDir`::
+
+        people = tp.DictDir("people", str, tp.JSONFile, snapshot=True)
+
+    If many values are identical you can set `blobs=True`, to store each distinct value only once,
+    in a `BlobStore` in the directory. Writing a value that is already stored does not write any
+    data::
+
+        thumbnails = tp.DictDir("thumbnails", str, tp.BytesFile, blobs=True)
+
+    Values for recently used keys are cached, so `people["alice"]` may return the same object
+    several times.
     """
 
     default_suffix = ""
@@ -39,6 +80,9 @@ class DictDir(TypedDir, Mapping[K, TP], Generic[K, TP]):
         key_codec: KeyCodec[K] | None = None,
         allow_subdirs: bool = False,
         value_args: Args = NO_ARGS,
+        snapshot: bool = False,
+        cache_size: int = 128,
+        blobs: BlobStore | bool = False,
     ) -> None:
         """
         :param path: Path this object refers to on disk.
@@ -53,46 +97,345 @@ class DictDir(TypedDir, Mapping[K, TP], Generic[K, TP]):
             search the disk for values that have already been created, severely limiting the
             functionality of the instance.
         :param value_args: Arguments to use when creating instances of the `value_type`.
+        :param snapshot: Whether to keep a snapshot of the keys in memory, and use it to answer
+            `len`, `in` and iteration, instead of listing the directory. Not compatible with
+            `allow_subdirs=True`.
+        :param cache_size: Number of recently used values to cache. Set to `0` to disable caching.
+        :param blobs: Whether to deduplicate the values, by storing their contents in a `BlobStore`.
+            If `True` the store is in the directory itself. Pass a `BlobStore` to share it with
+            other `DictDir`s. The values must be files.
         """
         super().__init__(path)
+        assert not (snapshot and allow_subdirs), "snapshot is not compatible with allow_subdirs."
 
         self._key_type = key_type
         self._value_type = value_type
         self._codec = key_codec or get_key_codec(self._key_type)
+        self._bijective = self._codec.is_bijective(self._key_type)
         self._allow_subdirs = allow_subdirs
         self._value_args = value_args
+        self._maker = compile_maker(value_type, value_args)
+        self._get_value = (
+            lru_cache(maxsize=cache_size, typed=True)(self._make_value)
+            if cache_size > 0
+            else self._make_value
+        )
+        self._snapshot = snapshot
+        self._snapshot_lock = Lock()
+        self._snapshot_keys: set[K] | None = None
+        self._snapshot_mtime_ns = 0
+        self._snapshot_racy = False
+        """
+        Whether the directory could have been modified, after the snapshot, without changing its
+        modification time. If so, the directory is scanned once more, when that can no longer
+        happen.
+        """
+        if blobs is True:
+            blobs = BlobStore(self._path / f"{RESERVED_PREFIX}blobs")
+        self._blobs = blobs or None
 
     def _key_to_path(self, key: K) -> Path:
         key_str = self._codec.encode(key)
-        key_ = self._codec.decode(key_str, self._key_type)
-        assert key_ == key, f"DictDir key did not handle round-trip: decodec(encode({key}))={key_}."
+        # Subclasses of the key type, such as `bool` for `int`, may not round-trip:
+        if not (self._bijective and type(key) is self._key_type):
+            key_ = self._codec.decode(key_str, self._key_type)
+            assert key_ == key, (
+                f"DictDir key did not handle round-trip: decodec(encode({key}))={key_}."
+            )
         assert key_str, "DictDir keys cannot be empty."
         if not self._allow_subdirs:
             assert "/" not in key_str, f"DictDir keys cannot contain '/'. Key: {key_str}"
-        key_name = f"{key_str}{self._value_type.default_suffix}"
+        key_name = f"{key_str}{self._maker.default_suffix}"
         return self._path / key_name
 
-    def _path_to_key(self, path: Path) -> K:
-        key_name = path.name
-        expected_suffix = self._value_type.default_suffix
-        assert key_name.endswith(expected_suffix), f"{path} did not have suffix {expected_suffix}."
+    def _name_to_key(self, key_name: str) -> K:
+        expected_suffix = self._maker.default_suffix
+        assert key_name.endswith(expected_suffix), (
+            f"{self._path / key_name} did not have suffix {expected_suffix}."
+        )
         key_str = key_name.removesuffix(expected_suffix)
         return self._codec.decode(key_str, self._key_type)
 
+    def _current_snapshot(self) -> set[K]:
+        """
+        Returns the snapshot of keys, after taking a new one, if the directory has changed.
+
+        Callers must hold `_snapshot_lock`.
+        """
+        flush_writes(self._path)
+        try:
+            mtime_ns = self._path.stat().st_mtime_ns
+        except FileNotFoundError:
+            # The directory has not been created yet, so it is empty:
+            self._snapshot_keys = None
+            return set()
+        keys = self._snapshot_keys
+        racy = time.time_ns() - mtime_ns < _RACY_NS
+        if (
+            keys is None
+            or mtime_ns != self._snapshot_mtime_ns
+            or (self._snapshot_racy and not racy)
+        ):
+            with os.scandir(self._path) as entries:
+                keys = {
+                    self._name_to_key(entry.name)
+                    for entry in entries
+                    if not is_reserved_name(entry.name)
+                }
+            self._snapshot_keys = keys
+            self._snapshot_mtime_ns = mtime_ns
+            self._snapshot_racy = racy
+        return keys
+
+    def _value_written(self, key: K, value: TypedFile) -> None:
+        with self._snapshot_lock:
+            keys = self._snapshot_keys
+            if keys is None:
+                return
+            keys.add(key)
+            mtime_ns = self._path.stat().st_mtime_ns
+            if mtime_ns != self._snapshot_mtime_ns:
+                self._snapshot_mtime_ns = mtime_ns
+                # As in `_current_snapshot`, other changes could follow, without changing the
+                # modification time, so check once more later:
+                self._snapshot_racy = time.time_ns() - mtime_ns < _RACY_NS
+
+    def _make_value(self, key: K) -> TP:
+        return self._make_value_at(key, self._key_to_path(key))
+
+    def _make_value_at(self, key: K, path: Path) -> TP:
+        value = self._maker(path)
+        if self._snapshot and isinstance(value, TypedFile):
+            value._on_written = partial(self._value_written, key)
+        if self._blobs is not None:
+            assert isinstance(value, TypedFile), (
+                f"blobs can only be used with file values. Found: {type(value)}"
+            )
+            value._store = self._blobs
+        return value
+
+    def _iter_entries(self, with_size: bool) -> Iterator[tuple[K, TP, int]]:
+        """
+        Iterates over the keys and values of this dictionary, and the sizes of the values on disk.
+
+        :param with_size: Whether to compute sizes. If `False` all sizes are `0`.
+        """
+        assert not self._allow_subdirs, "Iteration is not compatible with allow_subdirs=True."
+        if self._snapshot:
+            for key in self:
+                value = self[key]
+                size = 0
+                if with_size:
+                    with suppress(FileNotFoundError):
+                        size = value._path.stat().st_size
+                yield key, value, size
+            return
+
+        flush_writes(self._path)
+        with os.scandir(self._path) as entries:
+            for entry in entries:
+                if is_reserved_name(entry.name):
+                    continue
+                key = self._name_to_key(entry.name)
+                # Use the path from the directory listing, to avoid encoding the key again:
+                value = self._make_value_at(key, Path(entry.path))
+                size = entry.stat().st_size if with_size and entry.is_file() else 0
+                yield key, value, size
+
+    def collect_garbage(self) -> int:
+        """
+        Deletes values from the `BlobStore` that are no longer used by any key.
+
+        See `BlobStore.collect_garbage`.
+        """
+        assert self._blobs is not None, f"{self._path} does not use blobs."
+        return self._blobs.collect_garbage()
+
+    def items(self) -> ItemsView[K, TP]:
+        return _DictDirItemsView(self)
+
+    def values(self) -> ValuesView[TP]:
+        return _DictDirValuesView(self)
+
+    def read_items(
+        self,
+        *,
+        prefetch: int = 8,
+        max_prefetch_bytes: int | None = 64 * 1024 * 1024,
+        executor: Executor | None = None,
+    ) -> Iterator[tuple[K, Any]]:
+        """
+        Iterates over the keys of this dictionary, and the data read from their values.
+
+        The values are read on a background thread, ahead of the consumer, so that I/O overlaps with
+        whatever the consumer does::
+
+            for name, config in configs.read_items():
+                ...
+
+        :param prefetch: Number of values to read ahead of the consumer.
+        :param max_prefetch_bytes: Maximum total size on disk, of values read ahead of the consumer.
+            A single value is always read, no matter its size. Set to `None` for no limit.
+        :param executor: Executor to read with. Defaults to `get_io_executor()`.
+        """
+        assert prefetch >= 0, prefetch
+
+        def read(entry: tuple[K, TP, int]) -> Any:
+            value: Any = entry[1]
+            return value.read()
+
+        for (key, _, _), future in map_bounded(
+            read,
+            self._iter_entries(max_prefetch_bytes is not None),
+            executor=executor,
+            max_in_flight=prefetch + 1,
+            weight=lambda entry: entry[2],
+            max_weight=max_prefetch_bytes,
+        ):
+            yield key, future.result()
+
     def __getitem__(self, key: K) -> TP:
-        item_path = self._key_to_path(key)
-        return make(self._value_type, item_path, self._value_args)
+        return self._get_value(key)
 
     def __iter__(self) -> Iterator[K]:
         assert not self._allow_subdirs, "__iter__ is not compatible with allow_subdirs=True."
+        if self._snapshot:
+            with self._snapshot_lock:
+                keys = list(self._current_snapshot())
+            yield from keys
+            return
+        flush_writes(self._path)
         for item_path in self._path.iterdir():
-            yield self._path_to_key(item_path)
+            if not is_reserved_name(item_path.name):
+                yield self._name_to_key(item_path.name)
 
     def __contains__(self, key: object) -> bool:
         if not isinstance(key, self._key_type):
             return False
-        return self._key_to_path(key).exists()
+        if self._snapshot:
+            with self._snapshot_lock:
+                return key in self._current_snapshot()
+        path = self._get_value(key)._path
+        flush_writes(path)
+        return path.exists()
 
     def __len__(self) -> int:
         assert not self._allow_subdirs, "__len__ is not compatible with allow_subdirs=True."
-        return len(list(self._path.iterdir()))
+        if self._snapshot:
+            with self._snapshot_lock:
+                return len(self._current_snapshot())
+        flush_writes(self._path)
+        return sum(1 for item_path in self._path.iterdir() if not is_reserved_name(item_path.name))
+
+    async def __aiter__(self) -> AsyncIterator[K]:
+        """
+        Iterates over the keys of this dictionary, without blocking the event loop.
+        """
+        keys = iter(self)
+        while batch := await run_io(lambda: list(islice(keys, _ASYNC_BATCH_SIZE))):
+            for key in batch:
+                yield key
+
+    async def aitems(self) -> AsyncIterator[tuple[K, TP]]:
+        """
+        Iterates over the keys and values of this dictionary, without blocking the event loop.
+        """
+        async for key in self:
+            yield key, self[key]
+
+    def read_many(
+        self,
+        keys: Iterable[K],
+        *,
+        executor: Executor | None = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        return_exceptions: bool = False,
+    ) -> dict[K, Any]:
+        """
+        Calls `.read()` on the values of many keys, in parallel.
+
+        :param keys: Keys to read values of.
+        :param executor: Executor to read with. Defaults to `get_io_executor()`.
+        :param max_in_flight: Maximum number of reads to have in progress at any time.
+        :param return_exceptions: If `False` the first exception raised while reading, in the order
+            of `keys`, is raised. If `True` exceptions are returned as the value of the key that
+            failed, and all keys are attempted.
+        :return: A dictionary mapping keys to the values read, in the order of `keys`.
+        """
+
+        def read(key: K) -> Any:
+            value: Any = self[key]
+            return value.read()
+
+        return _collect(
+            map_bounded(read, keys, executor=executor, max_in_flight=max_in_flight),
+            return_exceptions,
+        )
+
+    def write_many(
+        self,
+        items: Mapping[K, Any] | Iterable[tuple[K, Any]],
+        *,
+        executor: Executor | None = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        return_exceptions: bool = False,
+    ) -> dict[K, Any]:
+        """
+        Calls `.write(data)` on the values of many keys, in parallel.
+
+        :param items: Keys and the data to write to their values. This may be a lazy iterable, in
+            which case at most `max_in_flight` items are held in memory at any time.
+        :param executor: Executor to write with. Defaults to `get_io_executor()`.
+        :param max_in_flight: Maximum number of writes to have in progress at any time.
+        :param return_exceptions: If `False` the first exception raised while writing, in the order
+            of `items`, is raised. If `True` exceptions are returned as the value of the key that
+            failed, and all keys are attempted.
+        :return: A dictionary mapping keys to the return values of `.write`, in the order of
+            `items`.
+        """
+        if isinstance(items, Mapping):
+            items = items.items()
+
+        def write(item: tuple[K, Any]) -> Any:
+            key, data = item
+            value: Any = self[key]
+            return value.write(data)
+
+        return _collect(
+            (
+                (key, future)
+                for (key, _), future in map_bounded(
+                    write, items, executor=executor, max_in_flight=max_in_flight
+                )
+            ),
+            return_exceptions,
+        )
+
+
+class _DictDirItemsView(ItemsView[K, TP]):
+    _mapping: DictDir[K, TP]
+
+    def __iter__(self) -> Iterator[tuple[K, TP]]:
+        for key, value, _ in self._mapping._iter_entries(False):
+            yield key, value
+
+
+class _DictDirValuesView(ValuesView[TP]):
+    _mapping: DictDir[Any, TP]
+
+    def __iter__(self) -> Iterator[TP]:
+        for _, value, _ in self._mapping._iter_entries(False):
+            yield value
+
+
+def _collect(futures: Iterable[tuple[K, "Future[Any]"]], return_exceptions: bool) -> dict[K, Any]:
+    result: dict[K, Any] = {}
+    for key, future in futures:
+        exception = future.exception()
+        if exception is None:
+            result[key] = future.result()
+        elif return_exceptions:
+            result[key] = exception
+        else:
+            raise exception
+    return result
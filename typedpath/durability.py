@@ -0,0 +1,165 @@
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+
+from typedpath.cache import StatKey, stat_key
+from typedpath.writeback import flush_writes
+
+
+@dataclass
+class _Batch:
+    """The files written inside a `durability` context."""
+
+    paths: set[Path] = field(default_factory=set)
+    """All files written."""
+    synced: dict[Path, StatKey] = field(default_factory=dict)
+    """Files synced before they were renamed into place, and their `stat_key` when synced."""
+
+
+_atomic = False
+_batches: list[_Batch] = []
+_batches_lock = Lock()
+
+_SYNC_WORKERS = 16
+"""
+Number of `fsync`s to issue concurrently. File systems with a journal will typically commit
+concurrent `fsync`s together.
+"""
+
+
+def set_atomic_writes(enabled: bool) -> None:
+    """
+    Sets whether files are written atomically, process-wide.
+
+    When enabled, files are written to a temporary file in the same directory, which is then renamed
+    into place. This means readers will never see a partially written file. Appending to a file is
+    never atomic.
+    """
+    global _atomic
+    _atomic = enabled
+
+
+@contextmanager
+def atomic_writes(enabled: bool = True) -> Iterator[None]:
+    """
+    Context manager for temporarily enabling, or disabling, atomic writes.
+
+    See `set_atomic_writes`.
+    """
+    previous = _atomic
+    set_atomic_writes(enabled)
+    try:
+        yield
+    finally:
+        set_atomic_writes(previous)
+
+
+def is_atomic() -> bool:
+    """Whether files should currently be written atomically."""
+    return _atomic or bool(_batches)
+
+
+@contextmanager
+def durability() -> Iterator[None]:
+    """
+    Context manager that makes sure that all files written inside it are durable, when it exits.
+
+    Files written inside this context manager are written atomically, and each temporary file is
+    flushed to disk with `fsync`, by the writing thread, before it is renamed into place. So every
+    write costs one `fsync`. When the context exits the parent directories of the written files are
+    flushed, together, which makes the renames durable, as are files modified since they were
+    renamed, such as by appends. If the system crashes before the context exits any of the writes
+    may be lost, but no file written atomically will be partially written.
+
+    The context is process-wide: writes made by other threads while it is active are included.
+    """
+    batch = _Batch()
+    with _batches_lock:
+        _batches.append(batch)
+    try:
+        yield
+    finally:
+        try:
+            # Writes buffered by write-back must be on disk before they can be synced:
+            flush_writes()
+        finally:
+            with _batches_lock:
+                _batches.remove(batch)
+        _sync(batch)
+
+
+def durable_replace(src: Path, dst: Path) -> None:
+    """
+    Renames `src` to `dst`, replacing `dst`.
+
+    If a `durability` context is active, `src` is flushed to disk first. Otherwise a crash could make
+    the rename durable before the data, leaving `dst` partially written.
+    """
+    if not _batches:
+        src.replace(dst)
+        return
+    stat = _fsync(src, os.O_RDONLY)
+    src.replace(dst)
+    if stat is None:
+        return
+    with _batches_lock:
+        for batch in _batches:
+            batch.synced[dst] = stat_key(stat)
+
+
+def track_write(path: Path) -> None:
+    """
+    Registers that `path` has been written, so that it is synced by any active `durability`
+    context.
+    """
+    if not _batches:
+        return
+    with _batches_lock:
+        for batch in _batches:
+            batch.paths.add(path)
+
+
+def _fsync(path: Path, flags: int) -> os.stat_result | None:
+    """Syncs `path`, and returns its stat when synced, or `None` if it does not exist."""
+    try:
+        fd = os.open(path, flags)
+    except FileNotFoundError:
+        # Deleted since it was written. Nothing to sync.
+        return None
+    try:
+        os.fsync(fd)
+        return os.fstat(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_all(paths: Iterable[Path], flags: int) -> None:
+    with ThreadPoolExecutor(_SYNC_WORKERS, thread_name_prefix="typedpath-fsync") as executor:
+        for _ in executor.map(lambda p: _fsync(p, flags), paths):
+            pass
+
+
+def _is_synced(path: Path, synced: dict[Path, StatKey]) -> bool:
+    """Whether `path` is unchanged since it was synced, before being renamed into place."""
+    key = synced.get(path)
+    if key is None:
+        return False
+    try:
+        return stat_key(path.stat()) == key
+    except FileNotFoundError:
+        return True
+
+
+def _sync(batch: _Batch) -> None:
+    paths = batch.paths
+    if not paths:
+        return
+    _fsync_all([p for p in paths if not _is_synced(p, batch.synced)], os.O_RDONLY)
+    # Directories must be synced to make the renames durable. This is not supported on Windows.
+    dir_flags = getattr(os, "O_DIRECTORY", None)
+    if dir_flags is not None:
+        _fsync_all({p.parent for p in paths}, os.O_RDONLY | dir_flags)
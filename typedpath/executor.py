@@ -0,0 +1,128 @@
+import asyncio
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait
+from functools import partial
+from threading import Lock
+from typing import ParamSpec, TypeVar
+
+P = ParamSpec("P")
+T = TypeVar("T")
+U = TypeVar("U")
+
+DEFAULT_IO_WORKERS = 32
+"""Default number of threads used for doing I/O in the background."""
+
+_executor: Executor | None = None
+_owns_executor = False
+_max_workers = DEFAULT_IO_WORKERS
+_lock = Lock()
+
+
+def set_io_workers(max_workers: int) -> None:
+    """
+    Sets the number of threads used for doing I/O in the background, process-wide.
+
+    This bounds the I/O concurrency of the asynchronous and bulk APIs.
+    """
+    assert max_workers > 0, max_workers
+    global _max_workers
+    with _lock:
+        _max_workers = max_workers
+        _set_executor(None)
+
+
+def set_io_executor(executor: Executor | None) -> None:
+    """
+    Sets the executor used for doing I/O in the background, process-wide.
+
+    The executor is not shut down by `typedpath`. Set to `None` to return to using an internal
+    thread pool.
+    """
+    with _lock:
+        _set_executor(executor)
+
+
+def _set_executor(executor: Executor | None) -> None:
+    global _executor, _owns_executor
+    if _owns_executor:
+        assert _executor is not None
+        _executor.shutdown(wait=False)
+    _executor = executor
+    _owns_executor = False
+
+
+def get_io_executor() -> Executor:
+    """Gets the executor used for doing I/O in the background."""
+    global _executor, _owns_executor
+    executor = _executor
+    if executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(_max_workers, thread_name_prefix="typedpath-io")
+                _owns_executor = True
+            executor = _executor
+    return executor
+
+
+async def run_io(f: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+    """
+    Runs `f(*args, **kwargs)` on the I/O executor, without blocking the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    call: Callable[[], T] = partial(f, *args, **kwargs)
+    return await loop.run_in_executor(get_io_executor(), call)
+
+
+DEFAULT_MAX_IN_FLIGHT = 64
+"""Default number of tasks `map_bounded` will have submitted, but not yielded, at any time."""
+
+
+def map_bounded(
+    f: Callable[[T], U],
+    items: Iterable[T],
+    *,
+    executor: Executor | None = None,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    weight: Callable[[T], int] | None = None,
+    max_weight: int | None = None,
+) -> Iterator[tuple[T, "Future[U]"]]:
+    """
+    Submits `f(item)` for each of `items` to an executor, and yields the futures, in order.
+
+    At most `max_in_flight` items are consumed from `items`, and submitted, ahead of the consumer
+    of this iterator. If the consumer stops early, the remaining futures are cancelled.
+
+    :param executor: Executor to use. Defaults to `get_io_executor()`.
+    :param weight: Function computing the weight of an item, such as its size in bytes.
+    :param max_weight: If set, the total weight of the submitted items is kept at or below this,
+        except that a single item is always allowed.
+    """
+    assert max_in_flight > 0, max_in_flight
+    if executor is None:
+        executor = get_io_executor()
+    pending: deque[tuple[T, Future[U], int]] = deque()
+    pending_weight = 0
+
+    def pop() -> tuple[T, Future[U]]:
+        nonlocal pending_weight
+        item, future, item_weight = pending.popleft()
+        pending_weight -= item_weight
+        wait([future])
+        return item, future
+
+    try:
+        for item in items:
+            item_weight = 0 if weight is None else weight(item)
+            if max_weight is not None:
+                while pending and pending_weight + item_weight > max_weight:
+                    yield pop()
+            pending.append((item, executor.submit(f, item), item_weight))
+            pending_weight += item_weight
+            if len(pending) >= max_in_flight:
+                yield pop()
+        while pending:
+            yield pop()
+    finally:
+        for _, future, _ in pending:
+            future.cancel()
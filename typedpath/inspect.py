@@ -1,15 +1,78 @@
-from typing import TypeVar, get_args, get_origin
+from collections.abc import Mapping
+from dataclasses import dataclass, replace
+from typing import Annotated, Any, Generic, TypeVar, get_args, get_origin
 
 from typedpath.args import Args
-from typedpath.base import PathLikeLike, TypedPath
+from typedpath.base import PathLikeLike, TypedFile, TypedPath
+from typedpath.compression import Compression, compressed
 
 TP = TypeVar("TP", bound=TypedPath)
 
 
-def make(t: type[TP], path: PathLikeLike, args: Args) -> TP:
+@dataclass(frozen=True)
+class Maker(Generic[TP]):
     """
-    Create a new instance of type `t`, using `path` and `args`.
+    A pre-processed recipe for creating instances of a (possibly generic) `TypedPath` type.
+
+    Splitting a type into its origin and type arguments is relatively slow, so code that creates
+    many instances of the same type should create a `Maker` once, and reuse it.
     """
+
+    origin_type: type[TP]
+    type_args: tuple[Any, ...]
+    kwargs: Mapping[str, Any]
+    default_suffix: str
+    compression: Compression | None = None
+
+    def __call__(self, path: PathLikeLike) -> TP:
+        result = self.origin_type(path, *self.type_args, **self.kwargs)
+        if self.compression is not None:
+            assert isinstance(result, TypedFile)
+            compressed(result, self.compression)
+        return result
+
+
+def compile_maker(t: type[TP], args: Args) -> Maker[TP]:
+    """
+    Create a `Maker` for creating instances of type `t`, using `args`.
+    """
+    if get_origin(t) is Annotated:
+        return _compile_annotated(t, args)
     origin_type = get_origin(t) or t
     type_args = get_args(t)
-    return origin_type(path, *type_args, **args.kwargs)
+    return Maker(origin_type, type_args, args.kwargs, t.default_suffix)
+
+
+def _compile_annotated(t: Any, args: Args) -> Maker[Any]:
+    """
+    Create a `Maker` for an `Annotated` type, such as `Compressed[...]`.
+
+    A `Compression` in the annotations can be overridden by a `compression` argument. Other
+    annotations are ignored.
+    """
+    inner_type, *annotations = get_args(t)
+    compressions = [a for a in annotations if isinstance(a, Compression)]
+    if not compressions:
+        return compile_maker(inner_type, args)
+
+    kwargs = dict(args.kwargs)
+    compression = kwargs.pop("compression", compressions[-1])
+    assert isinstance(compression, Compression), (
+        f"compression must be a Compression. Found: {compression}"
+    )
+    maker = compile_maker(inner_type, Args(kwargs))
+    assert issubclass(maker.origin_type, TypedFile), (
+        f"Only files can be compressed. Found: {maker.origin_type}"
+    )
+    return replace(
+        maker,
+        default_suffix=f"{maker.default_suffix}{compression.suffix}",
+        compression=compression,
+    )
+
+
+def make(t: type[TP], path: PathLikeLike, args: Args) -> TP:
+    """
+    Create a new instance of type `t`, using `path` and `args`.
+    """
+    return compile_maker(t, args)(path)
@@ -1,38 +1,458 @@
+import codecs
 import json
-from collections.abc import Mapping, Sequence
-from typing import Any, TypeAlias
+import os
+from abc import ABC, abstractmethod
+from array import array
+from collections import deque
+from collections.abc import Hashable, Iterable, Iterator, Mapping, Sequence
+from itertools import islice
+from typing import IO, Any, Literal, TypeAlias
 
 from typedpath.base import PathLikeLike, TypedFile
+from typedpath.cache import cached_read
+from typedpath.executor import run_io
+from typedpath.offsets import OffsetIndex
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    from unittest.mock import MagicMock
+
+    orjson = MagicMock()
+
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgspec
+
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    from unittest.mock import MagicMock
+
+    msgspec = MagicMock()
+
+    MSGSPEC_AVAILABLE = False
+
 
 JSONPrimitive: TypeAlias = int | float | bool | str | None
 JSON = JSONPrimitive | Sequence["JSON"] | Mapping[str, "JSON"]
 MutableJSON = JSONPrimitive | list["MutableJSON"] | dict[str, "MutableJSON"]
 
 
+class JSONBackend(ABC):
+    """
+    Strategy for converting JSON to, and from, UTF-8 encoded bytes.
+    """
+
+    @abstractmethod
+    def dumps(self, data: JSON, **kwargs: Any) -> bytes:
+        """
+        Converts `data` to UTF-8 encoded JSON.
+
+        :param kwargs: Backend specific options.
+        """
+
+    @abstractmethod
+    def loads(self, data: bytes | str, **kwargs: Any) -> MutableJSON:
+        """
+        Converts JSON to Python objects.
+
+        :param kwargs: Backend specific options.
+        """
+
+
+class StdlibJSONBackend(JSONBackend):
+    """
+    A `JSONBackend` using Python's built-in `json` module.
+
+    Options are passed to `json.dumps` and `json.loads`.
+    """
+
+    def dumps(self, data: JSON, **kwargs: Any) -> bytes:
+        return json.dumps(data, **kwargs).encode("utf-8")
+
+    def loads(self, data: bytes | str, **kwargs: Any) -> MutableJSON:
+        return json.loads(data, **kwargs)  # type: ignore[no-any-return]
+
+
+class OrjsonJSONBackend(JSONBackend):
+    """
+    A `JSONBackend` using the `orjson` package, which is much faster than the built-in `json`.
+
+    Options are passed to `orjson.dumps`. `orjson` is stricter than the built-in `json` module - for
+    example it does not allow keys that are not strings.
+    """
+
+    def __init__(self) -> None:
+        assert ORJSON_AVAILABLE, (
+            "orjson does not appear to be installed on this system. Try: pip install orjson"
+        )
+
+    def dumps(self, data: JSON, **kwargs: Any) -> bytes:
+        return orjson.dumps(data, **kwargs)
+
+    def loads(self, data: bytes | str, **kwargs: Any) -> MutableJSON:
+        assert not kwargs, f"orjson.loads does not take any options. Found: {kwargs}"
+        return orjson.loads(data)  # type: ignore[no-any-return]
+
+
+class MsgspecJSONBackend(JSONBackend):
+    """
+    A `JSONBackend` using the `msgspec` package, which is much faster than the built-in `json`.
+
+    Options are passed to `msgspec.json.encode` and `msgspec.json.decode`.
+    """
+
+    def __init__(self) -> None:
+        assert MSGSPEC_AVAILABLE, (
+            "msgspec does not appear to be installed on this system. Try: pip install msgspec"
+        )
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, data: JSON, **kwargs: Any) -> bytes:
+        if kwargs:
+            return msgspec.json.encode(data, **kwargs)  # type: ignore[no-any-return]
+        return self._encoder.encode(data)  # type: ignore[no-any-return]
+
+    def loads(self, data: bytes | str, **kwargs: Any) -> MutableJSON:
+        if kwargs:
+            return msgspec.json.decode(data, **kwargs)  # type: ignore[no-any-return]
+        return self._decoder.decode(data)  # type: ignore[no-any-return]
+
+
+JSONBackendName: TypeAlias = Literal["stdlib", "orjson", "msgspec", "auto"]
+"""
+Names of the built-in `JSONBackend`s. `"auto"` selects the fastest backend that is installed.
+"""
+
+
+def _fastest_json_backend() -> JSONBackend:
+    if ORJSON_AVAILABLE:
+        return OrjsonJSONBackend()
+    if MSGSPEC_AVAILABLE:
+        return MsgspecJSONBackend()
+    return StdlibJSONBackend()
+
+
+def _make_json_backend(backend: JSONBackend | JSONBackendName) -> JSONBackend:
+    if isinstance(backend, JSONBackend):
+        return backend
+    match backend:
+        case "stdlib":
+            return StdlibJSONBackend()
+        case "orjson":
+            return OrjsonJSONBackend()
+        case "msgspec":
+            return MsgspecJSONBackend()
+        case "auto":
+            return _fastest_json_backend()
+    raise AssertionError(f"Unknown JSON backend: {backend}")
+
+
+_json_backend: JSONBackend = StdlibJSONBackend()
+
+
+def set_json_backend(backend: JSONBackend | JSONBackendName) -> None:
+    """
+    Sets the `JSONBackend` used by `JSONFile`s that do not set one, process-wide.
+
+    The default is `"stdlib"`.
+    """
+    global _json_backend
+    _json_backend = _make_json_backend(backend)
+
+
+def _backend_cache_key(backend: JSONBackend | None) -> type[JSONBackend]:
+    """
+    Returns the key of `backend`, the backend of a file, in the read cache.
+
+    Backends are created for each file, so they are identified by their class.
+    """
+    return type(backend or _json_backend)
+
+
+def get_json_backend() -> JSONBackend:
+    """Gets the `JSONBackend` used by `JSONFile`s that do not set one."""
+    return _json_backend
+
+
 class JSONFile(TypedFile):
-    """A file containing JSON."""
+    """
+    A file containing JSON.
+
+    By default the JSON is read and written with Python's built-in `json` module. Faster backends
+    can be selected per file, or process-wide with `set_json_backend`.
+    """
 
     default_suffix = ".json"
 
-    def __init__(self, path: PathLikeLike, *, encoding: str = "utf-8") -> None:
+    def __init__(
+        self,
+        path: PathLikeLike,
+        *,
+        encoding: str = "utf-8",
+        backend: JSONBackend | JSONBackendName | None = None,
+    ) -> None:
+        """
+        :param path: Path this object refers to on disk.
+        :param encoding: Encoding of the file.
+        :param backend: `JSONBackend` to use, or the name of a built-in one. If unset, the backend
+            from `get_json_backend` is used.
+        """
         super().__init__(path)
 
         self._encoding = encoding
+        self._is_utf8 = codecs.lookup(encoding).name == "utf-8"
+        self._backend = None if backend is None else _make_json_backend(backend)
 
     def write(self, data: JSON, **kwargs: Any) -> None:
         """
         Sets the contents of this file.
 
-        :param kwargs: Key-word arguments to pass to `json.dump`.
+        :param kwargs: Key-word arguments to pass to the backend, such as `json.dumps`.
         """
-        with open(self.write_path(), "wt", encoding=self._encoding) as fp:
-            json.dump(data, fp, **kwargs)
+        backend = self._backend or _json_backend
+        encoded = backend.dumps(data, **kwargs)
+        if not self._is_utf8:
+            encoded = encoded.decode("utf-8").encode(self._encoding)
+        with self.open_write("wb") as fp:
+            fp.write(encoded)
+
+    def _read_cache_options(self) -> Hashable:
+        return (self._encoding, _backend_cache_key(self._backend))
 
+    def _share_cached_value(self, value: MutableJSON) -> MutableJSON:
+        return _copy_json(value)
+
+    @cached_read
     def read(self, **kwargs: Any) -> MutableJSON:
         """
         Gets the contents of this file.
 
-        :param kwargs: Key-word arguments to pass to `json.load`.
+        :param kwargs: Key-word arguments to pass to the backend, such as `json.loads`.
+        """
+        backend = self._backend or _json_backend
+        with self.open_read("rb") as fp:
+            encoded: bytes = fp.read()
+        return backend.loads(encoded if self._is_utf8 else encoded.decode(self._encoding), **kwargs)
+
+
+def _copy_json(value: MutableJSON) -> MutableJSON:
+    """Returns a deep copy of `value`. Much faster than `copy.deepcopy`, for JSON data."""
+    if isinstance(value, dict):
+        return {k: _copy_json(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_json(v) for v in value]
+    return value
+
+
+_JSONL_BUFFER_SIZE = 2**20
+_JSONL_TAIL_BLOCK_SIZE = 2**16
+
+
+class JSONLinesFile(TypedFile):
+    """
+    A file containing a sequence of JSON records, one per line, in the JSON Lines format.
+
+    Records can be appended without reading or rewriting the existing file, and read one at a time,
+    so files can be larger than memory. The file is always UTF-8 encoded.
+
+    Optionally the offset of every record is stored in an index file, next to this file, so that
+    `record` and `tail` do not need to scan the file. The index is kept up to date by this class,
+    and records appended by other means are detected, and indexed, when the index is next used.
+    Files with an index cannot be compressed.
+    """
+
+    default_suffix = ".jsonl"
+
+    def __init__(
+        self,
+        path: PathLikeLike,
+        *,
+        backend: JSONBackend | JSONBackendName | None = None,
+        index: bool = False,
+    ) -> None:
+        """
+        :param path: Path this object refers to on disk.
+        :param backend: `JSONBackend` to use, or the name of a built-in one. If unset, the backend
+            from `get_json_backend` is used.
+        :param index: Whether to maintain an index of the offsets of the records.
+        """
+        super().__init__(path)
+
+        self._backend = None if backend is None else _make_json_backend(backend)
+        self._index = OffsetIndex(self, _scan_lines) if index else None
+
+    def _encode_lines(self, records: Iterable[JSON]) -> Iterator[tuple[bytes, "array[int]"]]:
+        """
+        Encodes `records` as buffers of about `_JSONL_BUFFER_SIZE` bytes, with the offsets of the
+        ends of the records in each buffer, relative to the start of the buffer.
+        """
+        backend = self._backend or _json_backend
+        buffer = bytearray()
+        ends = array("Q")
+        for record in records:
+            buffer += backend.dumps(record)
+            buffer += b"\n"
+            ends.append(len(buffer))
+            if len(buffer) >= _JSONL_BUFFER_SIZE:
+                yield bytes(buffer), ends
+                buffer.clear()
+                ends = array("Q")
+        if buffer:
+            yield bytes(buffer), ends
+
+    def _write_lines(self, fp: IO[bytes], records: Iterable[JSON]) -> "array[int]":
+        """Writes `records` at the current position of `fp`, returning the ends of the records."""
+        start = fp.tell()
+        all_ends = array("Q")
+        for buffer, ends in self._encode_lines(records):
+            all_ends.extend(start + end for end in ends)
+            fp.write(buffer)
+            start += len(buffer)
+        return all_ends
+
+    def write(self, records: Iterable[JSON]) -> None:
+        """
+        Sets the contents of this file.
+
+        `records` are consumed lazily, so they do not need to be in memory at the same time.
+        """
+        with self.open_write("wb") as fp:
+            ends = self._write_lines(fp, records)
+        if self._index is None:
+            OffsetIndex(self, _scan_lines).remove()
+        else:
+            self._index.write(ends)
+
+    def append(self, record: JSON) -> None:
+        """
+        Appends one record to this file, or creates the file if it does not exist.
+
+        To append many records use `extend`, which is much faster.
         """
-        with open(self.read_path(), "rt", encoding=self._encoding) as fp:
-            return json.load(fp, **kwargs)  # type: ignore[no-any-return]
+        self.extend((record,))
+
+    def extend(self, records: Iterable[JSON]) -> None:
+        """
+        Appends records to this file, or creates the file if it does not exist.
+
+        The records are buffered, and written in large blocks. Appending is never atomic.
+        """
+        if self._index is None:
+            with self.open_write("ab") as fp:
+                self._write_lines(fp, records)
+            return
+
+        with self.open_write("ab") as fp:
+            before = os.fstat(fp.fileno())
+            ends = self._write_lines(fp, records)
+            fp.flush()
+            after = os.fstat(fp.fileno())
+        self._index.extend(before, after, ends)
+
+    def _read_cache_options(self) -> Hashable:
+        return _backend_cache_key(self._backend)
+
+    def _share_cached_value(self, value: list[MutableJSON]) -> list[MutableJSON]:
+        return [_copy_json(record) for record in value]
+
+    @cached_read
+    def read(self) -> list[MutableJSON]:
+        """Gets all records in this file."""
+        return list(self.iter())
+
+    def iter(self) -> Iterator[MutableJSON]:
+        """
+        Iterates over the records in this file, reading them lazily, in constant memory.
+        """
+        backend = self._backend or _json_backend
+        with self.open_read("rb") as fp:
+            for line in fp:
+                if line.strip():
+                    yield backend.loads(line)
+
+    def record(self, index: int) -> MutableJSON:
+        """
+        Gets the record at position `index`. Negative values count from the end of the file.
+
+        With an index this reads only the requested record. Otherwise the file is scanned.
+        """
+        if self._index is None:
+            if index < 0:
+                records = self.tail(-index)
+                if len(records) < -index:
+                    raise IndexError(f"Record index {index} out of range for {self._path}.")
+                return records[0]
+            for record in islice(self.iter(), index, None):
+                return record
+            raise IndexError(f"Record index {index} out of range for {self._path}.")
+
+        ends = self._index.ends()
+        if not -len(ends) <= index < len(ends):
+            raise IndexError(f"Record index {index} out of range for {self._path}.")
+        index %= len(ends)
+        start = ends[index - 1] if index > 0 else 0
+        with self.open_read("rb") as fp:
+            fp.seek(start)
+            line = fp.read(ends[index] - start)
+        return (self._backend or _json_backend).loads(line)
+
+    def tail(self, n: int) -> list[MutableJSON]:
+        """
+        Gets the last `n` records in this file, or all records, if there are fewer than `n`.
+
+        The file is read backwards from the end, so this is fast even without an index, unless the
+        file is compressed, in which case it is scanned.
+        """
+        assert n >= 0, f"Cannot read a negative number of records. Found: {n}"
+        if n == 0:
+            return []
+        if self._index is None and self._codec is not None:
+            return list(deque(self.iter(), maxlen=n))
+
+        if self._index is not None:
+            ends = self._index.ends()
+            start = ends[-n - 1] if n < len(ends) else 0
+            with self.open_read("rb") as fp:
+                fp.seek(start)
+                lines = fp.read().split(b"\n")
+        else:
+            with self.open_read("rb") as fp:
+                lines = _tail_lines(fp, n)
+        backend = self._backend or _json_backend
+        return [backend.loads(line) for line in [line for line in lines if line.strip()][-n:]]
+
+    async def aextend(self, records: Iterable[JSON]) -> None:
+        """Like `extend`, but does not block the event loop."""
+        await run_io(self.extend, records)
+
+
+def _scan_lines(fp: IO[bytes], start: int) -> Iterator[int]:
+    end = start
+    for line in fp:
+        end += len(line)
+        if line.strip():
+            yield end
+
+
+def _tail_lines(fp: IO[bytes], n: int) -> list[bytes]:
+    """
+    Reads lines from the end of `fp`, until at least `n` non-empty lines have been read.
+
+    The first line returned may be incomplete.
+    """
+    pos = fp.seek(0, 2)
+    data = b""
+    while pos > 0:
+        step = min(_JSONL_TAIL_BLOCK_SIZE, pos)
+        pos -= step
+        fp.seek(pos)
+        data = fp.read(step) + data
+        # One extra line, because the first line may be incomplete:
+        if data.count(b"\n") > n and sum(1 for line in data.split(b"\n") if line.strip()) > n:
+            break
+    return data.split(b"\n")
@@ -23,6 +23,16 @@ class KeyCodec(Generic[T], ABC):
         :param key_type: The type the key should have.
         """
 
+    def is_bijective(self, key_type: type[T]) -> bool:
+        """
+        Whether `decode(encode(key), key_type) == key` is guaranteed for all keys of `key_type`.
+
+        Users of the codec may skip checking the round-trip of keys, if this returns `True`, and the
+        type of the key is exactly `key_type`. Instances of subclasses, such as `bool` for `int`,
+        may not round-trip.
+        """
+        return False
+
 
 _ESCAPE_CHAR = "^"
 _ESCAPES = {
@@ -65,6 +75,9 @@ class StrKeyCodec(KeyCodec[Any]):
             key_str = "".join(out_tokens)
         return key_type(key_str)
 
+    def is_bijective(self, key_type: type[Any]) -> bool:
+        return key_type in (str, int)
+
 
 class BoolKeyCodec(KeyCodec[bool]):
     """
@@ -83,6 +96,9 @@ class BoolKeyCodec(KeyCodec[bool]):
                 return False
         raise AssertionError(f"Don't know how to interpret {key_str} as a bool")
 
+    def is_bijective(self, key_type: type[bool]) -> bool:
+        return True
+
 
 @singledispatch
 def _codec_registry(key: T) -> KeyCodec[T]:
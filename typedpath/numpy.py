@@ -1,6 +1,24 @@
-from typing import Any
+import ast
+import io
+import math
+import os
+import struct
+import time
+import zipfile
+import zlib
+from collections.abc import Hashable, Iterator, Mapping
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, replace
+from functools import partial
+from pathlib import Path
+from threading import Lock
+from typing import IO, Any, Literal
 
 from typedpath.base import PathLikeLike, TypedFile
+from typedpath.cache import cached_read, stat_key
+from typedpath.executor import map_bounded
+from typedpath.writeback import settle
 
 try:
     import numpy as np
@@ -16,17 +34,203 @@ except ImportError:
 
 AnyNDArray = np.ndarray[Any, Any]
 
+MMapMode = Literal["r", "r+", "c"]
+"""Modes for memory-mapping arrays. See `numpy.memmap`."""
+
+
+def _share_array(array: AnyNDArray, mmap_mode: MMapMode | None) -> AnyNDArray:
+    """Returns `array`, from the read cache, in a form that is safe to give to a caller."""
+    if mmap_mode == "r+":
+        # Writes go to the file, so callers would see each other's writes even without the cache:
+        return array
+    array.flags.writeable = False
+    return array
+
+
+@dataclass(frozen=True)
+class NpyHeader:
+    """The metadata of an array stored in a `.npy` file."""
+
+    shape: tuple[int, ...]
+    dtype: np.dtype[Any]
+    fortran_order: bool
+    offset: int
+    """Position in the file, in bytes, where the array data starts."""
+
+    @property
+    def size(self) -> int:
+        """Number of elements in the array."""
+        return math.prod(self.shape)
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes of array data."""
+        return self.size * self.dtype.itemsize
+
+
+def _read_npy_header(fp: IO[bytes]) -> NpyHeader:
+    version = np.lib.format.read_magic(fp)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(fp)
+    elif version == (2, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(fp)
+    elif version == (3, 0):
+        shape, fortran_order, dtype = _read_npy_header_3_0(fp)
+    else:
+        raise ValueError(f"Unsupported .npy format version: {version[0]}.{version[1]}")
+    return NpyHeader(shape, dtype, fortran_order, fp.tell())
+
+
+def _read_npy_header_3_0(fp: IO[bytes]) -> tuple[tuple[int, ...], bool, np.dtype[Any]]:
+    """
+    Reads a version 3.0 header, which is like version 2.0, but encoded with UTF-8, rather than
+    latin-1. NumPy has no public function for this.
+    """
+    (length,) = struct.unpack("<I", fp.read(4))
+    encoded = fp.read(length)
+    if len(encoded) != length:
+        raise ValueError("EOF while reading the .npy header.")
+    header = ast.literal_eval(encoded.decode("utf-8"))
+    if not isinstance(header, dict) or header.keys() != {"descr", "fortran_order", "shape"}:
+        raise ValueError(f"Invalid .npy header: {header!r}")
+    return (
+        tuple(header["shape"]),
+        bool(header["fortran_order"]),
+        np.lib.format.descr_to_dtype(header["descr"]),
+    )
+
+
+def _encode_npy_header(header: NpyHeader) -> bytes | None:
+    """
+    Encodes `header`, to exactly `header.offset` bytes, or returns `None` if that is not possible.
+
+    `header.offset` may be `0`, for any length.
+    """
+    header_dict = {
+        "descr": np.lib.format.dtype_to_descr(header.dtype),
+        "fortran_order": header.fortran_order,
+        "shape": header.shape,
+    }
+    for write_header in (
+        np.lib.format.write_array_header_1_0,
+        np.lib.format.write_array_header_2_0,
+    ):
+        buffer = io.BytesIO()
+        try:
+            write_header(buffer, header_dict)
+        except ValueError:
+            # Header too large for this version.
+            continue
+        encoded = buffer.getvalue()
+        if header.offset in (0, len(encoded)):
+            return encoded
+    return None
+
+
+class NpyAppender:
+    """
+    Appends chunks to the array in an `.npy` file, along the first axis.
+
+    Create instances with `NpyFile.appending()`.
+    """
+
+    def __init__(self, file: "NpyFile", stack: ExitStack) -> None:
+        self._file = file
+        self._stack = stack
+        self._fp: IO[bytes] | None = None
+        self._header: NpyHeader | None = None
+
+    def append(self, chunk: AnyNDArray) -> None:
+        """
+        Appends `chunk` to the array.
+
+        `chunk` must have the same dtype as the array, and the same shape, except for the first
+        axis.
+        """
+        assert chunk.ndim >= 1, f"Cannot append a 0-dimensional array to {self._file}."
+        assert not chunk.dtype.hasobject, f"Cannot append arrays of objects to {self._file}."
+        if self._fp is None:
+            self._open(chunk)
+        fp = self._fp
+        header = self._header
+        assert fp is not None
+        assert header is not None
+        assert chunk.dtype == header.dtype, (
+            f"Cannot append data of type {chunk.dtype} to array of type {header.dtype}."
+            f" File: {self._file}"
+        )
+        assert chunk.shape[1:] == header.shape[1:], (
+            f"Cannot append data of shape {chunk.shape} to array of shape {header.shape}."
+            f" File: {self._file}"
+        )
+        fp.write(np.ascontiguousarray(chunk).data)
+        self._header = replace(header, shape=(header.shape[0] + chunk.shape[0], *header.shape[1:]))
+
+    def _open(self, chunk: AnyNDArray) -> None:
+        file = self._file
+        path = file.pretty_path()
+        # Writes buffered by write-back must be on disk, before we check whether the file exists:
+        settle(path)
+        if not path.exists():
+            fp = self._stack.enter_context(file.open_write("w+b"))
+            header = NpyHeader((0, *chunk.shape[1:]), chunk.dtype, False, 0)
+            encoded = _encode_npy_header(header)
+            assert encoded is not None
+            fp.write(encoded)
+            header = replace(header, offset=len(encoded))
+        else:
+            fp = self._stack.enter_context(file.open_write("r+b"))
+            header = _read_npy_header(fp)
+            assert len(header.shape) >= 1, f"Cannot append to a 0-dimensional array. File: {file}"
+            assert not header.fortran_order or len(header.shape) == 1, (
+                f"Cannot append to an array in Fortran order. File: {file}"
+            )
+            # Discard anything after the data, left by an earlier, failed, append:
+            fp.seek(header.offset + header.nbytes)
+            fp.truncate()
+        self._fp = fp
+        self._header = header
+        self._stack.callback(self._close)
+
+    def _close(self) -> None:
+        fp = self._fp
+        header = self._header
+        assert fp is not None
+        assert header is not None
+        encoded = _encode_npy_header(header)
+        assert encoded is not None, (
+            f"The header of {self._file} has no room for the new shape {header.shape}."
+            " The file may have been written by an old version of NumPy."
+        )
+        # The header is written after the data, so that the file is always valid:
+        fp.seek(0)
+        fp.write(encoded)
+
 
 class NpyFile(TypedFile):
-    """A file containing an (uncompressed) NumPy Array."""
+    """
+    A file containing an (uncompressed) NumPy Array.
+
+    Large arrays can be memory-mapped, instead of read into memory, by setting `mmap_mode`, and
+    parts of an array can be read with `read_slice`.
+    """
 
     default_suffix = ".npy"
 
-    def __init__(self, path: PathLikeLike, *, allow_pickle: bool = False) -> None:
+    def __init__(
+        self,
+        path: PathLikeLike,
+        *,
+        allow_pickle: bool = False,
+        mmap_mode: MMapMode | None = None,
+    ) -> None:
         """
         :param path: Path this object refers to on disk.
         :param allow_pickle: If `True` contents of arrays of `object`s are pickled. If `False`
             arrays of `object`s cannot be stored.
+        :param mmap_mode: If set, `read` returns a memory-mapped array, using this mode, instead of
+            reading the array into memory. Arrays of `object`s cannot be memory-mapped. Do not
+            overwrite a file while it is memory-mapped, unless `atomic_writes` are enabled.
         """
         super().__init__(path)
         assert NUMPY_AVAILABLE, (
@@ -37,26 +241,388 @@ class NpyFile(TypedFile):
         )
 
         self._allow_pickle = allow_pickle
+        self._mmap_mode = mmap_mode
+        self._header: tuple[tuple[int, int, int], NpyHeader] | None = None
 
     def write(self, data: AnyNDArray) -> None:
-        np.save(self.write_path(), data, allow_pickle=self._allow_pickle)
+        with self.open_write("wb") as fp:
+            np.save(fp, data, allow_pickle=self._allow_pickle)
+
+    def _read_cache_options(self) -> Hashable:
+        return (self._allow_pickle, self._mmap_mode)
+
+    def _is_read_cacheable(self) -> bool:
+        # Each caller gets its own copy-on-write mapping, as copying the array could use lots of
+        # memory:
+        return self._mmap_mode != "c"
 
+    def _share_cached_value(self, value: AnyNDArray) -> AnyNDArray:
+        return _share_array(value, self._mmap_mode)
+
+    @cached_read
     def read(self) -> AnyNDArray:
-        return np.load(  # type: ignore[no-any-return]
-            self.read_path(), allow_pickle=self._allow_pickle
+        if self._mmap_mode is not None:
+            with self.reading() as path:
+                return np.load(  # type: ignore[no-any-return]
+                    path, mmap_mode=self._mmap_mode, allow_pickle=self._allow_pickle
+                )
+        with self.open_read("rb") as fp:
+            return np.load(fp, allow_pickle=self._allow_pickle)  # type: ignore[no-any-return]
+
+    def append(self, chunk: AnyNDArray) -> None:
+        """
+        Appends `chunk` to the stored array, along the first axis, or creates the array if the file
+        does not exist.
+
+        This only writes `chunk`, and the header, so it does not matter how large the stored array
+        is. To append many chunks use `appending`.
+        """
+        with self.appending() as appender:
+            appender.append(chunk)
+
+    @contextmanager
+    def appending(self) -> Iterator[NpyAppender]:
+        """
+        Context manager for appending many chunks to the stored array, along the first axis::
+
+            with features.appending() as appender:
+                for chunk in compute_features():
+                    appender.append(chunk)
+
+        The file is kept open between chunks, and the header is updated when the context exits, so
+        only one chunk needs to be in memory at a time. If the file does not exist it is created on
+        the first append. Appending is never atomic, but the file contains a valid array, even if
+        appending is interrupted.
+        """
+        with ExitStack() as stack:
+            yield NpyAppender(self, stack)
+
+    def header(self) -> NpyHeader:
+        """
+        Reads the shape, dtype, etc. of the stored array, without reading the array itself.
+
+        The header is cached, for as long as the file is unchanged.
+        """
+        with self.reading() as path:
+            stat = path.stat()
+            key = stat_key(stat)
+            cached = self._header
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            with open(path, "rb") as fp:
+                header = _read_npy_header(fp)
+        self._header = (key, header)
+        return header
+
+    def read_slice(self, index: Any, *, copy: bool = True) -> Any:
+        """
+        Reads part of the stored array, without reading the rest of it::
+
+            rows = features.read_slice(slice(1000, 2000))
+
+        :param index: Index into the array, as accepted by `numpy.ndarray.__getitem__`. Only the
+            parts of the file needed by the index are read.
+        :param copy: If `True` the result is copied into memory. If `False` the result is a
+            read-only view of a memory-map of the file, which avoids copying. Indexing with arrays
+            always copies.
+        """
+        header = self.header()
+        assert not header.dtype.hasobject, (
+            f"Cannot read slices of arrays of objects. File: {self.pretty_path()}"
+        )
+        order: Literal["C", "F"] = "F" if header.fortran_order else "C"
+        if header.size == 0:
+            # Empty files cannot be memory-mapped.
+            return np.empty(header.shape, header.dtype, order=order)[index]
+        with self.reading() as path:
+            array = np.memmap(
+                path,
+                dtype=header.dtype,
+                mode="r",
+                offset=header.offset,
+                shape=header.shape,
+                order=order,
+            )
+        result = array[index]
+        if copy and isinstance(result, np.ndarray):
+            result = np.array(result)
+        return result
+
+
+_NPY_SUFFIX = ".npy"
+_ZIP_LOCAL_HEADER_SIZE = 30
+
+
+class _DeflatedMember:
+    """
+    File-like object that deflates everything written to it, for storing in a zip file.
+    """
+
+    def __init__(self) -> None:
+        self._compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        self.chunks: list[bytes] = []
+        self.crc = 0
+        self.file_size = 0
+        self.compress_size = 0
+
+    def write(self, data: Any) -> int:
+        view = memoryview(data)
+        self.crc = zlib.crc32(view, self.crc)
+        self.file_size += view.nbytes
+        self._add(self._compressor.compress(view))
+        return view.nbytes
+
+    def flush(self) -> None:
+        pass
+
+    def finish(self) -> None:
+        self._add(self._compressor.flush())
+
+    def _add(self, chunk: bytes) -> None:
+        if chunk:
+            self.chunks.append(chunk)
+            self.compress_size += len(chunk)
+
+
+_deflate_executor: Executor | None = None
+_deflate_executor_lock = Lock()
+
+
+def _get_deflate_executor() -> Executor:
+    """
+    Returns the executor that arrays are compressed with, by default.
+
+    This is not the I/O executor: writes may run on the I/O executor, for example in
+    `DictDir.write_many`, and if all its threads waited for compression on it, none would be left
+    to compress.
+    """
+    global _deflate_executor
+    executor = _deflate_executor
+    if executor is None:
+        with _deflate_executor_lock:
+            if _deflate_executor is None:
+                _deflate_executor = ThreadPoolExecutor(
+                    os.cpu_count() or 1, thread_name_prefix="typedpath-deflate"
+                )
+            executor = _deflate_executor
+    return executor
+
+
+def _deflate_array(array: AnyNDArray, allow_pickle: bool) -> _DeflatedMember:
+    member = _DeflatedMember()
+    np.lib.format.write_array(member, array, allow_pickle=allow_pickle)
+    member.finish()
+    return member
+
+
+_ZIP64_LIMIT = 0xFFFFFFFF
+"""Sizes and offsets from this value on are stored in zip64 records."""
+_ZIP64_COUNT_LIMIT = 0xFFFF
+"""Numbers of members from this value on are stored in zip64 records."""
+
+
+def _zip64_extra(fields: list[int]) -> bytes:
+    """Returns the zip64 extra field, holding `fields`, or nothing if there are none."""
+    if not fields:
+        return b""
+    return struct.pack(f"<HH{len(fields)}Q", 1, 8 * len(fields), *fields)
+
+
+class _DeflatedZipWriter:
+    """
+    Writes a zip file of members whose data has already been deflated.
+
+    `zipfile` has no API for adding such members, so this writes the zip format itself. The sizes
+    and CRC of each member are known before it is written, so `fp` need not be seekable.
+    """
+
+    def __init__(self, fp: IO[bytes]) -> None:
+        self._fp = fp
+        self._offset = 0
+        self._central_directory: list[bytes] = []
+        year, month, day, hour, minute, second = time.localtime()[:6]
+        self._dos_date = (year - 1980) << 9 | month << 5 | day
+        self._dos_time = hour << 11 | minute << 5 | second // 2
+
+    def add(self, name: str, member: _DeflatedMember) -> None:
+        """Writes the local header and data of `member`."""
+        try:
+            encoded_name = name.encode("ascii")
+            flags = 0
+        except UnicodeEncodeError:
+            encoded_name = name.encode("utf-8")
+            flags = 0x800
+        header_offset = self._offset
+
+        zip64_sizes = max(member.file_size, member.compress_size) >= _ZIP64_LIMIT
+        sizes = (
+            (0xFFFFFFFF, 0xFFFFFFFF) if zip64_sizes else (member.compress_size, member.file_size)
+        )
+        local_fields = [member.file_size, member.compress_size] if zip64_sizes else []
+        local_extra = _zip64_extra(local_fields)
+        self._write(
+            struct.pack(
+                "<IHHHHHIIIHH",
+                0x04034B50,
+                45 if local_fields else 20,
+                flags,
+                zipfile.ZIP_DEFLATED,
+                self._dos_time,
+                self._dos_date,
+                member.crc,
+                *sizes,
+                len(encoded_name),
+                len(local_extra),
+            )
+            + encoded_name
+            + local_extra
+        )
+        for chunk in member.chunks:
+            self._write(chunk)
+
+        central_fields = list(local_fields)
+        if header_offset >= _ZIP64_LIMIT:
+            central_fields.append(header_offset)
+        central_extra = _zip64_extra(central_fields)
+        version = 45 if central_fields else 20
+        self._central_directory.append(
+            struct.pack(
+                "<IHHHHHHIIIHHHHHII",
+                0x02014B50,
+                3 << 8 | version,  # Made by Unix.
+                version,
+                flags,
+                zipfile.ZIP_DEFLATED,
+                self._dos_time,
+                self._dos_date,
+                member.crc,
+                *sizes,
+                len(encoded_name),
+                len(central_extra),
+                0,
+                0,
+                0,
+                0o600 << 16,
+                0xFFFFFFFF if header_offset >= _ZIP64_LIMIT else header_offset,
+            )
+            + encoded_name
+            + central_extra
+        )
+
+    def close(self) -> None:
+        """Writes the central directory. Does not close `fp`."""
+        start = self._offset
+        for record in self._central_directory:
+            self._write(record)
+        count = len(self._central_directory)
+        size = self._offset - start
+        if count >= _ZIP64_COUNT_LIMIT or max(size, start) >= _ZIP64_LIMIT:
+            end = self._offset
+            self._write(
+                struct.pack("<IQHHIIQQQQ", 0x06064B50, 44, 45, 45, 0, 0, count, count, size, start)
+            )
+            self._write(struct.pack("<IIQI", 0x07064B50, 0, end, 1))
+            # Values that do not fit are replaced by the maximum, meaning "see the zip64 record":
+            count, size, start = min(count, 0xFFFF), min(size, 0xFFFFFFFF), min(start, 0xFFFFFFFF)
+        self._write(struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, count, count, size, start, 0))
+
+    def _write(self, data: bytes) -> None:
+        self._fp.write(data)
+        self._offset += len(data)
+
+
+class NpzArrays(Mapping[str, AnyNDArray]):
+    """
+    The arrays in an `.npz` file.
+
+    Arrays are only read, and decompressed, when they are accessed. This keeps the file open, so
+    use it as a context manager, or call `close`, when you are done with it.
+    """
+
+    def __init__(self, path: Path, *, allow_pickle: bool, mmap_mode: MMapMode | None) -> None:
+        self._path = path
+        self._allow_pickle = allow_pickle
+        self._mmap_mode = mmap_mode
+        self._zip_file = zipfile.ZipFile(path)
+        self._members = {
+            info.filename.removesuffix(_NPY_SUFFIX): info
+            for info in self._zip_file.infolist()
+            if info.filename.endswith(_NPY_SUFFIX)
+        }
+
+    def __getitem__(self, key: str) -> AnyNDArray:
+        info = self._members[key]
+        if self._mmap_mode is not None and info.compress_type == zipfile.ZIP_STORED:
+            array = self._memmap(info)
+            if array is not None:
+                return array
+        with self._zip_file.open(info) as fp:
+            return np.lib.format.read_array(fp, allow_pickle=self._allow_pickle)
+
+    def _memmap(self, info: zipfile.ZipInfo) -> AnyNDArray | None:
+        """Memory-maps an uncompressed member, or returns `None` if that is not possible."""
+        mmap_mode = self._mmap_mode
+        assert mmap_mode is not None
+        with open(self._path, "rb") as fp:
+            fp.seek(info.header_offset)
+            local_header = fp.read(_ZIP_LOCAL_HEADER_SIZE)
+            name_size, extra_size = struct.unpack("<HH", local_header[26:30])
+            fp.seek(info.header_offset + _ZIP_LOCAL_HEADER_SIZE + name_size + extra_size)
+            header = _read_npy_header(fp)
+        if header.dtype.hasobject or header.size == 0:
+            return None
+        order: Literal["C", "F"] = "F" if header.fortran_order else "C"
+        return np.memmap(
+            self._path,
+            dtype=header.dtype,
+            mode=mmap_mode,
+            offset=header.offset,
+            shape=header.shape,
+            order=order,
         )
 
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._members)
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def close(self) -> None:
+        self._zip_file.close()
+
+    def __enter__(self) -> "NpzArrays":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
 
 class NpzFile(TypedFile):
-    """A file containing a compressed NumPy Array."""
+    """
+    A file containing named NumPy arrays, which are compressed by default.
+
+    `write` and `read` store, and load, a single array. Use `write_arrays` and `read_arrays` to
+    store many arrays in the same file.
+    """
 
     default_suffix = ".npz"
 
-    def __init__(self, path: PathLikeLike, *, allow_pickle: bool = False) -> None:
+    def __init__(
+        self,
+        path: PathLikeLike,
+        *,
+        allow_pickle: bool = False,
+        compressed: bool = True,
+        mmap_mode: MMapMode | None = None,
+    ) -> None:
         """
         :param path: Path this object refers to on disk.
         :param allow_pickle: If `True` contents of arrays of `object`s are pickled. If `False`
             arrays of `object`s cannot be stored.
+        :param compressed: Whether to compress the arrays when writing. Uncompressed files are
+            faster to read and write, and can be memory-mapped.
+        :param mmap_mode: If set, uncompressed arrays are memory-mapped, using this mode, instead
+            of being read into memory.
         """
         super().__init__(path)
         assert NUMPY_AVAILABLE, (
@@ -67,10 +633,63 @@ class NpzFile(TypedFile):
         )
 
         self._allow_pickle = allow_pickle
+        self._compressed = compressed
+        self._mmap_mode = mmap_mode
 
     def write(self, data: AnyNDArray) -> None:
-        np.savez_compressed(self.write_path(), array=data)
+        self.write_arrays({"array": data})
+
+    def _read_cache_options(self) -> Hashable:
+        return (self._allow_pickle, self._mmap_mode)
+
+    def _is_read_cacheable(self) -> bool:
+        # Each caller gets its own copy-on-write mapping, as copying the array could use lots of
+        # memory:
+        return self._mmap_mode != "c"
+
+    def _share_cached_value(self, value: AnyNDArray) -> AnyNDArray:
+        return _share_array(value, self._mmap_mode)
 
+    @cached_read
     def read(self) -> AnyNDArray:
-        with np.load(self.read_path(), allow_pickle=self._allow_pickle) as npz_file:
-            return npz_file["array"]  # type: ignore[no-any-return]
+        with self.read_arrays() as arrays:
+            return arrays["array"]
+
+    def write_arrays(
+        self, arrays: Mapping[str, AnyNDArray], *, executor: Executor | None = None
+    ) -> None:
+        """
+        Writes many named arrays to this file.
+
+        If the file is compressed, the arrays are compressed in parallel.
+
+        :param executor: Executor to compress with. Defaults to a thread pool private to
+            `typedpath`, with a thread per CPU. Do not pass the executor this method runs on, as
+            waiting for compression on it may deadlock.
+        """
+        with self.open_write("wb") as fp:
+            if self._compressed:
+                writer = _DeflatedZipWriter(fp)
+                deflate = partial(_deflate_array, allow_pickle=self._allow_pickle)
+                for (name, _), future in map_bounded(
+                    lambda item: deflate(item[1]),
+                    arrays.items(),
+                    executor=executor or _get_deflate_executor(),
+                ):
+                    writer.add(f"{name}{_NPY_SUFFIX}", future.result())
+                writer.close()
+                return
+            with zipfile.ZipFile(fp, "w", zipfile.ZIP_STORED, allowZip64=True) as zip_file:
+                for name, array in arrays.items():
+                    with zip_file.open(f"{name}{_NPY_SUFFIX}", "w", force_zip64=True) as member:
+                        np.lib.format.write_array(member, array, allow_pickle=self._allow_pickle)
+
+    def read_arrays(self) -> NpzArrays:
+        """
+        Opens this file, for reading the arrays in it, lazily::
+
+            with features.read_arrays() as arrays:
+                labels = arrays["labels"]
+        """
+        with self.reading() as path:
+            return NpzArrays(path, allow_pickle=self._allow_pickle, mmap_mode=self._mmap_mode)
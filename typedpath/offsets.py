@@ -0,0 +1,141 @@
+import os
+from array import array
+from collections.abc import Callable, Iterator
+from typing import IO
+
+from typedpath.base import RESERVED_PREFIX, TypedFile
+from typedpath.bytes import BytesFile
+from typedpath.cache import StatKey, stat_key
+from typedpath.writeback import settle
+
+Scanner = Callable[[IO[bytes], int], Iterator[int]]
+"""
+Function that reads records from a file, starting at the given offset, which is always the start of
+a record, and yields the offset of the end of each record.
+"""
+
+
+class OffsetIndex:
+    """
+    The offsets of the ends of the records in a file, stored as 64-bit integers in an index file,
+    next to the file.
+
+    The index is cached in memory, for as long as the file is unchanged. Records appended to the
+    file by others are detected, by comparing the end of the last indexed record with the size of
+    the file, and are indexed using a `Scanner`. If the file is shorter than the index it has been
+    rewritten, so it is indexed from scratch.
+    """
+
+    def __init__(self, file: TypedFile, scan: Scanner) -> None:
+        self._file = file
+        self._scan = scan
+        self._cached: tuple[StatKey, array[int]] | None = None
+        """The cached index, and the `stat_key` of the file it is valid for."""
+
+    def _assert_not_compressed(self) -> None:
+        # The offsets of records in a compressed file cannot be found from the size of the file:
+        assert self._file._codec is None, (
+            f"Cannot index {self._file.pretty_path()}, as it is compressed."
+        )
+
+    def index_file(self) -> BytesFile:
+        path = self._file.pretty_path()
+        return BytesFile(path.with_name(f"{RESERVED_PREFIX}index-{path.name}"))
+
+    def ends(self) -> "array[int]":
+        """
+        Returns the offsets of the ends of all records, updating the index if it is out of date.
+
+        It is an error if the file does not exist.
+        """
+        self._assert_not_compressed()
+        with self._file.reading() as path:
+            stat = path.stat()
+        key = stat_key(stat)
+        if self._cached is not None and self._cached[0] == key:
+            return self._cached[1]
+
+        ends = self._read()
+        indexed = ends[-1] if ends else 0
+        rewritten = indexed > stat.st_size
+        if rewritten:
+            # The file has been rewritten by someone else:
+            ends = array("Q")
+            indexed = 0
+        new_ends = array("Q")
+        if indexed < stat.st_size:
+            with self._file.open_read("rb") as fp:
+                fp.seek(indexed)
+                new_ends.extend(self._scan(fp, indexed))
+        if rewritten or (new_ends and indexed == 0):
+            self.index_file().write(new_ends.tobytes())
+        elif new_ends:
+            with self.index_file().open_write("ab") as fp:
+                fp.write(new_ends.tobytes())
+        ends.extend(new_ends)
+
+        self._cached = (key, ends)
+        return ends
+
+    def write(self, ends: "array[int]") -> None:
+        """Sets the index, after the file has been rewritten."""
+        self._assert_not_compressed()
+        self.index_file().write(ends.tobytes())
+        with self._file.reading() as path:
+            self._cached = (stat_key(path.stat()), ends)
+
+    def extend(self, before: os.stat_result, after: os.stat_result, ends: "array[int]") -> None:
+        """
+        Adds records to the index, after they have been appended to the file.
+
+        :param before: `os.fstat` of the file, before the records were appended.
+        :param after: `os.fstat` of the file, after the records were appended.
+        :param ends: Offsets of the ends of the appended records.
+        """
+        cached = self._cached
+        if cached is not None and cached[0] == stat_key(before):
+            # The file has not changed since we last saw it, so neither has the index:
+            old_ends: array[int] | None = cached[1]
+        elif self._last_indexed() == before.st_size:
+            old_ends = None
+        else:
+            # Someone else has modified the file - scan it:
+            self.ends()
+            return
+        with self.index_file().open_write("ab") as fp:
+            fp.write(ends.tobytes())
+        if old_ends is None:
+            self._cached = None
+        else:
+            old_ends.extend(ends)
+            self._cached = (stat_key(after), old_ends)
+
+    def remove(self) -> None:
+        """Deletes the index."""
+        index_path = self.index_file().pretty_path()
+        settle(index_path)
+        index_path.unlink(missing_ok=True)
+        self._cached = None
+
+    def _last_indexed(self) -> int:
+        """Returns the end of the last record in the stored index, or 0 if there is no index."""
+        index_path = self.index_file().pretty_path()
+        settle(index_path)
+        try:
+            with open(index_path, "rb") as fp:
+                if fp.seek(0, 2) == 0:
+                    return 0
+                fp.seek(-8, 2)
+                last: int = array("Q", fp.read(8))[0]
+                return last
+        except FileNotFoundError:
+            return 0
+
+    def _read(self) -> "array[int]":
+        """Reads the stored index, without checking it is up to date."""
+        ends = array("Q")
+        index_path = self.index_file().pretty_path()
+        settle(index_path)
+        if index_path.exists():
+            ends.frombytes(index_path.read_bytes())
+        return ends
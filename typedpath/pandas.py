@@ -1,6 +1,12 @@
-from typing import Literal, TypeAlias
+from collections.abc import Hashable, Iterator, Sequence
+from contextlib import ExitStack, contextmanager, suppress
+from pathlib import Path
+from typing import Any, Literal, TypeAlias
 
-from typedpath.base import PathLikeLike, TypedFile
+from typedpath.base import RESERVED_PREFIX, PathLikeLike, TypedFile
+from typedpath.cache import cached_read
+from typedpath.json import JSONFile
+from typedpath.writeback import settle
 
 try:
     import pandas as pd
@@ -13,59 +19,310 @@ except ImportError:
 
     PANDAS_AVAILABLE = False
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.feather as pa_feather
+    import pyarrow.parquet as pq
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    from unittest.mock import MagicMock
+
+    pa = MagicMock()
+    pa_csv = MagicMock()
+    pa_feather = MagicMock()
+    pq = MagicMock()
+
+    PYARROW_AVAILABLE = False
+
+
+def _assert_pyarrow_available() -> None:
+    assert PYARROW_AVAILABLE, (
+        "PyArrow does not appear to be installed on this system. Try: pip install pyarrow"
+    )
+
+
+CsvEngine: TypeAlias = Literal["c", "python", "pyarrow"]
+
 
 class PandasCsvFile(TypedFile):
-    """A file containing comma separated values (CSV)."""
+    """
+    A file containing comma separated values (CSV).
+
+    CSV files do not store the types of their columns, so by default the types are inferred, every
+    time the file is read. If you set `schema=True` the names and types of the columns are stored
+    in a small file next to the CSV file, when it is written, and used when it is read, and
+    appended to.
+    """
 
     default_suffix = ".csv"
 
-    def __init__(self, path: PathLikeLike, *, encoding: str = "utf-8") -> None:
+    def __init__(
+        self,
+        path: PathLikeLike,
+        *,
+        encoding: str = "utf-8",
+        engine: CsvEngine = "c",
+        schema: bool = False,
+    ) -> None:
+        """
+        :param path: Path this object refers to on disk.
+        :param encoding: Encoding of the file.
+        :param engine: Parser to use when reading. The `"pyarrow"` parser uses multiple threads.
+        :param schema: Whether to store, and use, the names and types of the columns.
+        """
         super().__init__(path)
         assert PANDAS_AVAILABLE, (
             "Pandas does not appear to be installed on this system. Try: pip install pandas"
         )
 
         self._encoding = encoding
+        self._engine = engine
+        self._schema = schema
+
+    def _schema_file(self) -> JSONFile:
+        return JSONFile(self._path.with_name(f"{RESERVED_PREFIX}schema-{self._path.name}.json"))
+
+    def _read_schema(self) -> dict[str, str] | None:
+        """Returns the types of the columns, by name, if known."""
+        if not self._schema:
+            return None
+        schema_file = self._schema_file()
+        settle(schema_file.pretty_path())
+        if not schema_file.pretty_path().exists():
+            return None
+        schema = schema_file.read()
+        assert isinstance(schema, dict), schema
+        return {str(column): str(dtype) for column, dtype in schema.items()}
+
+    def _read_kwargs(self, engine: CsvEngine) -> dict[str, Any]:
+        kwargs: dict[str, Any] = {"engine": engine}
+        schema = self._read_schema()
+        if schema is not None:
+            # `read_csv` does not accept datetime types, so those must be parsed instead:
+            kwargs["dtype"] = {c: t for c, t in schema.items() if not t.startswith("datetime64")}
+            kwargs["parse_dates"] = [c for c, t in schema.items() if t.startswith("datetime64")]
+        return kwargs
 
     def write(self, data: pd.DataFrame) -> None:
-        data.to_csv(self.write_path(), encoding=self._encoding, index=False)
+        with self.open_write("wt", encoding=self._encoding, newline="") as fp:
+            data.to_csv(fp, index=False)
+        if self._schema:
+            self._schema_file().write({str(c): str(t) for c, t in data.dtypes.items()})
 
     def append(self, data: pd.DataFrame) -> None:
-        if not self.pretty_path().exists():
+        """
+        Appends rows to this file, or creates the file if it does not exist.
+
+        If the schema is stored, the columns of `data` are checked against it, and reordered to
+        match the file. Otherwise the columns must already be in the same order as in the file.
+        """
+        settle(self._path)
+        if not self._path.exists():
             self.write(data)
             return
 
-        with open(self.read_path(), "ta", encoding=self._encoding) as fp:
+        schema = self._read_schema()
+        if schema is not None:
+            columns = {str(c): c for c in data.columns}
+            assert sorted(columns) == sorted(schema), (
+                f"Cannot append columns {list(columns)} to {self.pretty_path()}, which has columns"
+                f" {list(schema)}."
+            )
+            data = data[[columns[c] for c in schema]]
+
+        with self.open_write("ta", encoding=self._encoding, newline="") as fp:
             data.to_csv(fp, index=False, header=False)
 
+    def _read_cache_options(self) -> Hashable:
+        return (self._encoding, self._engine, self._schema)
+
+    @cached_read
     def read(self) -> pd.DataFrame:
-        return pd.read_csv(self.read_path(), encoding=self._encoding)
+        if self._engine == "pyarrow":
+            schema = self._read_schema()
+            if schema is not None:
+                return self._read_arrow(schema)
+        kwargs = self._read_kwargs(self._engine)
+        with self.open_read("rt", encoding=self._encoding, newline="") as fp:
+            return pd.read_csv(fp, **kwargs)  # type: ignore[no-any-return]
+
+    def _read_arrow(self, schema: dict[str, str]) -> pd.DataFrame:
+        """
+        Reads this file using `pyarrow`, with the types from `schema`.
+
+        `pd.read_csv(..., engine="pyarrow")` only applies types after `pyarrow` has inferred its
+        own, which, for example, turns strings that look like numbers into numbers.
+        """
+        _assert_pyarrow_available()
+        column_types = {}
+        for column, dtype in schema.items():
+            if dtype in ("object", "string", "category"):
+                column_types[column] = pa.string()
+            else:
+                with suppress(TypeError, pa.ArrowNotImplementedError):
+                    column_types[column] = pa.from_numpy_dtype(dtype)
+        with self.open_read("rb") as fp:
+            table = pa_csv.read_csv(
+                fp,
+                read_options=pa_csv.ReadOptions(encoding=self._encoding),
+                convert_options=pa_csv.ConvertOptions(column_types=column_types),
+            )
+        data: pd.DataFrame = table.to_pandas()
+        return data.astype({c: t for c, t in schema.items() if not t.startswith("datetime64")})
+
+    def iter_chunks(self, chunksize: int = 65536) -> Iterator[pd.DataFrame]:
+        """
+        Reads this file in chunks of at most `chunksize` rows, so that only one chunk needs to be
+        in memory at a time.
+
+        The `"pyarrow"` parser does not support reading in chunks, so if it is selected the `"c"`
+        parser is used instead.
+        """
+        engine: CsvEngine = "c" if self._engine == "pyarrow" else self._engine
+        kwargs = self._read_kwargs(engine)
+        with (
+            self.open_read("rt", encoding=self._encoding, newline="") as fp,
+            pd.read_csv(fp, chunksize=chunksize, **kwargs) as reader,
+        ):
+            yield from reader
 
 
 class PandasFeatherFile(TypedFile):
-    """A file containing data in the Apache Arrow Feather format."""
+    """
+    A file containing data in the Apache Arrow Feather format.
+
+    If you do not need a `pandas.DataFrame`, consider using `ArrowIpcFile`, which avoids converting
+    the data.
+    """
 
     default_suffix = ".feather"
 
-    def __init__(self, path: PathLikeLike) -> None:
+    def __init__(self, path: PathLikeLike, *, memory_map: bool = False) -> None:
+        """
+        :param path: Path this object refers to on disk.
+        :param memory_map: Whether to memory-map the file when reading, instead of reading it into
+            memory, before converting it to a data frame. This is mostly useful when only reading
+            some of the columns, of an uncompressed file.
+        """
         super().__init__(path)
         assert PANDAS_AVAILABLE, (
             "Pandas does not appear to be installed on this system. Try: pip install pandas"
         )
 
+        self._memory_map = memory_map
+
     def write(self, data: pd.DataFrame) -> None:
-        data.to_feather(self.write_path())
+        with self.writing() as path:
+            data.to_feather(path)
 
-    def read(self) -> pd.DataFrame:
-        return pd.read_feather(self.read_path())
+    def _read_cache_options(self) -> Hashable:
+        return self._memory_map
+
+    @cached_read
+    def read(self, *, columns: Sequence[str] | None = None) -> pd.DataFrame:
+        """
+        :param columns: If set, only read these columns.
+        """
+        columns_list = None if columns is None else list(columns)
+        if not self._memory_map:
+            with self.reading() as path:
+                return pd.read_feather(path, columns=columns_list)
+
+        _assert_pyarrow_available()
+        with self.reading() as path:
+            table = pa_feather.read_table(path, columns=columns_list, memory_map=True)
+        data: pd.DataFrame = table.to_pandas()
+        return data
 
 
 ParquetEngine: TypeAlias = Literal["auto", "pyarrow", "fastparquet"]
 ParquetCompression: TypeAlias = Literal["snappy", "gzip", "brotli", None]
+ParquetFilters: TypeAlias = list[tuple[str, str, Any]] | list[list[tuple[str, str, Any]]]
+"""
+Filters on the rows to read from a Parquet file, in disjunctive normal form, such as
+`[("year", ">=", 2020), ("country", "in", ["DK", "SE"])]`. See `pyarrow.parquet.read_table`.
+"""
+
+
+class ParquetAppender:
+    """
+    Appends data frames to a Parquet file, as new row groups.
+
+    Create instances with `PandasParquetFile.appending()`.
+    """
+
+    def __init__(self, file: "PandasParquetFile", stack: ExitStack) -> None:
+        self._file = file
+        self._stack = stack
+        self._schema: pa.Schema | None = None
+        self._writer: pq.ParquetWriter | None = None
+
+    def append(self, data: pd.DataFrame) -> None:
+        """
+        Appends `data` to the file.
+
+        `data` must have the same columns as the file, though not necessarily in the same order,
+        and types that can be converted to the types of the file. The index of `data` is not
+        stored.
+        """
+        if self._writer is None:
+            self._open(data)
+        writer = self._writer
+        assert writer is not None
+        writer.write_table(self._to_table(data))
+
+    def _to_table(self, data: pd.DataFrame) -> "pa.Table":
+        schema = self._schema
+        assert schema is not None
+        assert sorted(data.columns) == sorted(schema.names), (
+            f"Cannot append columns {list(data.columns)} to {self._file}, which has columns"
+            f" {schema.names}."
+        )
+        try:
+            return pa.Table.from_pandas(data, schema=schema, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            raise AssertionError(f"Cannot append data to {self._file}: {e}") from e
+
+    def _open(self, data: pd.DataFrame) -> None:
+        file = self._file
+        try:
+            schema = pq.read_schema(file._path)
+        except FileNotFoundError:
+            schema = pa.Schema.from_pandas(data, preserve_index=False)
+            path = self._stack.enter_context(file.writing())
+        else:
+            index_columns = [
+                column
+                for column in (schema.pandas_metadata or {}).get("index_columns", [])
+                if isinstance(column, str)
+            ]
+            assert not index_columns, (
+                f"Cannot append to {file}, because it has a stored index: {index_columns}."
+            )
+            # Registered first, so it is called after the part has been written:
+            self._stack.callback(file._written)
+            part = file._part(len(file._part_paths()) + 1)
+            path = self._stack.enter_context(part.writing())
+        self._schema = schema.remove_metadata()
+        # Use the schema with metadata from `pandas`, so the data can be read back as it was:
+        pandas_schema = self._to_table(data.iloc[:0]).schema
+        self._writer = self._stack.enter_context(
+            pq.ParquetWriter(path, pandas_schema, compression=file._compression)
+        )
 
 
 class PandasParquetFile(TypedFile):
-    """A file containing data in the Apache Parquet format."""
+    """
+    A file containing data in the Apache Parquet format.
+
+    Parquet files store data by column, in groups of rows, with statistics for each group. So
+    reading only some columns, or filtering rows, can skip large parts of the file.
+
+    A Parquet file cannot be extended after it has been closed, so data appended to an existing
+    file is written to part files next to it, which are read together with the file.
+    """
 
     default_suffix = ".parquet"
 
@@ -84,8 +341,108 @@ class PandasParquetFile(TypedFile):
         self._engine = engine
         self._compression = compression
 
+    def _part(self, index: int) -> "PandasParquetFile":
+        path = self._path.with_name(f"{RESERVED_PREFIX}part-{index:06d}-{self._path.name}")
+        return PandasParquetFile(path, engine=self._engine, compression=self._compression)
+
+    def _part_paths(self) -> list[Path]:
+        """Returns the paths of the part files, written by appending to this file."""
+        paths: list[Path] = []
+        while (path := self._part(len(paths) + 1)._path).exists():
+            paths.append(path)
+        return paths
+
     def write(self, data: pd.DataFrame) -> None:
-        data.to_parquet(self.write_path(), engine=self._engine, compression=self._compression)
+        with self.writing() as path:
+            data.to_parquet(path, engine=self._engine, compression=self._compression)
+            for part_path in self._part_paths():
+                part_path.unlink()
 
-    def read(self) -> pd.DataFrame:
-        return pd.read_parquet(self.read_path(), engine=self._engine)
+    def append(self, data: pd.DataFrame) -> None:
+        """
+        Appends `data` to this file, or creates the file if it does not exist.
+
+        See `appending` for details.
+        """
+        with self.appending() as appender:
+            appender.append(data)
+
+    @contextmanager
+    def appending(self) -> Iterator[ParquetAppender]:
+        """
+        Context manager for appending many data frames to this file::
+
+            with events.appending() as appender:
+                for batch in compute_events():
+                    appender.append(batch)
+
+        Each appended data frame is written as new row groups, without reading or rewriting the
+        existing data. If the file does not exist it is created on the first append. Otherwise
+        the data is written to a new part file, next to this file. The file must not be written by
+        anyone else, while appending.
+
+        This always uses `pyarrow`, no matter the `engine`.
+        """
+        _assert_pyarrow_available()
+        with ExitStack() as stack:
+            yield ParquetAppender(self, stack)
+
+    def read(
+        self,
+        *,
+        columns: Sequence[str] | None = None,
+        filters: ParquetFilters | None = None,
+    ) -> pd.DataFrame:
+        """
+        :param columns: If set, only read these columns.
+        :param filters: If set, only read rows matching these filters. Groups of rows whose
+            statistics show they cannot match are not read at all.
+        """
+        with self.reading() as path:
+            frames = [
+                pd.read_parquet(
+                    p,
+                    engine=self._engine,
+                    columns=None if columns is None else list(columns),
+                    filters=filters,
+                )
+                for p in [path, *self._part_paths()]
+            ]
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, ignore_index=True)
+
+    def iter_batches(
+        self, batch_size: int = 65536, *, columns: Sequence[str] | None = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Reads this file in batches of at most `batch_size` rows, so that only one batch needs to
+        be in memory at a time.
+
+        The batches have default indices. This always uses `pyarrow`, no matter the `engine`.
+
+        :param columns: If set, only read these columns.
+        """
+        _assert_pyarrow_available()
+        with self.reading() as path:
+            for p in [path, *self._part_paths()]:
+                with pq.ParquetFile(p) as parquet_file:
+                    for batch in parquet_file.iter_batches(
+                        batch_size, columns=None if columns is None else list(columns)
+                    ):
+                        yield batch.to_pandas()
+
+    def metadata(self) -> "pq.FileMetaData":
+        """
+        Reads the metadata of this file, such as the schema, number of rows and statistics of the
+        row groups, without reading any data.
+
+        The row groups of any part files are included. This always uses `pyarrow`, no matter the
+        `engine`.
+        """
+        _assert_pyarrow_available()
+        with self.reading() as path:
+            metadata = pq.read_metadata(path)
+            for part_path in self._part_paths():
+                metadata.append_row_groups(pq.read_metadata(part_path))
+        return metadata
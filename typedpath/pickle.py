@@ -1,21 +1,67 @@
 # ruff: noqa: S301
+import mmap
 import pickle
-from typing import Any, Generic, TypeVar, get_origin
+import struct
+from collections.abc import Hashable
+from typing import IO, Any, Generic, TypeVar, get_origin
 
 from typedpath.base import PathLikeLike, TypedFile
+from typedpath.cache import cached_read
 
 T = TypeVar("T")
 
+_OOB_MAGIC = b"\x00TPOOB1\x00"
+"""
+Start of files with out-of-band buffers. Normal pickles never start with a zero byte.
+
+The magic is followed by a `_OOB_HEADER`, the pickle, a table with the offset and size of each
+buffer, and finally the buffers themselves, each aligned to `_OOB_ALIGNMENT` bytes.
+"""
+_OOB_HEADER = struct.Struct("<QQ")
+"""The end of the pickle and the number of buffers."""
+_OOB_ENTRY = struct.Struct("<QQ")
+"""The offset and size of a buffer."""
+_OOB_ALIGNMENT = 64
+_OOB_MIN_SIZE = 4096
+"""Buffers smaller than this are stored in the pickle, as usual."""
+
 
 class PickleFile(TypedFile, Generic[T]):
-    """A file containing pickled data."""
+    """
+    A file containing pickled data.
+
+    Optionally large buffers, such as the data of NumPy arrays, can be stored out-of-band, using
+    pickle protocol 5. The buffers are stored after the pickle, in the same file, and are
+    memory-mapped when the file is read, so they are not copied.
+    """
 
     default_suffix = ".pickle"
 
-    def __init__(self, path: PathLikeLike, value_type: type[T]) -> None:
+    def __init__(
+        self,
+        path: PathLikeLike,
+        value_type: type[T],
+        *,
+        out_of_band: bool = False,
+        memory_map: bool = True,
+    ) -> None:
+        """
+        :param path: Path this object refers to on disk.
+        :param value_type: Type of the pickled data.
+        :param out_of_band: Whether to store large buffers out-of-band, when writing. The file can
+            then only be read by `PickleFile`, not by `pickle.load`. Files are always read
+            correctly, no matter this setting. Compressed files are always written in-band, as
+            their buffers could not be memory-mapped anyway.
+        :param memory_map: Whether to memory-map out-of-band buffers when reading. If set, the
+            buffers are mapped copy-on-write, so objects can be modified, but changes are not
+            written back to the file. Do not overwrite a file while it is memory-mapped, unless
+            `atomic_writes` are enabled.
+        """
         super().__init__(path)
 
         self._value_type = value_type
+        self._out_of_band = out_of_band
+        self._memory_map = memory_map
 
     def write(self, data: T, **kwargs: Any) -> None:
         """
@@ -23,18 +69,87 @@ class PickleFile(TypedFile, Generic[T]):
 
         :param kwargs: Key-word arguments to pass to `pickle.dump`.
         """
-        with open(self.write_path(), "wb") as fp:
-            pickle.dump(data, fp, **kwargs)
+        with self.open_write("wb") as fp:
+            if self._out_of_band and self._codec is None:
+                _dump_out_of_band(data, fp, kwargs)
+            else:
+                pickle.dump(data, fp, **kwargs)
 
+    def _read_cache_options(self) -> Hashable:
+        return (self._value_type, self._memory_map)
+
+    @cached_read
     def read(self, **kwargs: Any) -> T:
         """
         Gets the contents of this file.
 
         :param kwargs: Key-word arguments to pass to `pickle.load`.
         """
-        with open(self.read_path(), "rb") as fp:
-            result: T = pickle.load(fp, **kwargs)
+        with self.open_read("rb") as fp:
+            # Peek, rather than read and seek back, as seeking compressed files is slow:
+            head = fp.peek(len(_OOB_MAGIC))  # type: ignore[attr-defined]
+            if head[: len(_OOB_MAGIC)] == _OOB_MAGIC:
+                result: T = _load_out_of_band(fp, self._memory_map, kwargs)
+            else:
+                result = pickle.load(fp, **kwargs)
             origin = get_origin(self._value_type)
             if origin is not None:
                 assert isinstance(result, origin)
             return result
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _OOB_ALIGNMENT) * _OOB_ALIGNMENT
+
+
+def _dump_out_of_band(data: Any, fp: IO[bytes], kwargs: dict[str, Any]) -> None:
+    assert "buffer_callback" not in kwargs, "Cannot set buffer_callback for out-of-band pickles."
+    assert kwargs.setdefault("protocol", 5) >= 5, "Out-of-band pickles require protocol 5."
+
+    buffers: list[memoryview] = []
+
+    def buffer_callback(buffer: pickle.PickleBuffer) -> bool:
+        view = buffer.raw()
+        if view.nbytes < _OOB_MIN_SIZE:
+            return True
+        buffers.append(view)
+        return False
+
+    fp.write(_OOB_MAGIC)
+    fp.write(bytes(_OOB_HEADER.size))
+    pickle.dump(data, fp, buffer_callback=buffer_callback, **kwargs)
+    pickle_end = fp.tell()
+
+    table = bytearray()
+    offset = pickle_end + _OOB_ENTRY.size * len(buffers)
+    for view in buffers:
+        offset = _align(offset)
+        table += _OOB_ENTRY.pack(offset, view.nbytes)
+        offset += view.nbytes
+    fp.write(table)
+    for view in buffers:
+        fp.write(bytes(_align(fp.tell()) - fp.tell()))
+        fp.write(view)
+
+    fp.seek(len(_OOB_MAGIC))
+    fp.write(_OOB_HEADER.pack(pickle_end, len(buffers)))
+
+
+def _load_out_of_band(fp: IO[bytes], memory_map: bool, kwargs: dict[str, Any]) -> Any:
+    # Views of the map keep it open, for as long as they are used:
+    if memory_map:
+        data = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_COPY)
+    else:
+        # An anonymous map, rather than a `bytearray`, so the buffers are aligned:
+        data = mmap.mmap(-1, fp.seek(0, 2))
+        fp.seek(0)
+        fp.readinto(data)  # type: ignore[attr-defined]
+    view = memoryview(data)
+
+    start = len(_OOB_MAGIC) + _OOB_HEADER.size
+    pickle_end, n_buffers = _OOB_HEADER.unpack_from(view, len(_OOB_MAGIC))
+    buffers = []
+    for i in range(n_buffers):
+        offset, size = _OOB_ENTRY.unpack_from(view, pickle_end + i * _OOB_ENTRY.size)
+        buffers.append(view[offset : offset + size])
+    return pickle.loads(view[start:pickle_end], buffers=buffers, **kwargs)
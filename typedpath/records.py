@@ -0,0 +1,196 @@
+# ruff: noqa: S301
+import os
+import pickle
+import struct
+import zlib
+from array import array
+from collections.abc import Hashable, Iterable, Iterator
+from typing import IO, Generic, TypeVar, get_origin
+
+from typedpath.base import PathLikeLike, TypedFile
+from typedpath.cache import cached_read
+from typedpath.executor import run_io
+from typedpath.offsets import OffsetIndex
+
+T = TypeVar("T")
+
+_FRAME_HEADER = struct.Struct("<QI")
+"""The size, and CRC-32, of the payload of a frame."""
+_BUFFER_SIZE = 2**20
+
+
+class RecordLogFile(TypedFile, Generic[T]):
+    """
+    A file containing a sequence of records, each stored in a length-prefixed, checksummed, frame.
+
+    Records are pickled, unless the value type is `bytes`, in which case they are stored as-is.
+
+    Records can be appended without reading or rewriting the existing file, and read one at a time.
+    The offset of every record is stored in an index file, next to this file, so any record can be
+    read directly with `get`.
+
+    If appending is interrupted, for example by a crash, the last frame may be incomplete. Readers
+    ignore incomplete, or corrupt, frames at the end of the file, and they are removed by the next
+    append.
+
+    Record logs cannot be compressed, as records are found by their offsets in the file.
+    """
+
+    default_suffix = ".records"
+
+    def __init__(self, path: PathLikeLike, value_type: type[T]) -> None:
+        """
+        :param path: Path this object refers to on disk.
+        :param value_type: Type of the records. If `bytes`, records are stored without pickling.
+        """
+        super().__init__(path)
+
+        self._value_type = value_type
+        self._raw = value_type is bytes
+        self._index = OffsetIndex(self, _scan_frames)
+
+    def _encode(self, record: T) -> bytes:
+        if self._raw:
+            assert isinstance(record, bytes | bytearray | memoryview), (
+                f"Records of {self._path} must be bytes. Found: {type(record)}"
+            )
+            return bytes(record)
+        return pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _decode(self, payload: bytes) -> T:
+        if self._raw:
+            return payload  # type: ignore[return-value]
+        result: T = pickle.loads(payload)
+        origin = get_origin(self._value_type)
+        if origin is not None:
+            assert isinstance(result, origin)
+        return result
+
+    def _write_frames(self, fp: IO[bytes], start: int, records: Iterable[T]) -> "array[int]":
+        """
+        Writes `records` to `fp`, which is at offset `start`, returning the ends of the frames.
+        """
+        ends = array("Q")
+        buffer = bytearray()
+        for record in records:
+            payload = self._encode(record)
+            buffer += _FRAME_HEADER.pack(len(payload), zlib.crc32(payload))
+            buffer += payload
+            ends.append(start + len(buffer))
+            if len(buffer) >= _BUFFER_SIZE:
+                fp.write(buffer)
+                start += len(buffer)
+                buffer.clear()
+        fp.write(buffer)
+        return ends
+
+    def write(self, records: Iterable[T]) -> None:
+        """
+        Sets the contents of this file.
+
+        `records` are consumed lazily, so they do not need to be in memory at the same time.
+        """
+        with self.open_write("wb") as fp:
+            ends = self._write_frames(fp, 0, records)
+        self._index.write(ends)
+
+    def append(self, record: T) -> None:
+        """
+        Appends one record to this file, or creates the file if it does not exist.
+
+        To append many records use `extend`, which is much faster.
+        """
+        self.extend((record,))
+
+    def extend(self, records: Iterable[T]) -> None:
+        """
+        Appends records to this file, or creates the file if it does not exist.
+
+        The records are buffered, and written in large blocks. Appending is never atomic.
+        """
+        with self.open_write("ab") as fp:
+            before = os.fstat(fp.fileno())
+            if before.st_size > 0:
+                ends = self._index.ends()
+                valid_end = ends[-1] if ends else 0
+                if valid_end < before.st_size:
+                    # Remove an incomplete frame, left by an interrupted append:
+                    fp.truncate(valid_end)
+                    before = os.fstat(fp.fileno())
+            ends = self._write_frames(fp, before.st_size, records)
+            fp.flush()
+            after = os.fstat(fp.fileno())
+        self._index.extend(before, after, ends)
+
+    def _read_cache_options(self) -> Hashable:
+        return self._raw
+
+    @cached_read
+    def read(self) -> list[T]:
+        """Gets all records in this file."""
+        return list(self.iter())
+
+    def iter(self) -> Iterator[T]:
+        """
+        Iterates over the records in this file, reading them lazily, in constant memory.
+        """
+        with self.open_read("rb") as fp:
+            file_size = os.fstat(fp.fileno()).st_size
+            while (payload := _read_frame(fp, file_size)) is not None:
+                yield self._decode(payload)
+
+    def get(self, index: int) -> T:
+        """
+        Gets the record at position `index`. Negative values count from the end of the file.
+
+        Only the requested record is read.
+        """
+        ends = self._index.ends()
+        if not -len(ends) <= index < len(ends):
+            raise IndexError(f"Record index {index} out of range for {self._path}.")
+        index %= len(ends)
+        start = ends[index - 1] if index > 0 else 0
+        with self.open_read("rb") as fp:
+            fp.seek(start)
+            payload = _read_frame(fp, ends[index])
+        assert payload is not None, f"Record {index} of {self._path} is corrupt."
+        return self._decode(payload)
+
+    def count(self) -> int:
+        """Returns the number of records in this file, without reading them."""
+        return len(self._index.ends())
+
+    async def aextend(self, records: Iterable[T]) -> None:
+        """Like `extend`, but does not block the event loop."""
+        await run_io(self.extend, records)
+
+    async def aget(self, index: int) -> T:
+        """Like `get`, but does not block the event loop."""
+        return await run_io(self.get, index)
+
+
+def _read_frame(fp: IO[bytes], file_size: int) -> bytes | None:
+    """
+    Reads the payload of the frame at the current position of `fp`.
+
+    Returns `None` at the end of the file, or if the frame is incomplete, or corrupt.
+    """
+    header = fp.read(_FRAME_HEADER.size)
+    if len(header) < _FRAME_HEADER.size:
+        return None
+    size, crc = _FRAME_HEADER.unpack(header)
+    # Do not trust the size, before checking it - a corrupt size could be huge:
+    if fp.tell() + size > file_size:
+        return None
+    payload: bytes = fp.read(size)
+    if zlib.crc32(payload) != crc:
+        return None
+    return payload
+
+
+def _scan_frames(fp: IO[bytes], start: int) -> Iterator[int]:
+    file_size = os.fstat(fp.fileno()).st_size
+    end = start
+    while (payload := _read_frame(fp, file_size)) is not None:
+        end += _FRAME_HEADER.size + len(payload)
+        yield end
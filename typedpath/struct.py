@@ -1,9 +1,54 @@
 from collections.abc import Mapping
 from typing import Any, get_type_hints
 
-from typedpath.args import NO_ARGS
+from typedpath.args import NO_ARGS, Args
 from typedpath.base import PathLikeLike, TypedDir, TypedPath
-from typedpath.inspect import make
+from typedpath.inspect import Maker, compile_maker
+
+_Schema = Mapping[str, tuple[str, Maker[TypedPath]]]
+"""Maps member names to their file name and a `Maker` for creating them."""
+
+_SCHEMA_ATTR = "_typedpath_struct_schema"
+
+
+class _Member:
+    """
+    Descriptor for a `StructDir` member.
+
+    Members are created lazily, on first access, and then stored in the instance `__dict__`. Since
+    this is a non-data descriptor, later accesses will find the instance attribute directly.
+    """
+
+    def __init__(self, name: str, args: Args) -> None:
+        self.name = name
+        self.args = args
+
+    def __get__(self, instance: "StructDir | None", owner: type["StructDir"]) -> Any:
+        if instance is None:
+            return self
+        file_name, maker = instance._schema[self.name]
+        member = maker(instance._path / file_name)
+        instance.__dict__[self.name] = member
+        return member
+
+
+def _compile_schema(
+    cls: type["StructDir"],
+    globalns: Mapping[str, Any] | None,
+    localns: Mapping[str, Any] | None,
+) -> _Schema:
+    globalns_dict = dict(globalns) if globalns is not None else None
+    localns_dict = dict(localns) if localns is not None else None
+    members = get_type_hints(cls, globalns_dict, localns_dict, include_extras=True)
+    schema = {}
+    for name, member_type in members.items():
+        member = getattr(cls, name, None)
+        if not isinstance(member, _Member):
+            # Annotation from a base class that is not a `StructDir`.
+            continue
+        maker = compile_maker(member_type, member.args)
+        schema[name] = (f"{name}{maker.default_suffix}", maker)
+    return schema
 
 
 class StructDir(TypedDir):
@@ -23,10 +68,20 @@ class StructDir(TypedDir):
         class Person(tp.StructDir):
             name: tp.TextFile = withargs(encoding="ascii")
             config: tp.JSONFile
+
+    The type hints are resolved once per class, when the first instance is created. The members
+    themselves are created lazily, when they are first accessed.
     """
 
     default_suffix = ""
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+
+        for name in cls.__dict__.get("__annotations__", {}):
+            args = cls.__dict__.get(name, NO_ARGS)
+            setattr(cls, name, _Member(name, args))
+
     def __init__(
         self,
         path: PathLikeLike,
@@ -44,11 +99,12 @@ class StructDir(TypedDir):
         """
         super().__init__(path)
 
-        globalns_dict = dict(globalns) if globalns is not None else None
-        localns_dict = dict(localns) if localns is not None else None
-        members = get_type_hints(self, globalns_dict, localns_dict)
-        for name, member_type in members.items():
-            member_path = self.pretty_path() / f"{name}{member_type.default_suffix}"
-            args = getattr(self, name, NO_ARGS)
-            member: TypedPath = make(member_type, member_path, args)
-            setattr(self, name, member)
+        cls = type(self)
+        if globalns is None and localns is None:
+            schema = cls.__dict__.get(_SCHEMA_ATTR)
+            if schema is None:
+                schema = _compile_schema(cls, None, None)
+                setattr(cls, _SCHEMA_ATTR, schema)
+        else:
+            schema = _compile_schema(cls, globalns, localns)
+        self._schema: _Schema = schema
@@ -1,4 +1,13 @@
+import codecs
+import io
+from collections import deque
+from collections.abc import Hashable, Iterator
+
 from typedpath.base import PathLikeLike, TypedFile
+from typedpath.cache import cached_read
+from typedpath.executor import run_io
+
+_TAIL_BLOCK_SIZE = 2**16
 
 
 class TextFile(TypedFile):
@@ -10,6 +19,13 @@ class TextFile(TypedFile):
         super().__init__(path)
 
         self._encoding = encoding
+        # In these encodings a "\n" byte is always a newline, so we can search for lines in bytes:
+        self._ascii_newlines = codecs.lookup(encoding).name in (
+            "ascii",
+            "cp1252",
+            "iso8859-1",
+            "utf-8",
+        )
 
     def write(
         self,
@@ -18,9 +34,86 @@ class TextFile(TypedFile):
         errors: str | None = None,
         newline: str | None = None,
     ) -> int:
-        return self.write_path().write_text(
-            data, encoding=self._encoding, errors=errors, newline=newline
-        )
+        with self.open_write("wt", encoding=self._encoding, errors=errors, newline=newline) as fp:
+            return fp.write(data)
 
+    def append(
+        self,
+        data: str,
+        *,
+        errors: str | None = None,
+        newline: str | None = None,
+    ) -> int:
+        """
+        Appends `data` to this file, or creates the file if it does not exist.
+
+        No newline is added, so to append a line `data` should end with `"\\n"`.
+        """
+        with self.open_write("at", encoding=self._encoding, errors=errors, newline=newline) as fp:
+            return fp.write(data)
+
+    def _read_cache_options(self) -> Hashable:
+        return self._encoding
+
+    @cached_read
     def read(self, errors: str | None = None) -> str:
-        return self.read_path().read_text(encoding=self._encoding, errors=errors)
+        with self.open_read("rt", encoding=self._encoding, errors=errors) as fp:
+            return fp.read()  # type: ignore[no-any-return]
+
+    def iter_lines(
+        self,
+        *,
+        errors: str | None = None,
+        buffer_size: int = io.DEFAULT_BUFFER_SIZE,
+    ) -> Iterator[str]:
+        """
+        Iterates over the lines in this file, without the line endings, reading them lazily.
+
+        Lines are split using universal newlines, like `open`.
+
+        :param buffer_size: Number of bytes to read from the file at a time.
+        """
+        with self.open_read(
+            "rt", encoding=self._encoding, errors=errors, buffering=buffer_size
+        ) as fp:
+            for line in fp:
+                yield line.removesuffix("\n")
+
+    def tail(self, n: int, *, errors: str | None = None) -> list[str]:
+        """
+        Gets the last `n` lines in this file, or all lines, if there are fewer than `n`.
+
+        Lines are split like `iter_lines`. For common encodings, such as UTF-8, the file is read
+        backwards from the end, so this is fast, even for large files. For other encodings, and for
+        compressed files, the whole file is scanned.
+        """
+        assert n >= 0, f"Cannot read a negative number of lines. Found: {n}"
+        if n == 0:
+            return []
+        if not self._ascii_newlines or self._codec is not None:
+            return list(deque(self.iter_lines(errors=errors), maxlen=n))
+
+        with self.open_read("rb") as fp:
+            pos = fp.seek(0, io.SEEK_END)
+            data = b""
+            while pos > 0:
+                step = min(_TAIL_BLOCK_SIZE, pos)
+                pos -= step
+                fp.seek(pos)
+                data = fp.read(step) + data
+                # One extra line, because the first line may be incomplete:
+                if data.count(b"\n") > n:
+                    data = data[data.index(b"\n") + 1 :]
+                    break
+        text = io.TextIOWrapper(io.BytesIO(data), encoding=self._encoding, errors=errors)
+        return [line.removesuffix("\n") for line in deque(text, maxlen=n)]
+
+    async def aappend(
+        self,
+        data: str,
+        *,
+        errors: str | None = None,
+        newline: str | None = None,
+    ) -> int:
+        """Like `append`, but does not block the event loop."""
+        return await run_io(self.append, data, errors=errors, newline=newline)
@@ -0,0 +1,311 @@
+import atexit
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Condition, Lock, Thread
+
+DEFAULT_WRITE_BACK_BYTES = 64 * 2**20
+"""Default maximum number of bytes waiting to be written, when write-back is enabled."""
+
+DEFAULT_WRITE_BACK_DELAY = 0.1
+"""Default number of seconds a write may wait, before it is written to disk."""
+
+Writer = Callable[[bytes], None]
+"""Function writing the contents of a file to disk."""
+
+
+@dataclass(frozen=True)
+class WriteBackStats:
+    """Statistics about write-back. See `set_write_back`."""
+
+    writes: int
+    """Number of writes that were buffered."""
+    coalesced: int
+    """Number of buffered writes that replaced a write that had not been written to disk yet."""
+    flushed: int
+    """Number of files written to disk."""
+    pending: int
+    """Number of files currently waiting to be written to disk."""
+    dirty_bytes: int
+    """Number of bytes currently waiting to be written to disk."""
+    max_dirty_bytes: int
+    """Maximum number of bytes waiting to be written. `0` if write-back is disabled."""
+
+
+@dataclass
+class _Pending:
+    data: bytes
+    write: Writer
+    since: float
+    """`time.monotonic()` when the file was first written, since it was last flushed."""
+
+
+class _WriteBack:
+    def __init__(self, max_dirty_bytes: int, delay: float) -> None:
+        assert max_dirty_bytes > 0, max_dirty_bytes
+        assert delay >= 0, delay
+        self.max_dirty_bytes = max_dirty_bytes
+        self.delay = delay
+        self.changed = Condition(Lock())
+        self.pending: dict[Path, _Pending] = {}
+        """Files waiting to be written, in the order they were first written."""
+        self.in_flight: set[Path] = set()
+        """Files currently being written to disk."""
+        self.dirty_bytes = 0
+        self.closing = False
+        self.error: BaseException | None = None
+        self.writes = 0
+        self.coalesced = 0
+        self.flushed = 0
+        self.thread = Thread(target=self._run, name="typedpath-write-back", daemon=True)
+        self.thread.start()
+
+    def put(self, path: Path, data: bytes, write: Writer) -> bool:
+        """
+        Buffers a write of `path`.
+
+        Returns `False` if the write cannot be buffered, in which case the caller must write the
+        file itself, after calling `settle(path)`.
+        """
+        if len(data) > self.max_dirty_bytes:
+            return False
+        with self.changed:
+            if self.closing:
+                return False
+            entry = self.pending.get(path)
+            if entry is None:
+                self.pending[path] = _Pending(data, write, time.monotonic())
+                if len(self.pending) == 1:
+                    self.changed.notify_all()
+            else:
+                # Keep the time of the first write, so files written continuously are still flushed:
+                self.dirty_bytes -= len(entry.data)
+                entry.data = data
+                entry.write = write
+                self.coalesced += 1
+            self.dirty_bytes += len(data)
+            self.writes += 1
+            while self.dirty_bytes > self.max_dirty_bytes and not self.closing:
+                self.changed.notify_all()
+                self.changed.wait()
+        return True
+
+    def settle(self, path: Path) -> None:
+        """Writes any pending write of `path` to disk, now, and waits for it to finish."""
+        with self.changed:
+            while path in self.in_flight:
+                self.changed.wait()
+            entry = self.pending.get(path)
+            if entry is None:
+                return
+            # Mark the path in flight before removing it, as `settle` checks without the lock:
+            self.in_flight.add(path)
+            del self.pending[path]
+        try:
+            entry.write(entry.data)
+        finally:
+            self._done([(path, entry)])
+
+    def paths(self, under: Path | None) -> list[Path]:
+        """Returns the paths with writes that are pending, or in flight, at or under `under`."""
+        with self.changed:
+            paths = [*self.pending, *self.in_flight]
+        if under is None:
+            return paths
+        return [p for p in paths if p == under or under in p.parents]
+
+    def close(self) -> None:
+        """Writes all pending writes to disk, and stops the background thread."""
+        with self.changed:
+            self.closing = True
+            self.changed.notify_all()
+        self.thread.join()
+        self.raise_error()
+
+    def raise_error(self) -> None:
+        """Raises the first error that happened while writing in the background, if any."""
+        with self.changed:
+            error = self.error
+            self.error = None
+        if error is not None:
+            raise error
+
+    def _run(self) -> None:
+        while (batch := self._take()) is not None:
+            for _, entry in batch:
+                self._write(entry)
+            self._done(batch)
+
+    def _write(self, entry: _Pending) -> None:
+        try:
+            entry.write(entry.data)
+        except BaseException as e:  # noqa: BLE001
+            with self.changed:
+                if self.error is None:
+                    self.error = e
+
+    def _take(self) -> list[tuple[Path, _Pending]] | None:
+        """
+        Waits until some writes are due, and takes them. Returns `None` when closed, and there are
+        no more writes.
+        """
+        with self.changed:
+            while True:
+                urgent = self.closing or self.dirty_bytes > self.max_dirty_bytes
+                now = time.monotonic()
+                due = []
+                wait_until = None
+                for path, entry in self.pending.items():
+                    if path in self.in_flight:
+                        continue
+                    if not urgent and entry.since + self.delay > now:
+                        # Entries are ordered by `since`, so no later entry is due either:
+                        wait_until = entry.since + self.delay
+                        break
+                    due.append(path)
+                if due:
+                    self.in_flight.update(due)
+                    return [(path, self.pending.pop(path)) for path in due]
+                if self.closing and not self.pending:
+                    return None
+                self.changed.wait(None if wait_until is None else wait_until - now)
+
+    def _done(self, batch: list[tuple[Path, _Pending]]) -> None:
+        with self.changed:
+            for path, entry in batch:
+                self.in_flight.discard(path)
+                self.dirty_bytes -= len(entry.data)
+                self.flushed += 1
+            self.changed.notify_all()
+
+
+_write_back: _WriteBack | None = None
+_lock = Lock()
+
+
+def set_write_back(
+    max_dirty_bytes: int | None = DEFAULT_WRITE_BACK_BYTES,
+    *,
+    delay: float = DEFAULT_WRITE_BACK_DELAY,
+) -> None:
+    """
+    Enables, or disables, write-back buffering of files, process-wide.
+
+    When enabled, writes that replace the whole contents of a file are kept in memory, and written
+    to disk by a background thread, after `delay` seconds. If the same file is written again in
+    the meantime, only the last contents are written. Appends, and writes through `.writing()`,
+    are not buffered.
+
+    Reads through `typedpath` always see the latest contents: reading a file with a pending write,
+    or listing a `DictDir` containing one, first writes it to disk. Changes made to files other
+    than through `typedpath` may be overwritten by pending writes.
+
+    Errors from writing in the background are raised by the next call to `flush_writes`, or when
+    write-back is disabled.
+
+    :param max_dirty_bytes: Maximum number of bytes to keep in memory. When exceeded, writers wait
+        for the background thread to catch up. Larger writes are written directly. Set to `None`
+        to disable write-back, which first writes all pending writes to disk.
+    :param delay: Maximum number of seconds a write may wait, before it is written to disk.
+    """
+    global _write_back
+    with _lock:
+        previous = _write_back
+        try:
+            if previous is not None:
+                # Keep `previous` visible while it is closed, so readers wait for its writes:
+                previous.close()
+        finally:
+            _write_back = None if max_dirty_bytes is None else _WriteBack(max_dirty_bytes, delay)
+
+
+@contextmanager
+def write_back(
+    max_dirty_bytes: int | None = DEFAULT_WRITE_BACK_BYTES,
+    *,
+    delay: float = DEFAULT_WRITE_BACK_DELAY,
+) -> Iterator[None]:
+    """
+    Context manager for temporarily enabling, or disabling, write-back buffering.
+
+    All pending writes are written to disk when the context exits. See `set_write_back`.
+    """
+    previous = _write_back
+    previous_settings = None if previous is None else (previous.max_dirty_bytes, previous.delay)
+    set_write_back(max_dirty_bytes, delay=delay)
+    try:
+        yield
+    finally:
+        if previous_settings is None:
+            set_write_back(None)
+        else:
+            set_write_back(previous_settings[0], delay=previous_settings[1])
+
+
+def flush_writes(path: Path | None = None) -> None:
+    """
+    Writes pending writes to disk, and waits for them to finish.
+
+    :param path: If set, only writes to this file, or files in this directory, are flushed.
+    """
+    wb = _write_back
+    if wb is None:
+        return
+    for p in wb.paths(None if path is None else path.absolute()):
+        wb.settle(p)
+    if path is None:
+        wb.raise_error()
+
+
+def get_write_back_stats() -> WriteBackStats:
+    """Gets statistics about write-back."""
+    wb = _write_back
+    if wb is None:
+        return WriteBackStats(0, 0, 0, 0, 0, 0)
+    with wb.changed:
+        return WriteBackStats(
+            writes=wb.writes,
+            coalesced=wb.coalesced,
+            flushed=wb.flushed,
+            pending=len(wb.pending),
+            dirty_bytes=wb.dirty_bytes,
+            max_dirty_bytes=wb.max_dirty_bytes,
+        )
+
+
+def is_write_back() -> bool:
+    """Whether writes should currently be buffered."""
+    return _write_back is not None
+
+
+def buffer_write(path: Path, data: bytes, write: Writer) -> None:
+    """
+    Writes `data` to `path` using `write`, in the background if write-back is enabled, or now.
+    """
+    path = path.absolute()
+    wb = _write_back
+    if wb is not None and wb.put(path, data, write):
+        return
+    settle(path)
+    write(data)
+
+
+def settle(path: Path) -> None:
+    """
+    Makes sure any pending write of the file at `path` is on disk.
+
+    Must be called before reading, or modifying, a file other than by `buffer_write`.
+    """
+    wb = _write_back
+    if wb is None:
+        return
+    path = path.absolute()
+    if path in wb.pending or path in wb.in_flight:
+        wb.settle(path)
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    set_write_back(None)